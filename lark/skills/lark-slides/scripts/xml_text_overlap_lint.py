@@ -4,16 +4,22 @@
 
 from __future__ import annotations
 
+import glob
+import hashlib
 import json
+import marshal
 import math
+import os
 import re
 import sys
 import unicodedata
 import xml.parsers.expat as expat
 import xml.etree.ElementTree as ET
 from difflib import SequenceMatcher, get_close_matches
+from functools import lru_cache
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TextIO
 
 
 XS_NS = "{http://www.w3.org/2001/XMLSchema}"
@@ -44,8 +50,30 @@ ROUNDTRIP_SXSD_ATTRS = {
 }
 DEFAULT_TABLE_COLUMN_WIDTH = 110
 DEFAULT_TABLE_ROW_HEIGHT = 37
+ELEMENT_KINDS = {"shape", "img", "table", "chart", "whiteboard"}
+SPATIAL_GRID_CELL_SIZE = 64
+SPATIAL_GRID_MAX_CELLS = 4096
+PARALLEL_SLIDE_MIN_COUNT = 8
+REPEATABLE_OPTIONS = {"input"}
+REFERENCE_CACHE_VERSION = 1
+LINT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "lark-slides"
+SLIDE_CACHE_MEMORY_ENTRIES = 4096
+TEXT_METRICS_CACHE_ENTRIES = 8192
+NUMPY_MIN_ELEMENTS = 64
+NUMPY_MAX_ELEMENTS = 4096
+NUMPY_EXACT_COORDINATE = 2**52
+STREAM_CHUNK_SIZE = 1 << 16
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+JSONRPC_LINT_ERROR = -32000
 _SXSD_TAG_ATTRIBUTES_CACHE: dict[str, set[str]] | None = None
 _ICONPARK_ICON_TYPES_CACHE: set[str] | None = None
+_REFERENCE_HINT_CACHE: dict[tuple[str, ...], str] = {}
+_LINTER_VERSION: str | None = None
+_NUMPY: Any = None
 
 
 class XmlTextOverlapLintError(Exception):
@@ -73,18 +101,20 @@ def parse_args(argv: list[str]) -> dict[str, Any]:
             options[key] = True
             index += 1
             continue
-        options[key] = next_token
+        if key in REPEATABLE_OPTIONS:
+            options.setdefault(key, []).append(next_token)
+        else:
+            options[key] = next_token
         index += 2
     return options
 
 
-def extract_attribute(tag_source: str, name: str) -> str | None:
-    match = re.search(fr'{re.escape(name)}="([^"]+)"', tag_source)
-    return match.group(1) if match else None
+def extract_attribute(attrs: dict[str, str], name: str) -> str | None:
+    return attrs.get(name) or None
 
 
-def extract_numeric_attribute(tag_source: str, name: str) -> int | float | None:
-    raw = extract_attribute(tag_source, name)
+def extract_numeric_attribute(attrs: dict[str, str], name: str) -> int | float | None:
+    raw = extract_attribute(attrs, name)
     if raw is None:
         return None
     try:
@@ -172,6 +202,12 @@ def solve_weighted_min_layout(
     return {"final_sizes": final_sizes, "actual_size": sum_sizes(final_sizes), "ratio": ratio}
 
 
+def collapse_text_whitespace(value: str, preserve_line_breaks: bool = False) -> str:
+    if preserve_line_breaks:
+        return "\n".join(re.sub(r"\s+", " ", line).strip() for line in value.split("\n"))
+    return re.sub(r"\s+", " ", value).strip()
+
+
 def strip_xml(value: str, preserve_line_breaks: bool = False) -> str:
     stripped = re.sub(r"<!\[CDATA\[([\s\S]*?)\]\]>", r"\1", value)
     if preserve_line_breaks:
@@ -183,9 +219,7 @@ def strip_xml(value: str, preserve_line_breaks: bool = False) -> str:
     stripped = stripped.replace("&gt;", ">")
     stripped = stripped.replace("&quot;", '"')
     stripped = stripped.replace("&#39;", "'")
-    if preserve_line_breaks:
-        return "\n".join(re.sub(r"\s+", " ", line).strip() for line in stripped.split("\n"))
-    return re.sub(r"\s+", " ", stripped).strip()
+    return collapse_text_whitespace(stripped, preserve_line_breaks)
 
 
 def strip_xml_paragraphs(value: str) -> str:
@@ -195,13 +229,48 @@ def strip_xml_paragraphs(value: str) -> str:
     return strip_xml(value, preserve_line_breaks=True)
 
 
-def extract_text_paragraphs(value: str, default_font_size: int | float) -> list[dict[str, Any]]:
+def xml_local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if tag.startswith("{") else tag
+
+
+def iter_descendants(element: ET.Element, local_name: str) -> list[ET.Element]:
+    return [node for node in element.iter() if node is not element and xml_local_name(node.tag) == local_name]
+
+
+def element_inner_text(element: ET.Element, preserve_line_breaks: bool = False) -> str:
+    # Mirrors strip_xml over the element's inner markup: every child tag becomes a
+    # separator (a line break for <br> when line breaks are preserved).
+    parts: list[str] = []
+
+    def visit(node: ET.Element) -> None:
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            parts.append("\n" if preserve_line_breaks and xml_local_name(child.tag) == "br" else " ")
+            visit(child)
+            parts.append(" ")
+            if child.tail:
+                parts.append(child.tail)
+
+    visit(element)
+    return collapse_text_whitespace("".join(parts), preserve_line_breaks)
+
+
+def element_paragraphs_text(element: ET.Element) -> str:
+    paragraphs = iter_descendants(element, "p")
+    if paragraphs:
+        return "\n".join(element_inner_text(paragraph, preserve_line_breaks=True) for paragraph in paragraphs)
+    return element_inner_text(element, preserve_line_breaks=True)
+
+
+def extract_text_paragraphs(element: ET.Element, default_font_size: int | float) -> list[dict[str, Any]]:
     paragraphs = []
-    for attrs, body in re.findall(r"<p\b([^>]*)>([\s\S]*?)</p\s*>", value):
+    for paragraph in iter_descendants(element, "p"):
+        attrs = paragraph.attrib
         paragraphs.append(
             {
-                "text": strip_xml(body, preserve_line_breaks=True),
-                "fontSize": extract_max_span_font_size(body, default_font_size),
+                "text": element_inner_text(paragraph, preserve_line_breaks=True),
+                "fontSize": extract_max_span_font_size(paragraph, default_font_size),
                 "textAlign": extract_attribute(attrs, "textAlign"),
                 "lineSpacing": extract_attribute(attrs, "lineSpacing"),
                 "beforeLineSpacing": extract_attribute(attrs, "beforeLineSpacing"),
@@ -211,22 +280,20 @@ def extract_text_paragraphs(value: str, default_font_size: int | float) -> list[
     return paragraphs
 
 
-def extract_max_span_font_size(value: str, default_font_size: int | float) -> int | float:
+def extract_max_span_font_size(paragraph: ET.Element, default_font_size: int | float) -> int | float:
     font_sizes = [
         font_size
-        for attrs in re.findall(r"<span\b([^>]*)>", value)
-        if (font_size := extract_numeric_attribute(attrs, "fontSize")) is not None
+        for span in iter_descendants(paragraph, "span")
+        if (font_size := extract_numeric_attribute(span.attrib, "fontSize")) is not None
     ]
     return max([default_font_size, *font_sizes])
 
 
-def extract_tag_attributes(value: str, tag: str) -> str:
-    match = re.search(fr"<{re.escape(tag)}\b([^>]*)>", value)
-    return match.group(1) if match else ""
-
-
-def xml_local_name(tag: str) -> str:
-    return tag.rsplit("}", 1)[-1] if tag.startswith("{") else tag
+def extract_tag_attributes(element: ET.Element, local_name: str) -> dict[str, str]:
+    match = next(
+        (node for node in element.iter() if node is not element and xml_local_name(node.tag) == local_name), None
+    )
+    return match.attrib if match is not None else {}
 
 
 def xml_namespace(tag: str) -> str | None:
@@ -243,12 +310,57 @@ def iter_direct_xsd_children(element: ET.Element, local_name: str) -> list[ET.El
     return [child for child in element if child.tag == f"{XS_NS}{local_name}"]
 
 
+def compiled_reference_path(source_path: Path) -> Path:
+    source_key = hashlib.sha1(str(source_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return LINT_CACHE_DIR / f"{source_path.stem}-{source_key}.marshal"
+
+
+def write_cache_file(cache_path: Path, payload: bytes) -> None:
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+
+
+def load_compiled_reference(source_path: Path, compile_source: Callable[[bytes], Any], rebuild: bool = False) -> Any:
+    # Compiled references are keyed by the source file's mtime and size for a cheap
+    # stat-only hit, and by its SHA-256 so a touched but unchanged file is not recompiled.
+    cache_path = compiled_reference_path(source_path)
+    version = f"{REFERENCE_CACHE_VERSION}:{sys.implementation.cache_tag}"
+    source_stat = source_path.stat()
+    stamp = [source_stat.st_mtime_ns, source_stat.st_size]
+    cached = None
+    if not rebuild:
+        try:
+            cached = marshal.loads(cache_path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            cached = None
+    if not isinstance(cached, dict) or cached.get("version") != version:
+        cached = None
+    elif cached["stamp"] == stamp:
+        return cached["data"]
+
+    source = source_path.read_bytes()
+    digest = hashlib.sha256(source).hexdigest()
+    data = cached["data"] if cached is not None and cached["sha256"] == digest else compile_source(source)
+    write_cache_file(
+        cache_path, marshal.dumps({"version": version, "stamp": stamp, "sha256": digest, "data": data})
+    )
+    return data
+
+
 def load_sxsd_tag_attributes() -> dict[str, set[str]]:
     global _SXSD_TAG_ATTRIBUTES_CACHE
-    if _SXSD_TAG_ATTRIBUTES_CACHE is not None:
-        return _SXSD_TAG_ATTRIBUTES_CACHE
+    if _SXSD_TAG_ATTRIBUTES_CACHE is None:
+        _SXSD_TAG_ATTRIBUTES_CACHE = load_compiled_reference(SXSD_SCHEMA_PATH, compile_sxsd_tag_attributes)
+    return _SXSD_TAG_ATTRIBUTES_CACHE
+
 
-    schema_root = ET.parse(SXSD_SCHEMA_PATH).getroot()
+def compile_sxsd_tag_attributes(source: bytes) -> dict[str, set[str]]:
+    schema_root = ET.fromstring(source)
     named_complex_types = {
         complex_type.attrib["name"]: complex_type
         for complex_type in schema_root.findall(f"{XS_NS}complexType")
@@ -302,30 +414,49 @@ def load_sxsd_tag_attributes() -> dict[str, set[str]]:
 
         tag_attributes.setdefault(tag_name, set()).update(attrs)
 
-    _SXSD_TAG_ATTRIBUTES_CACHE = tag_attributes
     return tag_attributes
 
 
 def load_iconpark_icon_types() -> set[str]:
     global _ICONPARK_ICON_TYPES_CACHE
-    if _ICONPARK_ICON_TYPES_CACHE is not None:
-        return _ICONPARK_ICON_TYPES_CACHE
+    if _ICONPARK_ICON_TYPES_CACHE is None:
+        _ICONPARK_ICON_TYPES_CACHE = load_compiled_reference(ICONPARK_INDEX_PATH, compile_iconpark_icon_types)
+    return _ICONPARK_ICON_TYPES_CACHE
+
 
+def compile_iconpark_icon_types(source: bytes) -> set[str]:
     try:
-        index_data = json.loads(ICONPARK_INDEX_PATH.read_text(encoding="utf-8"))
+        index_data = json.loads(source.decode("utf-8"))
     except json.JSONDecodeError as error:
         fail(f"invalid iconpark index JSON: {error}")
     icons = index_data.get("icons")
     if not isinstance(icons, list):
         fail("iconpark index must contain an icons array")
 
-    icon_types = {
+    return {
         icon["iconType"]
         for icon in icons
         if isinstance(icon, dict) and isinstance(icon.get("iconType"), str) and icon["iconType"]
     }
-    _ICONPARK_ICON_TYPES_CACHE = icon_types
-    return icon_types
+
+
+def build_reference_cache() -> list[str]:
+    global _SXSD_TAG_ATTRIBUTES_CACHE, _ICONPARK_ICON_TYPES_CACHE
+    _REFERENCE_HINT_CACHE.clear()
+    _SXSD_TAG_ATTRIBUTES_CACHE = load_compiled_reference(SXSD_SCHEMA_PATH, compile_sxsd_tag_attributes, rebuild=True)
+    _ICONPARK_ICON_TYPES_CACHE = load_compiled_reference(
+        ICONPARK_INDEX_PATH, compile_iconpark_icon_types, rebuild=True
+    )
+    return [str(compiled_reference_path(SXSD_SCHEMA_PATH)), str(compiled_reference_path(ICONPARK_INDEX_PATH))]
+
+
+def cached_reference_hint(key: tuple[str, ...], build_hint: Callable[[], str]) -> str:
+    # Close-match hints are the slow part of reporting an unknown tag, attribute or icon,
+    # and the same misspelling tends to repeat across slides and lint requests.
+    hint = _REFERENCE_HINT_CACHE.get(key)
+    if hint is None:
+        hint = _REFERENCE_HINT_CACHE[key] = build_hint()
+    return hint
 
 
 def build_sxsd_tag_hint(tag_name: str, supported_tags: set[str]) -> str:
@@ -361,7 +492,10 @@ def should_skip_sxsd_attribute(tag_name: str, attr_name: str) -> bool:
     return attr_name in SERVER_FILLED_SXSD_ATTRS or (tag_name, attr_name) in ROUNDTRIP_SXSD_ATTRS
 
 
-def validate_sxsd_tag_attributes(root: ET.Element) -> list[dict[str, Any]]:
+def validate_sxsd_tag_attributes(
+    root: ET.Element, ancestors: list[str] | None = None, path: str = ""
+) -> list[dict[str, Any]]:
+    # ancestors/path locate a detached subtree (streaming lint) as if it were still in the document.
     tag_attributes = load_sxsd_tag_attributes()
     supported_tags = set(tag_attributes)
     issues: list[dict[str, Any]] = []
@@ -380,7 +514,9 @@ def validate_sxsd_tag_attributes(root: ET.Element) -> list[dict[str, Any]]:
                     "tag": tag_name,
                     "path": current_path,
                     "message": f"unsupported SXSD tag <{tag_name}> at {current_path}",
-                    "hint": build_sxsd_tag_hint(tag_name, supported_tags),
+                    "hint": cached_reference_hint(
+                        ("tag", tag_name), lambda: build_sxsd_tag_hint(tag_name, supported_tags)
+                    ),
                 }
             )
             return
@@ -402,14 +538,17 @@ def validate_sxsd_tag_attributes(root: ET.Element) -> list[dict[str, Any]]:
                         "attr": attr_name,
                         "path": current_path,
                         "message": f'unsupported SXSD attribute "{attr_name}" on <{tag_name}> at {current_path}',
-                        "hint": build_sxsd_attr_hint(tag_name, attr_name, allowed_attrs),
+                        "hint": cached_reference_hint(
+                            ("attr", tag_name, attr_name),
+                            lambda: build_sxsd_attr_hint(tag_name, attr_name, allowed_attrs),
+                        ),
                     }
                 )
 
         for child in element:
             visit(child, [*ancestors, tag_name], current_path)
 
-    visit(root, [], "")
+    visit(root, ancestors or [], path)
     return issues
 
 
@@ -424,7 +563,7 @@ def build_iconpark_icon_type_hint(icon_type: str, supported_icon_types: set[str]
     return "iconType must exist in iconpark-index.json. Use scripts/iconpark_tool.py to search supported icons."
 
 
-def validate_iconpark_icon_types(root: ET.Element) -> list[dict[str, Any]]:
+def validate_iconpark_icon_types(root: ET.Element, path: str = "") -> list[dict[str, Any]]:
     supported_icon_types: set[str] | None = None
     issues: list[dict[str, Any]] = []
 
@@ -474,7 +613,10 @@ def validate_iconpark_icon_types(root: ET.Element) -> list[dict[str, Any]]:
                             "iconType": icon_type,
                             "path": current_path,
                             "message": f'unsupported iconpark iconType "{icon_type}" at {current_path}',
-                            "hint": build_iconpark_icon_type_hint(icon_type, supported_icon_types),
+                            "hint": cached_reference_hint(
+                                ("icon", icon_type),
+                                lambda: build_iconpark_icon_type_hint(icon_type, supported_icon_types),
+                            ),
                         }
                     )
             fill = direct_child(element, "fill")
@@ -498,7 +640,7 @@ def validate_iconpark_icon_types(root: ET.Element) -> list[dict[str, Any]]:
         for child in element:
             visit(child, current_path)
 
-    visit(root, "")
+    visit(root, path)
     return issues
 
 
@@ -514,6 +656,15 @@ def extract_error_context(xml: str, line: int | None, column: int | None, radius
     return source_line[start:end].strip()
 
 
+def read_error_context(input_path: Path, line: int | None, column: int | None) -> str | None:
+    # Streaming lint never holds the whole document, so only the failing line is read back.
+    if line is None or column is None or line < 1:
+        return None
+    with input_path.open(encoding="utf-8", errors="replace") as handle:
+        source_line = next(islice(handle, line - 1, None), None)
+    return extract_error_context(source_line, 1, column) if source_line is not None else None
+
+
 def build_xml_error_issue(error: ET.ParseError, xml: str) -> dict[str, Any]:
     line, column = getattr(error, "position", (None, None))
     return {
@@ -530,25 +681,51 @@ def build_xml_error_issue(error: ET.ParseError, xml: str) -> dict[str, Any]:
     }
 
 
-def validate_sml_tag_prefixes(xml: str) -> list[dict[str, Any]]:
-    namespace_map: dict[str, str] = {}
-    pending_declarations: list[tuple[str, str | None]] = []
-    declarations_by_element: list[list[tuple[str, str | None]]] = []
-    element_stack: list[str] = []
-    issues: list[dict[str, Any]] = []
-
-    parser = expat.ParserCreate(namespace_separator="|")
-    parser.namespace_prefixes = True
+class SmlDocumentParser:
+    # Incremental expat parse into an ElementTree that also reports SML tags written with a
+    # namespace prefix. With stream_children, each child of a <presentation> root is queued
+    # in completed_children as soon as it closes, so callers can lint and drop it before
+    # the rest of the document arrives; otherwise the byte span of every <slide> (start tag
+    # through content) is recorded so callers can hash a slide's raw markup.
+    def __init__(self, stream_children: bool = False) -> None:
+        self.stream_children = stream_children
+        self.namespace_map: dict[str, str] = {}
+        self.pending_declarations: list[tuple[str, str | None]] = []
+        self.declarations_by_element: list[list[tuple[str, str | None]]] = []
+        self.element_stack: list[str] = []
+        self.issues: list[dict[str, Any]] = []
+        self.slide_spans: list[list[int]] = []
+        self.open_slides: list[int] = []
+        self.root: ET.Element | None = None
+        self.root_start = 0
+        self.completed_children: list[ET.Element] = []
+        self.builder = ET.TreeBuilder()
+        self.parser = expat.ParserCreate(namespace_separator="|")
+        self.parser.namespace_prefixes = True
+        self.parser.buffer_text = True
+        self.parser.StartNamespaceDeclHandler = self.handle_namespace_decl
+        self.parser.StartElementHandler = self.handle_start_element
+        self.parser.EndElementHandler = self.handle_end_element
+        self.parser.CharacterDataHandler = self.builder.data
+
+    @staticmethod
+    def qualified_name(name: str) -> str:
+        name_parts = name.rsplit("|", 2)
+        return name_parts[0] if len(name_parts) == 1 else f"{{{name_parts[0]}}}{name_parts[1]}"
 
-    def handle_namespace_decl(prefix: str | None, namespace: str) -> None:
+    def handle_namespace_decl(self, prefix: str | None, namespace: str) -> None:
         normalized_prefix = prefix or ""
-        previous_namespace = namespace_map.get(normalized_prefix)
-        namespace_map[normalized_prefix] = namespace
-        pending_declarations.append((normalized_prefix, previous_namespace))
-
-    def handle_start_element(name: str, _attrs: dict[str, str]) -> None:
-        declarations_by_element.append(pending_declarations.copy())
-        pending_declarations.clear()
+        previous_namespace = self.namespace_map.get(normalized_prefix)
+        self.namespace_map[normalized_prefix] = namespace
+        self.pending_declarations.append((normalized_prefix, previous_namespace))
+
+    def handle_start_element(self, name: str, attrs: dict[str, str]) -> None:
+        qualified_name = self.qualified_name
+        element = self.builder.start(
+            qualified_name(name), {qualified_name(key): value for key, value in attrs.items()}
+        )
+        self.declarations_by_element.append(self.pending_declarations.copy())
+        self.pending_declarations.clear()
         name_parts = name.rsplit("|", 2)
         if len(name_parts) == 3:
             _namespace, local_name, prefix = name_parts
@@ -557,22 +734,28 @@ def validate_sml_tag_prefixes(xml: str) -> list[dict[str, Any]]:
             prefix = ""
             local_name = name_parts[-1]
             element_name = local_name
-        element_stack.append(element_name)
+        if self.root is None:
+            self.root = element
+            self.root_start = self.parser.CurrentByteIndex
+        if local_name == "slide" and not self.stream_children:
+            self.open_slides.append(len(self.slide_spans))
+            self.slide_spans.append([self.parser.CurrentByteIndex, self.parser.CurrentByteIndex])
+        self.element_stack.append(element_name)
         if not prefix:
             return
 
-        if namespace_map.get(prefix) != SML_NAMESPACE:
+        if self.namespace_map.get(prefix) != SML_NAMESPACE:
             return
-        path = "/".join(element_stack)
-        issues.append(
+        path = "/".join(self.element_stack)
+        self.issues.append(
             {
                 "level": "error",
                 "code": "sml_prefixed_tag",
                 "tag": element_name,
                 "namespace": SML_NAMESPACE,
                 "path": path,
-                "line": parser.CurrentLineNumber,
-                "column": parser.CurrentColumnNumber,
+                "line": self.parser.CurrentLineNumber,
+                "column": self.parser.CurrentColumnNumber,
                 "message": f"SML tag <{element_name}> must not use a namespace prefix at {path}",
                 "hint": (
                     f'Use <{local_name}> under the default namespace '
@@ -581,31 +764,69 @@ def validate_sml_tag_prefixes(xml: str) -> list[dict[str, Any]]:
             }
         )
 
-    def handle_end_element(_name: str) -> None:
-        for prefix, previous_namespace in reversed(declarations_by_element.pop()):
+    def handle_end_element(self, name: str) -> None:
+        tag = self.qualified_name(name)
+        element = self.builder.end(tag)
+        if xml_local_name(tag) == "slide" and not self.stream_children:
+            self.slide_spans[self.open_slides.pop()][1] = self.parser.CurrentByteIndex
+        for prefix, previous_namespace in reversed(self.declarations_by_element.pop()):
             if previous_namespace is None:
-                namespace_map.pop(prefix, None)
+                self.namespace_map.pop(prefix, None)
             else:
-                namespace_map[prefix] = previous_namespace
-        element_stack.pop()
+                self.namespace_map[prefix] = previous_namespace
+        if (
+            self.stream_children
+            and len(self.element_stack) == 2
+            and xml_local_name(self.root.tag) == "presentation"
+        ):
+            self.completed_children.append(element)
+        self.element_stack.pop()
+
+    def feed(self, data: str | bytes, final: bool = False) -> None:
+        try:
+            self.parser.Parse(data, final)
+        except expat.ExpatError as error:
+            parse_error = ET.ParseError(str(error))
+            parse_error.code = error.code
+            parse_error.position = (error.lineno, error.offset)
+            raise parse_error from None
+
+    def close(self) -> ET.Element:
+        return self.builder.close()
+
+
+def parse_sml_document(xml: str) -> tuple[ET.Element, list[dict[str, Any]], list[bytes]]:
+    document = SmlDocumentParser()
+    document.feed(xml, final=True)
+    root = document.close()
+    source = xml.encode("utf-8")
+    # The prolog travels with every slide so a DOCTYPE that redefines entities changes the hash.
+    prolog = source[: document.root_start]
+    return root, document.issues, [prolog + source[start:end] for start, end in document.slide_spans]
 
-    parser.StartNamespaceDeclHandler = handle_namespace_decl
-    parser.StartElementHandler = handle_start_element
-    parser.EndElementHandler = handle_end_element
-    parser.Parse(xml, True)
+
+def validate_sml_tag_prefixes(xml: str) -> list[dict[str, Any]]:
+    _, issues, _ = parse_sml_document(xml)
     return issues
 
 
-def parse_xml_root(xml: str) -> tuple[ET.Element | None, dict[str, Any] | None]:
+def parse_xml_document(
+    xml: str,
+) -> tuple[ET.Element | None, list[dict[str, Any]], list[bytes], dict[str, Any] | None]:
     try:
-        root = ET.fromstring(xml)
+        root, namespace_issues, slide_sources = parse_sml_document(xml)
     except ET.ParseError as error:
-        return None, build_xml_error_issue(error, xml)
+        return None, [], [], build_xml_error_issue(error, xml)
 
     root_name = xml_local_name(root.tag)
     if root_name not in {"presentation", "slide"}:
         fail("input must contain a <presentation> or <slide> root")
-    return root, None
+    return root, namespace_issues, slide_sources, None
+
+
+def parse_xml_root(xml: str) -> tuple[ET.Element | None, dict[str, Any] | None]:
+    root, _, _, xml_error = parse_xml_document(xml)
+    return root, xml_error
 
 
 def validate_xml_well_formed(xml: str) -> dict[str, Any] | None:
@@ -613,31 +834,109 @@ def validate_xml_well_formed(xml: str) -> dict[str, Any] | None:
     return xml_error
 
 
-def parse_presentation(xml: str) -> dict[str, Any]:
-    presentation_match = re.search(r"<presentation\b([^>]*)>", xml)
-    if presentation_match:
-        return {
-            "width": int(float(extract_attribute(presentation_match.group(1), "width") or 960)),
-            "height": int(float(extract_attribute(presentation_match.group(1), "height") or 540)),
-            "slides": re.findall(r"<slide\b[\s\S]*?</slide>", xml),
-        }
-    slide_match = re.findall(r"<slide\b[\s\S]*?</slide>", xml)
-    if slide_match:
-        return {"width": 960, "height": 540, "slides": slide_match}
+def presentation_size(root: ET.Element) -> tuple[int, int]:
+    if xml_local_name(root.tag) != "presentation":
+        return 960, 540
+    return (
+        int(float(extract_attribute(root.attrib, "width") or 960)),
+        int(float(extract_attribute(root.attrib, "height") or 540)),
+    )
+
+
+def parse_presentation(root: ET.Element) -> dict[str, Any]:
+    slides = [element for element in root.iter() if xml_local_name(element.tag) == "slide"]
+    if xml_local_name(root.tag) == "presentation":
+        width, height = presentation_size(root)
+        return {"width": width, "height": height, "slides": slides}
+    if slides:
+        return {"width": 960, "height": 540, "slides": slides}
     fail("input must contain a <presentation> or <slide> root")
 
 
-def extract_elements(slide_xml: str) -> list[dict[str, Any]]:
-    elements: list[dict[str, Any]] = []
+class Box:
+    # Axis-aligned box in slide pixels. Records also read like the dicts they replaced
+    # (box["x"], box.get("text")), so callers outside the detectors keep working.
+    __slots__ = ("x", "y", "width", "height")
+    fields: tuple[str, ...] = __slots__
+
+    def __init__(self, x: int | float, y: int | float, width: int | float, height: int | float) -> None:
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.fields and hasattr(self, key):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.fields and hasattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def keys(self) -> list[str]:
+        return [key for key in self.fields if hasattr(self, key)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class SlideElement(Box):
+    # One positioned slide element. Shape-only fields stay unset on other kinds, the
+    # same keys the element dict used to omit.
+    fields = (
+        "id",
+        "kind",
+        "type",
+        "x",
+        "y",
+        "width",
+        "height",
+        "rotation",
+        "alpha",
+        "order",
+        "declared_width",
+        "declared_height",
+        "table_layouts",
+        "textType",
+        "textAlign",
+        "verticalAlign",
+        "vert",
+        "autoFit",
+        "wrap",
+        "lineSpacing",
+        "beforeLineSpacing",
+        "afterLineSpacing",
+        "paddingTop",
+        "paddingRight",
+        "paddingBottom",
+        "paddingLeft",
+        "fontSize",
+        "text",
+        "paragraphs",
+    )
+    __slots__ = tuple(key for key in fields if key not in Box.__slots__)
+
+    def __init__(self, values: dict[str, Any]) -> None:
+        for key, value in values.items():
+            setattr(self, key, value)
 
-    for match in re.finditer(r"<(shape|img|table|chart|whiteboard)\b([^>]*)>", slide_xml):
-        kind, attrs = match.group(1), match.group(2)
-        content = ""
-        if kind in {"shape", "table"}:
-            close_index = slide_xml.find(f"</{kind}>", match.end())
-            if close_index != -1:
-                content = slide_xml[match.end() : close_index]
 
+def extract_elements(slide: ET.Element | str) -> list[SlideElement]:
+    if isinstance(slide, str):
+        slide = ET.fromstring(slide)
+    elements: list[dict[str, Any]] = []
+
+    for node in slide.iter():
+        kind = xml_local_name(node.tag)
+        if kind not in ELEMENT_KINDS:
+            continue
+        attrs = node.attrib
         element_id = extract_attribute(attrs, "id") or f"{kind}-{len(elements) + 1}"
         x = extract_numeric_attribute(attrs, "topLeftX")
         y = extract_numeric_attribute(attrs, "topLeftY")
@@ -648,10 +947,10 @@ def extract_elements(slide_xml: str) -> list[dict[str, Any]]:
         table_layouts: dict[str, dict[str, Any] | None] = {}
         if kind == "table":
             width, table_layouts["width"] = resolve_table_dimension(
-                content, width, extract_table_column_sizes, DEFAULT_TABLE_COLUMN_WIDTH
+                node, width, extract_table_column_sizes, DEFAULT_TABLE_COLUMN_WIDTH
             )
             height, table_layouts["height"] = resolve_table_dimension(
-                content, height, extract_table_row_sizes, DEFAULT_TABLE_ROW_HEIGHT
+                node, height, extract_table_row_sizes, DEFAULT_TABLE_ROW_HEIGHT
             )
         if all(value is not None for value in [x, y, width, height]):
             element = {
@@ -675,7 +974,7 @@ def extract_elements(slide_xml: str) -> list[dict[str, Any]]:
                     }
                 )
             if kind == "shape":
-                content_attrs = extract_tag_attributes(content, "content")
+                content_attrs = extract_tag_attributes(node, "content")
                 font_size = extract_numeric_attribute(content_attrs, "fontSize")
                 if font_size is None:
                     font_size = extract_numeric_attribute(attrs, "fontSize")
@@ -695,71 +994,232 @@ def extract_elements(slide_xml: str) -> list[dict[str, Any]]:
                         "paddingBottom": extract_numeric_attribute(content_attrs, "paddingBottom") or 0,
                         "paddingLeft": extract_numeric_attribute(content_attrs, "paddingLeft") or 0,
                         "fontSize": font_size if font_size is not None else 16,
-                        "text": strip_xml_paragraphs(content),
-                        "paragraphs": extract_text_paragraphs(content, font_size if font_size is not None else 16),
+                        "text": element_paragraphs_text(node),
+                        "paragraphs": extract_text_paragraphs(node, font_size if font_size is not None else 16),
                     }
                 )
-            elements.append(element)
+            elements.append(SlideElement(element))
     return elements
 
 
-def intersects(left: dict[str, Any], right: dict[str, Any]) -> bool:
+def intersects(left: Box, right: Box) -> bool:
     return (
-        left["x"] < right["x"] + right["width"]
-        and left["x"] + left["width"] > right["x"]
-        and left["y"] < right["y"] + right["height"]
-        and left["y"] + left["height"] > right["y"]
+        left.x < right.x + right.width
+        and left.x + left.width > right.x
+        and left.y < right.y + right.height
+        and left.y + left.height > right.y
     )
 
 
-def is_text_element(element: dict[str, Any]) -> bool:
-    return element["kind"] == "shape" and element["type"] == "text"
+def spatial_grid_cells(box: Box | None) -> list[tuple[int, int]] | None:
+    if box is None:
+        return None
+    x, y, width, height = box.x, box.y, box.width, box.height
+    if not all(isinstance(value, (int, float)) and math.isfinite(value) for value in (x, y, width, height)):
+        return None
+    if width < 0 or height < 0:
+        return None
+    left = math.floor(x / SPATIAL_GRID_CELL_SIZE)
+    right = math.floor((x + width) / SPATIAL_GRID_CELL_SIZE)
+    top = math.floor(y / SPATIAL_GRID_CELL_SIZE)
+    bottom = math.floor((y + height) / SPATIAL_GRID_CELL_SIZE)
+    if (right - left + 1) * (bottom - top + 1) > SPATIAL_GRID_MAX_CELLS:
+        return None
+    return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+
+class SpatialGrid:
+    # Uniform grid over bounding boxes. Cells are inclusive of both edges, so any two
+    # boxes that intersect share a cell. Boxes that cannot be bucketed (None, negative
+    # or non-finite geometry, or too large) are candidates for every query.
+    def __init__(self, boxes: list[Box | None]) -> None:
+        self.size = len(boxes)
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.unbounded: list[int] = []
+        for index, box in enumerate(boxes):
+            cells = spatial_grid_cells(box)
+            if cells is None:
+                self.unbounded.append(index)
+                continue
+            for cell in cells:
+                self.cells.setdefault(cell, []).append(index)
+
+    def query(self, box: Box | None) -> list[int]:
+        cells = spatial_grid_cells(box)
+        if cells is None:
+            return list(range(self.size))
+        candidates = set(self.unbounded)
+        for cell in cells:
+            candidates.update(self.cells.get(cell, ()))
+        return sorted(candidates)
+
+    def pairs(self) -> list[tuple[int, int]]:
+        candidates: set[tuple[int, int]] = set()
+        for members in self.cells.values():
+            for position, left in enumerate(members):
+                candidates.update((left, right) for right in members[position + 1 :])
+        for index in self.unbounded:
+            candidates.update((min(index, other), max(index, other)) for other in range(self.size) if other != index)
+        return sorted(candidates)
+
+
+def load_numpy() -> Any:
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+
+            _NUMPY = numpy
+        except ImportError:
+            _NUMPY = False
+    return _NUMPY or None
+
+
+def geometry_numpy(element_count: int) -> Any:
+    # NumPy only pays off once a slide has enough elements to fill the pair matrix.
+    if not NUMPY_MIN_ELEMENTS <= element_count <= NUMPY_MAX_ELEMENTS:
+        return None
+    return load_numpy()
+
+
+def box_bounds_array(numpy: Any, boxes: list[Box | None]) -> tuple[Any, Any]:
+    # (left, top, right, bottom) rows plus a mask of boxes that must be treated as
+    # touching everything, mirroring SpatialGrid's unbounded boxes. Coordinates are
+    # capped so float64 holds every value and edge sum exactly.
+    rows: list[tuple[int | float, ...]] = []
+    unbounded: list[bool] = []
+    for box in boxes:
+        values = None if box is None else (box.x, box.y, box.width, box.height)
+        if (
+            values is None
+            or not all(
+                isinstance(value, (int, float)) and math.isfinite(value) and abs(value) <= NUMPY_EXACT_COORDINATE
+                for value in values
+            )
+            or values[2] < 0
+            or values[3] < 0
+        ):
+            rows.append((0, 0, 0, 0))
+            unbounded.append(True)
+            continue
+        x, y, width, height = values
+        rows.append((x, y, x + width, y + height))
+        unbounded.append(False)
+    bounds = numpy.array(rows, dtype=numpy.float64).reshape(len(rows), 4)
+    return bounds, numpy.array(unbounded, dtype=bool)
+
+
+def box_touch_matrix(numpy: Any, boxes: list[Box | None], others: list[Box | None]) -> Any:
+    # True where two boxes intersect or share an edge. A superset of intersects(), so
+    # callers still apply the exact scalar rules to the candidates.
+    bounds, unbounded = box_bounds_array(numpy, boxes)
+    other_bounds, other_unbounded = box_bounds_array(numpy, others)
+    matrix = (
+        (bounds[:, 0, None] <= other_bounds[None, :, 2])
+        & (bounds[:, 2, None] >= other_bounds[None, :, 0])
+        & (bounds[:, 1, None] <= other_bounds[None, :, 3])
+        & (bounds[:, 3, None] >= other_bounds[None, :, 1])
+    )
+    matrix |= unbounded[:, None]
+    matrix |= other_unbounded[None, :]
+    return matrix
+
+
+def overlap_candidate_pairs(boxes: list[Box | None]) -> list[tuple[int, int]]:
+    numpy = geometry_numpy(len(boxes))
+    if numpy is None:
+        return SpatialGrid(boxes).pairs()
+    left_indices, right_indices = numpy.nonzero(numpy.triu(box_touch_matrix(numpy, boxes, boxes), 1))
+    return list(zip(left_indices.tolist(), right_indices.tolist()))
+
+
+def overlap_candidate_lists(boxes: list[Box], others: list[Box]) -> list[list[int]]:
+    numpy = geometry_numpy(len(boxes) + len(others))
+    if numpy is None or not boxes or not others:
+        grid = SpatialGrid(others)
+        return [grid.query(box) for box in boxes]
+    return [numpy.flatnonzero(row).tolist() for row in box_touch_matrix(numpy, boxes, others)]
+
+
+def canvas_overflow_candidates(
+    elements: list[SlideElement], slide_width: int | float, slide_height: int | float
+) -> list[bool]:
+    # False only for unrotated elements whose box lies inside the canvas; everything
+    # else goes through the exact rotated-bbox check.
+    numpy = geometry_numpy(len(elements))
+    if numpy is None:
+        return [True] * len(elements)
+    bounds, unbounded = box_bounds_array(numpy, elements)
+    inside = (
+        (bounds[:, 0] >= 0)
+        & (bounds[:, 1] >= 0)
+        & (bounds[:, 2] <= slide_width)
+        & (bounds[:, 3] <= slide_height)
+        & ~unbounded
+        & numpy.array([element.rotation == 0 for element in elements], dtype=bool)
+    )
+    return (~inside).tolist()
+
 
+def is_text_element(element: SlideElement) -> bool:
+    return element.kind == "shape" and element.type == "text"
 
-def is_whiteboard_element(element: dict[str, Any]) -> bool:
-    return element["kind"] == "whiteboard"
 
+def is_whiteboard_element(element: SlideElement) -> bool:
+    return element.kind == "whiteboard"
 
-def has_text_content(element: dict[str, Any]) -> bool:
-    return bool(element.get("text"))
 
+def has_text_content(element: SlideElement) -> bool:
+    return bool(getattr(element, "text", None))
 
-def is_vertical_text(element: dict[str, Any]) -> bool:
-    return element.get("vert") in {"vert", "vert270", "word-art-vert", "word-art-vert-rtl", "ea-vert"}
 
+def is_vertical_text(element: SlideElement) -> bool:
+    return element.vert in {"vert", "vert270", "word-art-vert", "word-art-vert-rtl", "ea-vert"}
 
-def detect_image_text_occlusions(elements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+
+def detect_image_text_occlusions(elements: list[SlideElement]) -> list[dict[str, Any]]:
     issues: list[dict[str, Any]] = []
     text_elements = [element for element in elements if is_text_element(element) and has_text_content(element)]
-    image_elements = [element for element in elements if element["kind"] == "img" and element["alpha"] > 0]
-    for text_element in text_elements:
-        for image_element in image_elements:
-            if image_element["order"] <= text_element["order"]:
+    image_elements = [element for element in elements if element.kind == "img" and element.alpha > 0]
+    text_boxes = [
+        (text_element, text_element if is_vertical_text(text_element) else estimate_text_visual_bbox(text_element))
+        for text_element in text_elements
+    ]
+    text_boxes = [
+        (text_element, text_visual_bbox)
+        for text_element, text_visual_bbox in text_boxes
+        if text_visual_bbox is not None
+    ]
+    candidate_lists = overlap_candidate_lists([text_visual_bbox for _, text_visual_bbox in text_boxes], image_elements)
+    for (text_element, text_visual_bbox), image_indices in zip(text_boxes, candidate_lists):
+        vertical_text = is_vertical_text(text_element)
+        for image_index in image_indices:
+            image_element = image_elements[image_index]
+            if image_element.order <= text_element.order:
                 continue
-            if is_vertical_text(text_element):
+            if vertical_text:
                 if intersects(image_element, text_element):
                     issues.append({
                         "level": "info",
                         "code": "image_may_cover_vertical_text",
-                        "elements": [image_element["id"], text_element["id"]],
-                        "message": f'image {image_element["id"]} may cover vertical text shape {text_element["id"]}',
+                        "elements": [image_element.id, text_element.id],
+                        "message": f'image {image_element.id} may cover vertical text shape {text_element.id}',
                         "hint": "Inspect the rendered slide because vertical text layout is not statically modeled.",
                     })
                 continue
-            text_visual_bbox = estimate_text_visual_bbox(text_element)
-            if text_visual_bbox is not None and intersects(image_element, text_visual_bbox):
+            if intersects(image_element, text_visual_bbox):
                 issues.append({
                     "level": "error",
                     "code": "image_covers_text",
-                    "elements": [image_element["id"], text_element["id"]],
-                    "message": f'image {image_element["id"]} covers text shape {text_element["id"]}',
+                    "elements": [image_element.id, text_element.id],
+                    "message": f'image {image_element.id} covers text shape {text_element.id}',
                     "hint": "Move the image before the text shape in XML order, or adjust the image and text shape coordinates or dimensions.",
                 })
     return issues
 
 
-def is_decorative_text(element: dict[str, Any]) -> bool:
-    text = element.get("text") or ""
+def is_decorative_text(element: SlideElement) -> bool:
+    text = element.text or ""
     return bool(text) and re.search(r"[A-Za-z0-9\u4e00-\u9fff]", text) is None
 
 
@@ -767,55 +1227,120 @@ def normalize_text_for_overlap(text: str) -> str:
     return re.sub(r"\s+", "", text)
 
 
-def estimate_character_width(character: str, font_size: int | float) -> int | float:
+@lru_cache(maxsize=None)
+def character_width_class(character: str) -> str:
     if character.isspace():
-        return font_size * 0.33
+        return "space"
     if unicodedata.east_asian_width(character) in {"F", "W"}:
+        return "wide"
+    return "narrow"
+
+
+def estimate_character_width(character: str, font_size: int | float) -> int | float:
+    width_class = character_width_class(character)
+    if width_class == "space":
+        return font_size * 0.33
+    if width_class == "wide":
         return font_size
     return font_size * 0.55
 
 
+class CharacterWidthTable(dict):
+    # Estimated width of every character seen so far at one font size.
+    def __init__(self, font_size: int | float) -> None:
+        super().__init__()
+        self.font_size = font_size
+
+    def __missing__(self, character: str) -> int | float:
+        width = self[character] = estimate_character_width(character, self.font_size)
+        return width
+
+
+@lru_cache(maxsize=256, typed=True)
+def character_width_table(font_size: int | float) -> CharacterWidthTable:
+    return CharacterWidthTable(font_size)
+
+
 def estimate_text_width(text: str, font_size: int | float) -> int | float:
-    return sum(estimate_character_width(character, font_size) for character in text)
+    return sum(map(character_width_table(font_size).__getitem__, text))
+
+
+class TextMetrics:
+    # Width and wrap estimates for one text at one font size. Detectors that measure the
+    # same text element share one instance through measure_text().
+    def __init__(self, text: str, font_size: int | float) -> None:
+        widths = character_width_table(font_size).__getitem__
+        self.text = text
+        self.hard_lines = text.split("\n")
+        self.line_widths = [sum(map(widths, line)) for line in self.hard_lines]
+        self.max_line_width = max([width for line, width in zip(self.hard_lines, self.line_widths) if line] or [1])
+        self.normalized_text = normalize_text_for_overlap(text)
+        self.wrapped_line_counts: dict[Any, int] = {}
+        self._similarity_matcher: SequenceMatcher | None = None
+
+    def similarity_matcher(self) -> SequenceMatcher:
+        # SequenceMatcher indexes its second sequence; keep that index for later comparisons.
+        if self._similarity_matcher is None:
+            self._similarity_matcher = SequenceMatcher(None, "", self.normalized_text)
+        return self._similarity_matcher
+
+    def line_count(self, box_width: int | float, wrap: str | None) -> int:
+        if not self.text:
+            return 0
+        if wrap in {"false", "0"}:
+            return len(self.hard_lines)
+        line_count = self.wrapped_line_counts.get(box_width)
+        if line_count is None:
+            line_count = sum(
+                max(1, math.ceil(max(width, 1) / max(box_width, 1))) for width in self.line_widths
+            )
+            self.wrapped_line_counts[box_width] = line_count
+        return line_count
+
+
+@lru_cache(maxsize=TEXT_METRICS_CACHE_ENTRIES, typed=True)
+def measure_text(text: str, font_size: int | float) -> TextMetrics:
+    return TextMetrics(text, font_size)
+
+
+def element_font_size(element: SlideElement) -> int | float:
+    return element.fontSize if isinstance(element.fontSize, (int, float)) else 16
 
 
-def estimate_text_max_line_width(element: dict[str, Any]) -> int | float:
-    font_size = element["fontSize"] if isinstance(element["fontSize"], (int, float)) else 16
-    paragraphs = [paragraph for paragraph in re.split(r"\n+", element["text"]) if paragraph]
-    return max([estimate_text_width(paragraph, font_size) for paragraph in paragraphs] or [1])
+def element_text_metrics(element: SlideElement, text: str | None = None) -> TextMetrics:
+    return measure_text(element.text if text is None else text, element_font_size(element))
 
 
-def is_similar_text_overlay(left: dict[str, Any], right: dict[str, Any]) -> bool:
-    left_text = normalize_text_for_overlap(left.get("text") or "")
-    right_text = normalize_text_for_overlap(right.get("text") or "")
+def estimate_text_max_line_width(element: SlideElement) -> int | float:
+    return element_text_metrics(element).max_line_width
+
+
+def is_similar_text_overlay(left: SlideElement, right: SlideElement) -> bool:
+    right_metrics = element_text_metrics(right, right.text or "")
+    left_text = element_text_metrics(left, left.text or "").normalized_text
+    right_text = right_metrics.normalized_text
     if not left_text or not right_text:
         return False
     if left_text == right_text or left_text in right_text or right_text in left_text:
         return True
-    return SequenceMatcher(None, left_text, right_text).ratio() >= 0.75
+    # The length ratio and quick_ratio() are upper bounds of ratio(), so they can reject early.
+    if 2.0 * min(len(left_text), len(right_text)) / (len(left_text) + len(right_text)) < 0.75:
+        return False
+    matcher = right_metrics.similarity_matcher()
+    matcher.set_seq1(left_text)
+    return matcher.quick_ratio() >= 0.75 and matcher.ratio() >= 0.75
 
 
-def estimate_text_line_count_for_text(element: dict[str, Any], text: str) -> int:
-    font_size = element["fontSize"] if isinstance(element["fontSize"], (int, float)) else 16
-    hard_lines = text.split("\n")
-    if not text:
-        return 0
-    line_count = 0
-    for hard_line in hard_lines:
-        if element.get("wrap") in {"false", "0"}:
-            line_count += 1
-            continue
-        logical_width = max(estimate_text_width(hard_line, font_size), 1)
-        line_count += max(1, math.ceil(logical_width / max(element["width"], 1)))
-    return line_count
+def estimate_text_line_count_for_text(element: SlideElement, text: str) -> int:
+    return element_text_metrics(element, text).line_count(element.width, element.wrap)
 
 
-def estimate_text_line_count(element: dict[str, Any]) -> int:
-    return max(estimate_text_line_count_for_text(element, element["text"]), 1)
+def estimate_text_line_count(element: SlideElement) -> int:
+    return max(estimate_text_line_count_for_text(element, element.text), 1)
 
 
-def estimate_text_line_height(element: dict[str, Any], line_spacing: str | None = None) -> int | float | None:
-    font_size = element["fontSize"] if isinstance(element["fontSize"], (int, float)) else 16
+def estimate_text_line_height(element: SlideElement, line_spacing: str | None = None) -> int | float | None:
+    font_size = element_font_size(element)
     line_spacing = line_spacing or "multiple:1.5"
     match = re.fullmatch(r"(multiple|fixed):([0-9]+(?:\.[0-9]+)?)", line_spacing)
     if match is None:
@@ -824,18 +1349,18 @@ def estimate_text_line_height(element: dict[str, Any], line_spacing: str | None
     return font_size * float(value) if spacing_type == "multiple" else float(value)
 
 
-def detect_text_may_overflow_shapes(elements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def detect_text_may_overflow_shapes(elements: list[SlideElement]) -> list[dict[str, Any]]:
     issues: list[dict[str, Any]] = []
     for element in elements:
         if not is_text_element(element) or not has_text_content(element):
             continue
-        if element.get("autoFit") in {"normal-auto-fit", "shape-auto-fit"}:
+        if element.autoFit in {"normal-auto-fit", "shape-auto-fit"}:
             continue
 
-        font_size = element["fontSize"] if isinstance(element["fontSize"], (int, float)) else 16
-        paragraphs = element.get("paragraphs") or [
+        font_size = element_font_size(element)
+        paragraphs = element.paragraphs or [
             {
-                "text": element["text"],
+                "text": element.text,
                 "lineSpacing": None,
                 "beforeLineSpacing": None,
                 "afterLineSpacing": None,
@@ -848,12 +1373,12 @@ def detect_text_may_overflow_shapes(elements: list[dict[str, Any]]) -> list[dict
             paragraph_line_count = estimate_text_line_count_for_text(element, paragraph["text"])
             if paragraph_line_count == 0:
                 continue
-            line_height = estimate_text_line_height(element, paragraph["lineSpacing"] or element["lineSpacing"])
+            line_height = estimate_text_line_height(element, paragraph["lineSpacing"] or element.lineSpacing)
             before_spacing = estimate_text_line_height(
-                element, paragraph["beforeLineSpacing"] or element["beforeLineSpacing"] or "fixed:0"
+                element, paragraph["beforeLineSpacing"] or element.beforeLineSpacing or "fixed:0"
             )
             after_spacing = estimate_text_line_height(
-                element, paragraph["afterLineSpacing"] or element["afterLineSpacing"] or "fixed:0"
+                element, paragraph["afterLineSpacing"] or element.afterLineSpacing or "fixed:0"
             )
             if line_height is None or before_spacing is None or after_spacing is None:
                 line_count = 0
@@ -866,7 +1391,7 @@ def detect_text_may_overflow_shapes(elements: list[dict[str, Any]]) -> list[dict
             )
         if line_count == 0:
             continue
-        available_height = max(element["height"] - element["paddingTop"] - element["paddingBottom"], 0)
+        available_height = max(element.height - element.paddingTop - element.paddingBottom, 0)
         overflow = estimated_height - available_height
         if overflow <= 0:
             continue
@@ -875,14 +1400,14 @@ def detect_text_may_overflow_shapes(elements: list[dict[str, Any]]) -> list[dict
             {
                 "level": "warning",
                 "code": "text_may_overflow_shape",
-                "elements": [element["id"]],
+                "elements": [element.id],
                 "line_count": line_count,
                 "line_height": max(line_heights),
                 "estimated_height": estimated_height,
                 "available_height": available_height,
                 "overflow": overflow,
                 "message": (
-                    f'text shape {element["id"]} may overflow its own content box '
+                    f'text shape {element.id} may overflow its own content box '
                     f'(estimated {estimated_height:g}px, available {available_height:g}px); '
                     'consider setting content wrap="true" autoFit="normal-auto-fit"'
                 ),
@@ -896,98 +1421,93 @@ def detect_text_may_overflow_shapes(elements: list[dict[str, Any]]) -> list[dict
     return issues
 
 
-def estimate_text_visual_bbox(element: dict[str, Any]) -> dict[str, int | float] | None:
+def estimate_text_visual_bbox(element: SlideElement) -> Box | None:
     if not is_text_element(element) or not has_text_content(element) or is_decorative_text(element):
         return None
 
-    padding_left = element.get("paddingLeft", 0)
-    padding_right = element.get("paddingRight", 0)
-    padding_top = element.get("paddingTop", 0)
-    padding_bottom = element.get("paddingBottom", 0)
-    content_width = max(element["width"] - padding_left - padding_right, 0)
-    content_height = max(element["height"] - padding_top - padding_bottom, 0)
-    font_size = element["fontSize"] if isinstance(element["fontSize"], (int, float)) else 16
+    padding_left = element.paddingLeft
+    padding_right = element.paddingRight
+    padding_top = element.paddingTop
+    padding_bottom = element.paddingBottom
+    content_width = max(element.width - padding_left - padding_right, 0)
+    content_height = max(element.height - padding_top - padding_bottom, 0)
+    font_size = element_font_size(element)
     line_count = estimate_text_line_count(element)
     estimated_width = max(1, estimate_text_max_line_width(element))
-    visual_width = estimated_width if element.get("wrap") in {"false", "0"} else min(content_width, estimated_width)
+    visual_width = estimated_width if element.wrap in {"false", "0"} else min(content_width, estimated_width)
     visual_height = min(content_height, max(1, line_count * font_size * 1.2))
-    x = element["x"] + padding_left
-    if element.get("textAlign") == "center":
+    x = element.x + padding_left
+    if element.textAlign == "center":
         x += (content_width - visual_width) / 2
-    elif element.get("textAlign") == "right":
+    elif element.textAlign == "right":
         x += content_width - visual_width
-    y = element["y"] + padding_top
-    if element.get("verticalAlign") == "middle":
+    y = element.y + padding_top
+    if element.verticalAlign == "middle":
         y += (content_height - visual_height) / 2
-    elif element.get("verticalAlign") == "bottom":
+    elif element.verticalAlign == "bottom":
         y += content_height - visual_height
-    return {
-        "x": x,
-        "y": y,
-        "width": visual_width,
-        "height": visual_height,
-    }
+    return Box(x, y, visual_width, visual_height)
 
 
-def intersection_area(left: dict[str, Any], right: dict[str, Any]) -> int | float:
-    width = min(left["x"] + left["width"], right["x"] + right["width"]) - max(left["x"], right["x"])
-    height = min(left["y"] + left["height"], right["y"] + right["height"]) - max(left["y"], right["y"])
+def intersection_area(left: Box, right: Box) -> int | float:
+    width = min(left.x + left.width, right.x + right.width) - max(left.x, right.x)
+    height = min(left.y + left.height, right.y + right.height) - max(left.y, right.y)
     if width <= 0 or height <= 0:
         return 0
     return width * height
 
 
-def intersection_height(left: dict[str, Any], right: dict[str, Any]) -> int | float:
-    height = min(left["y"] + left["height"], right["y"] + right["height"]) - max(left["y"], right["y"])
+def intersection_height(left: Box, right: Box) -> int | float:
+    height = min(left.y + left.height, right.y + right.height) - max(left.y, right.y)
     return max(height, 0)
 
 
-def intersection_width(left: dict[str, Any], right: dict[str, Any]) -> int | float:
-    width = min(left["x"] + left["width"], right["x"] + right["width"]) - max(left["x"], right["x"])
+def intersection_width(left: Box, right: Box) -> int | float:
+    width = min(left.x + left.width, right.x + right.width) - max(left.x, right.x)
     return max(width, 0)
 
 
-def element_area(element: dict[str, Any]) -> int | float:
-    return max(element["width"], 0) * max(element["height"], 0)
+def element_area(element: SlideElement) -> int | float:
+    return max(element.width, 0) * max(element.height, 0)
 
 
-def contains(outer: dict[str, Any], inner: dict[str, Any], tolerance: int | float = 2) -> bool:
+def contains(outer: Box, inner: Box, tolerance: int | float = 2) -> bool:
     return (
-        inner["x"] >= outer["x"] - tolerance
-        and inner["y"] >= outer["y"] - tolerance
-        and inner["x"] + inner["width"] <= outer["x"] + outer["width"] + tolerance
-        and inner["y"] + inner["height"] <= outer["y"] + outer["height"] + tolerance
+        inner.x >= outer.x - tolerance
+        and inner.y >= outer.y - tolerance
+        and inner.x + inner.width <= outer.x + outer.width + tolerance
+        and inner.y + inner.height <= outer.y + outer.height + tolerance
     )
 
 
 def is_bottom_layer_full_slide_whiteboard(
-    whiteboard: dict[str, Any], other: dict[str, Any], slide_width: int | float, slide_height: int | float
+    whiteboard: SlideElement, other: SlideElement, slide_width: int | float, slide_height: int | float
 ) -> bool:
     return (
-        whiteboard["order"] < other["order"]
-        and whiteboard["x"] <= 2
-        and whiteboard["y"] <= 2
-        and whiteboard["width"] >= slide_width - 4
-        and whiteboard["height"] >= slide_height - 4
+        whiteboard.order < other.order
+        and whiteboard.x <= 2
+        and whiteboard.y <= 2
+        and whiteboard.width >= slide_width - 4
+        and whiteboard.height >= slide_height - 4
     )
 
 
-def is_background_container_for_whiteboard(container: dict[str, Any], whiteboard: dict[str, Any]) -> bool:
-    if container["order"] > whiteboard["order"]:
+def is_background_container_for_whiteboard(container: SlideElement, whiteboard: SlideElement) -> bool:
+    if container.order > whiteboard.order:
         return False
     if is_text_element(container):
         return False
     return contains(container, whiteboard)
 
 
-def is_template_text_stack(left: dict[str, Any], right: dict[str, Any]) -> bool:
+def is_template_text_stack(left: SlideElement, right: SlideElement) -> bool:
     if not (is_text_element(left) and is_text_element(right)):
         return False
     if not (has_text_content(left) and has_text_content(right)):
         return True
-    top, bottom = sorted([left, right], key=lambda element: element["y"])
-    top_type = top.get("textType")
-    bottom_type = bottom.get("textType")
+    top, bottom = sorted([left, right], key=lambda element: element.y)
+    top_type = top.textType
+    bottom_type = bottom.textType
     allowed_pairs = {
         ("title", "sub-headline"),
         ("title", None),
@@ -996,13 +1516,13 @@ def is_template_text_stack(left: dict[str, Any], right: dict[str, Any]) -> bool:
     }
     if (top_type, bottom_type) not in allowed_pairs:
         return False
-    same_column = abs(top["x"] - bottom["x"]) <= 4
-    vertical_offset = bottom["y"] - top["y"]
-    top_font_size = float(top.get("fontSize", 16))
+    same_column = abs(top.x - bottom.x) <= 4
+    vertical_offset = bottom.y - top.y
+    top_font_size = float(top.fontSize)
     return same_column and vertical_offset >= top_font_size * 0.75
 
 
-def should_flag_horizontal_text_overflow(left: dict[str, Any], right: dict[str, Any]) -> bool:
+def should_flag_horizontal_text_overflow(left: SlideElement, right: SlideElement) -> bool:
     if not (is_text_element(left) and is_text_element(right)):
         return False
     if not (has_text_content(left) and has_text_content(right)):
@@ -1010,36 +1530,36 @@ def should_flag_horizontal_text_overflow(left: dict[str, Any], right: dict[str,
     if is_template_text_stack(left, right) or is_similar_text_overlay(left, right):
         return False
 
-    source, target = sorted([left, right], key=lambda element: element["x"])
-    if source["x"] == target["x"]:
+    source, target = sorted([left, right], key=lambda element: element.x)
+    if source.x == target.x:
         return False
-    wrap_enabled = source.get("wrap") not in {"false", "0"}
-    has_horizontal_gap = source["x"] + source["width"] <= target["x"]
+    wrap_enabled = source.wrap not in {"false", "0"}
+    has_horizontal_gap = source.x + source.width <= target.x
     if wrap_enabled and has_horizontal_gap:
         return False
-    if source.get("autoFit") == "normal-auto-fit":
+    if source.autoFit == "normal-auto-fit":
         return False
-    if source.get("textAlign") in {"center", "right"}:
+    if source.textAlign in {"center", "right"}:
         return False
 
-    font_size = source["fontSize"] if isinstance(source["fontSize"], (int, float)) else 16
+    font_size = element_font_size(source)
     visual_width = estimate_text_max_line_width(source)
-    overflow_width = visual_width - source["width"]
-    min_overflow = max(font_size * 1.5, source["width"] * 0.08)
+    overflow_width = visual_width - source.width
+    min_overflow = max(font_size * 1.5, source.width * 0.08)
     if overflow_width < min_overflow:
         return False
 
-    intrusion_width = source["x"] + visual_width - target["x"]
-    min_intrusion = max(font_size * 1.5, target["width"] * 0.08)
+    intrusion_width = source.x + visual_width - target.x
+    min_intrusion = max(font_size * 1.5, target.width * 0.08)
     if intrusion_width < min_intrusion:
         return False
 
     vertical_overlap = intersection_height(source, target)
-    min_vertical_overlap = min(source["height"], target["height"]) * 0.40
+    min_vertical_overlap = min(source.height, target.height) * 0.40
     return vertical_overlap >= min_vertical_overlap
 
 
-def should_flag_overlap(left: dict[str, Any], right: dict[str, Any]) -> bool:
+def should_flag_overlap(left: SlideElement, right: SlideElement) -> bool:
     if is_text_element(left) and not has_text_content(left):
         return False
     if is_text_element(right) and not has_text_content(right):
@@ -1057,22 +1577,22 @@ def should_flag_overlap(left: dict[str, Any], right: dict[str, Any]) -> bool:
         if overlap_area <= 0:
             return False
         smaller_area = min(
-            left_visual["width"] * left_visual["height"],
-            right_visual["width"] * right_visual["height"],
+            left_visual.width * left_visual.height,
+            right_visual.width * right_visual.height,
         )
         return smaller_area > 0 and overlap_area / smaller_area >= 0.30
     return False
 
 
 def build_whiteboard_external_overlap_issue(
-    whiteboard: dict[str, Any], overlap_details: list[dict[str, Any]]
+    whiteboard: SlideElement, overlap_details: list[dict[str, Any]]
 ) -> dict[str, Any]:
     element_ids = [detail["element"] for detail in overlap_details]
     return {
         "level": "warning",
         "code": "whiteboard_external_overlap",
-        "elements": [whiteboard["id"], *element_ids],
-        "message": f'whiteboard {whiteboard["id"]} overlaps {len(element_ids)} sibling elements across its boundary',
+        "elements": [whiteboard.id, *element_ids],
+        "message": f'whiteboard {whiteboard.id} overlaps {len(element_ids)} sibling elements across its boundary',
         "hint": (
             "Treat this as a static whiteboard container-bbox risk, not final visual proof. "
             "After moving or accepting the overlap, use screenshot QA or equivalent rendered visual inspection as "
@@ -1083,8 +1603,8 @@ def build_whiteboard_external_overlap_issue(
 
 
 def should_report_whiteboard_overlap(
-    whiteboard: dict[str, Any],
-    other: dict[str, Any],
+    whiteboard: SlideElement,
+    other: SlideElement,
     slide_width: int | float,
     slide_height: int | float,
 ) -> dict[str, Any] | None:
@@ -1111,9 +1631,9 @@ def should_report_whiteboard_overlap(
         return None
 
     return {
-        "element": other["id"],
-        "kind": other["kind"],
-        "type": other.get("type"),
+        "element": other.id,
+        "kind": other.kind,
+        "type": other.type,
         "overlap_width": overlap_width,
         "overlap_height": overlap_height,
         "target_overlap_ratio": round(overlap_ratio, 3),
@@ -1121,7 +1641,7 @@ def should_report_whiteboard_overlap(
 
 
 def prune_contained_text_overlap_details(
-    overlap_details: list[dict[str, Any]], elements_by_id: dict[str, dict[str, Any]]
+    overlap_details: list[dict[str, Any]], elements_by_id: dict[str, SlideElement]
 ) -> list[dict[str, Any]]:
     pruned: list[dict[str, Any]] = []
     for detail in overlap_details:
@@ -1140,18 +1660,19 @@ def prune_contained_text_overlap_details(
 
 
 def detect_whiteboard_external_overlaps(
-    elements: list[dict[str, Any]], slide_width: int | float, slide_height: int | float
+    elements: list[SlideElement], slide_width: int | float, slide_height: int | float
 ) -> list[dict[str, Any]]:
     issues: list[dict[str, Any]] = []
-    elements_by_id = {element["id"]: element for element in elements}
+    elements_by_id = {element.id: element for element in elements}
+    element_grid = SpatialGrid(elements)
     for whiteboard in [element for element in elements if is_whiteboard_element(element)]:
         overlap_details = [
             detail
-            for element in elements
+            for index in element_grid.query(whiteboard)
             if (
                 detail := should_report_whiteboard_overlap(
                     whiteboard,
-                    element,
+                    elements[index],
                     slide_width,
                     slide_height,
                 )
@@ -1164,12 +1685,12 @@ def detect_whiteboard_external_overlaps(
     return issues
 
 
-def element_canvas_bbox(element: dict[str, Any]) -> dict[str, int | float]:
-    bbox = {key: element[key] for key in ("x", "y", "width", "height")}
-    if element["kind"] != "chart" and not (element["kind"] == "shape" and element["type"] == "text"):
+def element_canvas_bbox(element: SlideElement) -> dict[str, int | float]:
+    bbox = {"x": element.x, "y": element.y, "width": element.width, "height": element.height}
+    if element.kind != "chart" and not (element.kind == "shape" and element.type == "text"):
         return bbox
 
-    rotation = element["rotation"]
+    rotation = element.rotation
     if not isinstance(rotation, (int, float)) or not math.isfinite(rotation):
         rotation = 0
     rotation %= 360
@@ -1180,26 +1701,30 @@ def element_canvas_bbox(element: dict[str, Any]) -> dict[str, int | float]:
     cosine = abs(math.cos(radians))
     sine = 0 if math.isclose(sine, 0, abs_tol=1e-12) else sine
     cosine = 0 if math.isclose(cosine, 0, abs_tol=1e-12) else cosine
-    rotated_width = element["width"] * cosine + element["height"] * sine
-    rotated_height = element["width"] * sine + element["height"] * cosine
+    rotated_width = element.width * cosine + element.height * sine
+    rotated_height = element.width * sine + element.height * cosine
     return {
-        "x": element["x"] - (rotated_width - element["width"]) / 2,
-        "y": element["y"] - (rotated_height - element["height"]) / 2,
+        "x": element.x - (rotated_width - element.width) / 2,
+        "y": element.y - (rotated_height - element.height) / 2,
         "width": rotated_width,
         "height": rotated_height,
     }
 
 
 def detect_elements_out_of_canvas(
-    elements: list[dict[str, Any]], slide_width: int | float, slide_height: int | float
+    elements: list[SlideElement], slide_width: int | float, slide_height: int | float
 ) -> list[dict[str, Any]]:
     issues: list[dict[str, Any]] = []
-    for element in (
+    canvas_elements = [
         element
         for element in elements
-        if element["kind"] in {"table", "chart"}
-        or (element["kind"] == "shape" and element["type"] == "text")
-    ):
+        if element.kind in {"table", "chart"}
+        or (element.kind == "shape" and element.type == "text")
+    ]
+    candidates = canvas_overflow_candidates(canvas_elements, slide_width, slide_height)
+    for element, candidate in zip(canvas_elements, candidates):
+        if not candidate:
+            continue
         bbox = element_canvas_bbox(element)
         overflow = {
             "left": max(-bbox["x"], 0),
@@ -1215,47 +1740,47 @@ def detect_elements_out_of_canvas(
         issues.append(
             {
                 "level": "error",
-                "code": f'{element["kind"]}_out_of_canvas',
-                "elements": [element["id"]],
+                "code": f'{element.kind}_out_of_canvas',
+                "elements": [element.id],
                 "canvas": {"width": slide_width, "height": slide_height},
                 "bbox": bbox,
                 "overflow": overflow,
                 "message": (
-                    f'{element["kind"]} {element["id"]} exceeds the {slide_width:g}x{slide_height:g} canvas '
+                    f'{element.kind} {element.id} exceeds the {slide_width:g}x{slide_height:g} canvas '
                     f'({", ".join(overflow_details)})'
                 ),
                 "hint": (
                     "Move the table inside the canvas, reduce table.width/table.height, or split the table across "
                     "slides."
-                    if element["kind"] == "table"
-                    else f'Move the {element["kind"]} inside the canvas or reduce its width/height.'
+                    if element.kind == "table"
+                    else f'Move the {element.kind} inside the canvas or reduce its width/height.'
                 ),
             }
         )
     return issues
 
 
-def extract_table_column_sizes(table_xml: str) -> list[int | float | None]:
+def extract_table_column_sizes(table: ET.Element) -> list[int | float | None]:
     sizes: list[int | float | None] = []
-    for match in re.finditer(r"<col\b([^>]*)/?>", table_xml):
-        attrs = match.group(1)
+    for column in iter_descendants(table, "col"):
+        attrs = column.attrib
         span = extract_numeric_attribute(attrs, "span") or 1
         span_count = int(span) if math.isfinite(span) and span > 0 and float(span).is_integer() else 1
         sizes.extend([extract_numeric_attribute(attrs, "width")] * span_count)
     return sizes
 
 
-def extract_table_row_sizes(table_xml: str) -> list[int | float | None]:
-    return [extract_numeric_attribute(match.group(1), "height") for match in re.finditer(r"<tr\b([^>]*)>", table_xml)]
+def extract_table_row_sizes(table: ET.Element) -> list[int | float | None]:
+    return [extract_numeric_attribute(row.attrib, "height") for row in iter_descendants(table, "tr")]
 
 
 def resolve_table_dimension(
-    table_xml: str,
+    table: ET.Element,
     declared_size: int | float | None,
     extract_sizes: Any,
     default_size: int | float,
 ) -> tuple[int | float | None, dict[str, Any] | None]:
-    input_sizes = extract_sizes(table_xml)
+    input_sizes = extract_sizes(table)
     if not input_sizes:
         return declared_size, None
     layout = solve_weighted_min_layout(
@@ -1268,18 +1793,18 @@ def format_size(size: int | float) -> str:
     return f"{size:g}"
 
 
-def detect_table_layout_size_mismatches(elements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def detect_table_layout_size_mismatches(elements: list[SlideElement]) -> list[dict[str, Any]]:
     issues: list[dict[str, Any]] = []
     dimensions = {
         "width": ("col", "column widths"),
         "height": ("tr", "row heights"),
     }
-    for table in (element for element in elements if element["kind"] == "table"):
+    for table in (element for element in elements if element.kind == "table"):
         for dimension, (child_tag, child_description) in dimensions.items():
-            target_size = table[f"declared_{dimension}"]
+            target_size = getattr(table, f"declared_{dimension}")
             if not is_filled_size(target_size):
                 continue
-            layout = table["table_layouts"][dimension]
+            layout = table.table_layouts[dimension]
             if layout is None:
                 continue
             actual_size = layout["actual_size"]
@@ -1289,13 +1814,13 @@ def detect_table_layout_size_mismatches(elements: list[dict[str, Any]]) -> list[
                 {
                     "level": "info",
                     "code": "table_resolved_size_mismatch",
-                    "elements": [table["id"]],
+                    "elements": [table.id],
                     "dimension": dimension,
                     "declared_size": target_size,
                     "resolved_size": actual_size,
                     "resolved_sizes": layout["final_sizes"],
                     "message": (
-                        f'table {table["id"]} declares {dimension}={format_size(target_size)}px, but its '
+                        f'table {table.id} declares {dimension}={format_size(target_size)}px, but its '
                         f"{child_description} resolve to {format_size(actual_size)}px"
                     ),
                     "hint": (
@@ -1307,10 +1832,26 @@ def detect_table_layout_size_mismatches(elements: list[dict[str, Any]]) -> list[
     return issues
 
 
+def element_reach_bbox(element: SlideElement) -> Box | None:
+    # The area an element can take part in a bbox_overlap issue with: its declared box,
+    # widened to the estimated line width for text that may overflow sideways. Elements
+    # without a positive finite box are compared against every other element.
+    if not all(math.isfinite(value) for value in (element.x, element.y, element.width, element.height)):
+        return None
+    if element.width <= 0 or element.height <= 0:
+        return None
+    if not (is_text_element(element) and has_text_content(element)):
+        return element
+    line_width = estimate_text_max_line_width(element)
+    if not math.isfinite(line_width):
+        return None
+    return Box(element.x, element.y, max(element.width, line_width), element.height)
+
+
 def lint_slide(
-    slide_xml: str, slide_number: int, slide_width: int | float = 960, slide_height: int | float = 540
+    slide: ET.Element | str, slide_number: int, slide_width: int | float = 960, slide_height: int | float = 540
 ) -> dict[str, Any]:
-    elements = extract_elements(slide_xml)
+    elements = extract_elements(slide)
     issues: list[dict[str, Any]] = [
         *detect_whiteboard_external_overlaps(elements, slide_width, slide_height),
         *detect_elements_out_of_canvas(elements, slide_width, slide_height),
@@ -1319,25 +1860,135 @@ def lint_slide(
         *detect_image_text_occlusions(elements),
     ]
 
-    for index, left in enumerate(elements):
-        for right in elements[index + 1 :]:
-            horizontal_overflow = should_flag_horizontal_text_overflow(left, right)
-            if not horizontal_overflow and (not intersects(left, right) or not should_flag_overlap(left, right)):
-                continue
-            issues.append(
-                {
-                    "level": "error",
-                    "code": "bbox_overlap",
-                    "elements": [left["id"], right["id"]],
-                    "message": f'{left["id"]} overlaps {right["id"]}',
-                }
-            )
+    for left_index, right_index in overlap_candidate_pairs([element_reach_bbox(element) for element in elements]):
+        left, right = elements[left_index], elements[right_index]
+        horizontal_overflow = should_flag_horizontal_text_overflow(left, right)
+        if not horizontal_overflow and (not intersects(left, right) or not should_flag_overlap(left, right)):
+            continue
+        issues.append(
+            {
+                "level": "error",
+                "code": "bbox_overlap",
+                "elements": [left.id, right.id],
+                "message": f'{left.id} overlaps {right.id}',
+            }
+        )
 
     return {"slide_number": slide_number, "element_count": len(elements), "issues": issues}
 
 
-def lint_xml(xml: str, source_path: str | None = None) -> dict[str, Any]:
-    root, xml_error = parse_xml_root(xml)
+def linter_version() -> str:
+    global _LINTER_VERSION
+    if _LINTER_VERSION is None:
+        _LINTER_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+    return _LINTER_VERSION
+
+
+class SlideLintCache:
+    # Per-slide lint results keyed by the slide's raw markup, the canvas size and the
+    # linter's own source hash. Entries live in memory and, with a directory, on disk.
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory
+        self.entries: dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, slide_source: bytes, slide_width: int | float, slide_height: int | float) -> str:
+        digest = hashlib.sha256(f"{linter_version()}\0{slide_width}\0{slide_height}\0".encode("utf-8"))
+        digest.update(slide_source)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        payload = self.entries.get(key)
+        if payload is None and self.directory is not None:
+            try:
+                payload = (self.directory / f"{key}.marshal").read_bytes()
+            except OSError:
+                payload = None
+        result = None
+        if payload is not None:
+            try:
+                result = marshal.loads(payload)
+            except (EOFError, ValueError, TypeError):
+                result = None
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.remember(key, payload)
+        return result
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        payload = marshal.dumps(result)
+        self.remember(key, payload)
+        if self.directory is not None:
+            write_cache_file(self.directory / f"{key}.marshal", payload)
+
+    def remember(self, key: str, payload: bytes) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = payload
+        while len(self.entries) > SLIDE_CACHE_MEMORY_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+
+
+def lint_slide_batch(
+    slides: list[ET.Element], slide_numbers: list[int], slide_width: int | float, slide_height: int | float, jobs: int
+) -> list[dict[str, Any]]:
+    if jobs <= 1 or len(slides) < PARALLEL_SLIDE_MIN_COUNT:
+        return [
+            lint_slide(slide, slide_number, slide_width, slide_height)
+            for slide, slide_number in zip(slides, slide_numbers)
+        ]
+
+    # Elements do not travel between processes cheaply, so workers re-parse each slide's own markup.
+    from concurrent.futures import ProcessPoolExecutor
+
+    slide_sources = [ET.tostring(slide, encoding="unicode") for slide in slides]
+    workers = min(jobs, len(slides))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lint_slide,
+                slide_sources,
+                slide_numbers,
+                repeat(slide_width),
+                repeat(slide_height),
+                chunksize=max(1, len(slides) // (workers * 4)),
+            )
+        )
+
+
+def lint_slides(
+    presentation: dict[str, Any],
+    jobs: int = 1,
+    slide_cache: SlideLintCache | None = None,
+    slide_sources: list[bytes] | None = None,
+) -> list[dict[str, Any]]:
+    slides = presentation["slides"]
+    width, height = presentation["width"], presentation["height"]
+    if slide_cache is None:
+        return lint_slide_batch(slides, list(range(1, len(slides) + 1)), width, height, jobs)
+
+    if slide_sources is None:
+        slide_sources = [ET.tostring(slide, encoding="utf-8") for slide in slides]
+    keys = [slide_cache.key(slide_source, width, height) for slide_source in slide_sources]
+    results = [slide_cache.get(key) for key in keys]
+    stale = [index for index, result in enumerate(results) if result is None]
+    stale_results = lint_slide_batch(
+        [slides[index] for index in stale], [index + 1 for index in stale], width, height, jobs
+    )
+    for index, result in zip(stale, stale_results):
+        slide_cache.put(keys[index], result)
+        results[index] = result
+    for index, result in enumerate(results):
+        result["slide_number"] = index + 1
+    return results
+
+
+def lint_xml(
+    xml: str, source_path: str | None = None, jobs: int = 1, slide_cache: SlideLintCache | None = None
+) -> dict[str, Any]:
+    root, namespace_issues, slide_sources, xml_error = parse_xml_document(xml)
     if xml_error:
         return {
             "file": source_path,
@@ -1347,7 +1998,6 @@ def lint_xml(xml: str, source_path: str | None = None) -> dict[str, Any]:
             "slides": [],
         }
 
-    namespace_issues = validate_sml_tag_prefixes(xml)
     sxsd_issues = validate_sxsd_tag_attributes(root) if root is not None else []
     iconpark_issues = validate_iconpark_icon_types(root) if root is not None else []
     top_level_issues = [*namespace_issues, *sxsd_issues, *iconpark_issues]
@@ -1367,11 +2017,8 @@ def lint_xml(xml: str, source_path: str | None = None) -> dict[str, Any]:
             "issues": top_level_issues,
             "slides": [],
         }
-    presentation = parse_presentation(xml)
-    slides = [
-        lint_slide(slide_xml, index + 1, presentation["width"], presentation["height"])
-        for index, slide_xml in enumerate(presentation["slides"])
-    ]
+    presentation = parse_presentation(root)
+    slides = lint_slides(presentation, jobs, slide_cache, slide_sources)
     error_count = sum(1 for issue in top_level_issues if issue["level"] == "error")
     error_count += sum(1 for slide in slides for issue in slide["issues"] if issue["level"] == "error")
     warning_count = sum(1 for issue in top_level_issues if issue["level"] == "warning")
@@ -1394,8 +2041,265 @@ def lint_xml(xml: str, source_path: str | None = None) -> dict[str, Any]:
     return result
 
 
+def lint_xml_stream(input_path: Path, output_stream: TextIO) -> dict[str, Any]:
+    # Writes one NDJSON record per slide as soon as its top-level <presentation> child closes,
+    # then drops that child from the tree, so memory is bounded by the largest slide rather
+    # than the deck. Document-level issues and totals follow in a closing summary record,
+    # which is also returned. Once a prefixed SML tag is seen, later slides are not linted.
+    document = SmlDocumentParser(stream_children=True)
+    child_sxsd_issues: list[dict[str, Any]] = []
+    child_iconpark_issues: list[dict[str, Any]] = []
+    level_counts = {"error": 0, "warning": 0, "info": 0}
+    slide_count = 0
+    slide_size = (960, 540)
+
+    def write_record(record: dict[str, Any]) -> None:
+        output_stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output_stream.flush()
+
+    def count_levels(issues: list[dict[str, Any]]) -> None:
+        for issue in issues:
+            if issue["level"] in level_counts:
+                level_counts[issue["level"]] += 1
+
+    def lint_slides_in(element: ET.Element) -> None:
+        nonlocal slide_count
+        for slide in element.iter():
+            if xml_local_name(slide.tag) != "slide" or document.issues:
+                continue
+            slide_count += 1
+            result = lint_slide(slide, slide_count, *slide_size)
+            count_levels(result["issues"])
+            write_record({"type": "slide", **result})
+
+    def drain_completed_children() -> None:
+        nonlocal slide_size
+        if not document.completed_children:
+            return
+        root = document.root
+        root_name = xml_local_name(root.tag)
+        slide_size = presentation_size(root)
+        for child in document.completed_children:
+            child_sxsd_issues.extend(validate_sxsd_tag_attributes(child, [root_name], root_name))
+            child_iconpark_issues.extend(validate_iconpark_icon_types(child, root_name))
+            lint_slides_in(child)
+            root.remove(child)
+        document.completed_children.clear()
+
+    try:
+        with input_path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(STREAM_CHUNK_SIZE), b""):
+                document.feed(chunk)
+                drain_completed_children()
+            document.feed(b"", final=True)
+        root = document.close()
+    except ET.ParseError as error:
+        xml_error = build_xml_error_issue(error, "")
+        xml_error["context"] = read_error_context(input_path, xml_error["line"], xml_error["column"])
+        top_level_issues = [*document.issues, *child_sxsd_issues, *child_iconpark_issues, xml_error]
+    else:
+        if xml_local_name(root.tag) not in {"presentation", "slide"}:
+            fail("input must contain a <presentation> or <slide> root")
+        # Every child of a <presentation> is gone by now; a bare <slide> root is linted whole.
+        root_sxsd_issues = validate_sxsd_tag_attributes(root)
+        root_iconpark_issues = validate_iconpark_icon_types(root)
+        slide_size = presentation_size(root)
+        lint_slides_in(root)
+        top_level_issues = [
+            *document.issues,
+            *root_sxsd_issues,
+            *child_sxsd_issues,
+            *root_iconpark_issues,
+            *child_iconpark_issues,
+        ]
+
+    count_levels(top_level_issues)
+    summary = {
+        "type": "summary",
+        "file": str(input_path),
+        "slide_size": {"width": slide_size[0], "height": slide_size[1]},
+        "summary": {
+            "slide_count": slide_count,
+            "error_count": level_counts["error"],
+            "warning_count": level_counts["warning"],
+            "info_count": level_counts["info"],
+        },
+    }
+    if top_level_issues:
+        summary["issues"] = top_level_issues
+    write_record(summary)
+    return summary
+
+
 def print_usage() -> None:
-    print("Usage:\n  python3 xml_text_overlap_lint.py --input <presentation.xml>", file=sys.stderr)
+    print(
+        "Usage:\n"
+        "  python3 xml_text_overlap_lint.py --input <presentation.xml>\n"
+        "  python3 xml_text_overlap_lint.py --input <file|directory|glob> [--input ...] [--jobs N] [--output-dir DIR]\n"
+        "                                  [--incremental]\n"
+        "  python3 xml_text_overlap_lint.py --input <presentation.xml> --stream\n"
+        "  python3 xml_text_overlap_lint.py --serve [--jobs N] [--incremental]\n"
+        "  python3 xml_text_overlap_lint.py --build-cache",
+        file=sys.stderr,
+    )
+
+
+def resolve_input_paths(inputs: list[str]) -> list[Path]:
+    paths: list[Path] = []
+    for value in inputs:
+        path = Path(value)
+        if path.is_dir():
+            matches = sorted(path.glob("*.xml"))
+        elif re.search(r"[*?[]", value):
+            matches = sorted(Path(match) for match in glob.glob(value, recursive=True))
+        else:
+            matches = [path]
+        if not matches:
+            fail(f"no XML files match --input {value}")
+        for match in matches:
+            resolved = match.resolve()
+            if resolved not in paths:
+                paths.append(resolved)
+    return paths
+
+
+def parse_jobs(value: Any) -> int:
+    if value is None:
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except (TypeError, ValueError):
+        jobs = 0
+    if jobs < 1:
+        fail(f"--jobs must be a positive integer, got {value}")
+    return jobs
+
+
+def lint_file(input_path: Path, jobs: int = 1, incremental: bool = False) -> dict[str, Any]:
+    slide_cache = SlideLintCache(LINT_CACHE_DIR / "slides") if incremental else None
+    try:
+        return lint_xml(read_file(input_path), str(input_path), jobs, slide_cache)
+    except XmlTextOverlapLintError as error:
+        fail(f"{input_path}: {error}")
+
+
+def lint_files(input_paths: list[Path], jobs: int, incremental: bool = False) -> list[dict[str, Any]]:
+    if len(input_paths) == 1:
+        return [lint_file(input_paths[0], jobs, incremental)]
+    if jobs <= 1:
+        return [lint_file(input_path, 1, incremental) for input_path in input_paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(input_paths))) as executor:
+        return list(executor.map(lint_file, input_paths, repeat(1), repeat(incremental)))
+
+
+def combine_results(results: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "summary": {
+            "file_count": len(results),
+            "slide_count": sum(result["summary"]["slide_count"] for result in results),
+            "error_count": sum(result["summary"]["error_count"] for result in results),
+            "warning_count": sum(result["summary"]["warning_count"] for result in results),
+            "info_count": sum(result["summary"]["info_count"] for result in results),
+        },
+        "files": results,
+    }
+
+
+def write_result_files(results: list[dict[str, Any]], output_dir: Path) -> list[dict[str, Any]]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: list[dict[str, Any]] = []
+    output_paths: set[Path] = set()
+    for result in results:
+        output_path = output_dir / f"{Path(result['file']).stem}.lint.json"
+        if output_path in output_paths:
+            fail(f"two inputs would both write {output_path}; lint them into separate --output-dir directories")
+        output_paths.add(output_path)
+        output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        written.append({"file": result["file"], "output": str(output_path), "summary": result["summary"]})
+    return written
+
+
+def build_rpc_error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_lint(params: dict[str, Any], jobs: int, slide_cache: SlideLintCache) -> dict[str, Any]:
+    if "xml" in params:
+        return lint_xml(params["xml"], params.get("file"), jobs, slide_cache)
+    input_path = Path(params["path"]).resolve()
+    try:
+        xml = read_file(input_path)
+    except (OSError, UnicodeDecodeError) as error:
+        fail(f"cannot read {input_path}: {error}")
+    return lint_xml(xml, str(input_path), jobs, slide_cache)
+
+
+def handle_rpc_request(request: Any, jobs: int, slide_cache: SlideLintCache) -> dict[str, Any] | None:
+    if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+        request_id = request.get("id") if isinstance(request, dict) else None
+        return build_rpc_error(request_id, JSONRPC_INVALID_REQUEST, "expected a JSON-RPC 2.0 request object")
+    request_id = request.get("id")
+    method = request["method"]
+    params = request.get("params", {})
+    if not isinstance(params, dict):
+        return build_rpc_error(request_id, JSONRPC_INVALID_PARAMS, "params must be an object")
+
+    try:
+        if method == "lint":
+            sources = [key for key in ("xml", "path") if isinstance(params.get(key), str)]
+            if len(sources) != 1 or not isinstance(params.get("file", ""), str):
+                return build_rpc_error(
+                    request_id, JSONRPC_INVALID_PARAMS, "lint needs exactly one of params.xml or params.path"
+                )
+            result: Any = serve_lint(params, jobs, slide_cache)
+        elif method == "stats":
+            result = {
+                "linter_version": linter_version(),
+                "slide_cache": {
+                    "hits": slide_cache.hits,
+                    "misses": slide_cache.misses,
+                    "entries": len(slide_cache.entries),
+                },
+            }
+        elif method == "shutdown":
+            result = None
+        else:
+            return build_rpc_error(request_id, JSONRPC_METHOD_NOT_FOUND, f"unknown method: {method}")
+    except XmlTextOverlapLintError as error:
+        return build_rpc_error(request_id, JSONRPC_LINT_ERROR, str(error))
+    except Exception as error:  # keep serving after a linter bug on one payload
+        return build_rpc_error(request_id, JSONRPC_INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+    if "id" not in request:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def serve(
+    input_stream: TextIO, output_stream: TextIO, jobs: int = 1, slide_cache: SlideLintCache | None = None
+) -> None:
+    # One JSON-RPC 2.0 request per input line, one response per output line. The SXSD
+    # attributes, iconpark index and slide cache stay loaded between requests.
+    if slide_cache is None:
+        slide_cache = SlideLintCache()
+    load_sxsd_tag_attributes()
+    load_iconpark_icon_types()
+    for line in iter(input_stream.readline, ""):
+        if not line.strip():
+            continue
+        request: Any = None
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            response = build_rpc_error(None, JSONRPC_PARSE_ERROR, f"invalid JSON: {error}")
+        else:
+            response = handle_rpc_request(request, jobs, slide_cache)
+        if response is not None:
+            output_stream.write(json.dumps(response, ensure_ascii=False) + "\n")
+            output_stream.flush()
+        if isinstance(request, dict) and request.get("method") == "shutdown" and "error" not in (response or {}):
+            return
 
 
 def run_cli(argv: list[str] | None = None) -> None:
@@ -1403,13 +2307,42 @@ def run_cli(argv: list[str] | None = None) -> None:
     if options.get("help") or options.get("--help"):
         print_usage()
         raise SystemExit(0)
-    if not options.get("input"):
+    if options.get("build-cache"):
+        print(json.dumps({"artifacts": build_reference_cache()}, ensure_ascii=False, indent=2))
+        return
+    if options.get("serve"):
+        jobs = parse_jobs(options["jobs"]) if options.get("jobs") else 1
+        slide_cache = SlideLintCache(LINT_CACHE_DIR / "slides" if options.get("incremental") else None)
+        serve(sys.stdin, sys.stdout, jobs, slide_cache)
+        return
+    inputs = options.get("input")
+    if not isinstance(inputs, list):
         print_usage()
         fail("--input is required")
-    input_path = Path(options["input"]).resolve()
-    result = lint_xml(read_file(input_path), str(input_path))
-    print(json.dumps(result, ensure_ascii=False, indent=2))
-    if result["summary"]["error_count"] > 0:
+    input_paths = resolve_input_paths(inputs)
+    # One deck lints in-process unless --jobs is given: a slide pool re-serializes and re-parses
+    # every slide, which costs more than it saves at typical deck sizes.
+    jobs = parse_jobs(options.get("jobs")) if options.get("jobs") or len(input_paths) > 1 else 1
+    if options.get("stream"):
+        if len(input_paths) != 1:
+            fail("--stream takes a single --input file")
+        try:
+            summary = lint_xml_stream(input_paths[0], sys.stdout)
+        except XmlTextOverlapLintError as error:
+            fail(f"{input_paths[0]}: {error}")
+        if summary["summary"]["error_count"] > 0:
+            raise SystemExit(1)
+        return
+    results = lint_files(input_paths, jobs, bool(options.get("incremental")))
+
+    if options.get("output-dir"):
+        output = combine_results(write_result_files(results, Path(options["output-dir"]).resolve()))
+    elif len(inputs) == 1 and Path(inputs[0]).is_file():
+        output = results[0]
+    else:
+        output = combine_results(results)
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    if output["summary"]["error_count"] > 0:
         raise SystemExit(1)
 
 
@@ -7,7 +7,10 @@ import subprocess
 import sys
 import tempfile
 import unittest
+from contextlib import redirect_stdout
+from io import StringIO
 from pathlib import Path
+from unittest import mock
 
 import xml_text_overlap_lint
 
@@ -444,6 +447,34 @@ class XmlTextOverlapLintTest(unittest.TestCase):
         self.assertEqual(result["summary"]["error_count"], 0)
         self.assertNotIn("issues", result)
 
+    def test_compiled_reference_cache_reuses_artifact_until_source_content_changes(self) -> None:
+        compiled_sources: list[bytes] = []
+
+        def compile_source(source: bytes) -> set[str]:
+            compiled_sources.append(source)
+            return set(source.decode("utf-8").split())
+
+        original_cache_dir = xml_text_overlap_lint.LINT_CACHE_DIR
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_text_overlap_lint.LINT_CACHE_DIR = Path(temp_dir) / "cache"
+            try:
+                source_path = Path(temp_dir) / "icons.txt"
+                source_path.write_text("home search", encoding="utf-8")
+                load = xml_text_overlap_lint.load_compiled_reference
+
+                self.assertEqual(load(source_path, compile_source), {"home", "search"})
+                self.assertTrue(xml_text_overlap_lint.compiled_reference_path(source_path).is_file())
+                self.assertEqual(load(source_path, compile_source), {"home", "search"})
+                source_path.write_text("home search", encoding="utf-8")
+                self.assertEqual(load(source_path, compile_source), {"home", "search"})
+                self.assertEqual(len(compiled_sources), 1)
+
+                source_path.write_text("home settings", encoding="utf-8")
+                self.assertEqual(load(source_path, compile_source), {"home", "settings"})
+                self.assertEqual(len(compiled_sources), 2)
+            finally:
+                xml_text_overlap_lint.LINT_CACHE_DIR = original_cache_dir
+
     def test_lint_xml_accepts_iconpark_icon_type_from_index(self) -> None:
         result = xml_text_overlap_lint.lint_xml(
             """
@@ -804,6 +835,126 @@ class XmlTextOverlapLintTest(unittest.TestCase):
         self.assertEqual(elements[1]["autoFit"], "normal-auto-fit")
         self.assertEqual(elements[1]["fontSize"], 28)
         self.assertEqual(elements[1]["text"], "Growth & scale\nFocused execution")
+        self.assertEqual(elements[1].text, elements[1]["text"])
+        self.assertEqual(
+            elements[0].to_dict(),
+            {
+                "id": "photo",
+                "kind": "img",
+                "type": "img",
+                "x": 10,
+                "y": 20,
+                "width": 100,
+                "height": 80,
+                "rotation": 0,
+                "alpha": 1,
+                "order": 0,
+            },
+        )
+        self.assertNotIn("text", elements[0])
+        self.assertIsNone(elements[0].get("text"))
+        with self.assertRaises(KeyError):
+            elements[0]["text"]
+
+    def test_extract_elements_reads_text_and_attributes_from_the_parsed_tree(self) -> None:
+        elements = xml_text_overlap_lint.extract_elements(
+            """
+            <slide xmlns="http://www.larkoffice.com/sml/2.0">
+              <data>
+                <shape id="empty" type="text" topLeftX="40" topLeftY="60" width="320" height="90"/>
+                <shape id="a&amp;b" type="text" topLeftX="40" topLeftY="60" width="320" height="90">
+                  <content><p><span fontSize="30">R&amp;D</span><span>&lt;beta&gt;</span></p></content>
+                </shape>
+              </data>
+            </slide>
+            """
+        )
+        self.assertEqual([element["id"] for element in elements], ["empty", "a&b"])
+        self.assertEqual(elements[0]["text"], "")
+        self.assertEqual(elements[1]["text"], "R&D <beta>")
+        self.assertEqual(elements[1]["paragraphs"][0]["fontSize"], 30)
+
+    def test_spatial_grid_pairs_cover_every_intersecting_pair(self) -> None:
+        boxes = [
+            xml_text_overlap_lint.Box(x, y, width, height)
+            for x, y, width, height in [
+                (0, 0, 100, 100),
+                (99, 99, 10, 10),
+                (63, 0, 1, 1),
+                (64, 64, 0, 0),
+                (500, 300, 200, 100),
+                (690, 390, 300, 300),
+                (10, 10, float("nan"), 5),
+                (-40, -40, 45, 45),
+            ]
+        ]
+        expected = {
+            (left, right)
+            for left in range(len(boxes))
+            for right in range(left + 1, len(boxes))
+            if xml_text_overlap_lint.intersects(boxes[left], boxes[right])
+        }
+        pairs = xml_text_overlap_lint.SpatialGrid(boxes).pairs()
+        self.assertEqual(pairs, sorted(pairs))
+        self.assertLessEqual(expected, set(pairs))
+        self.assertNotIn((0, 4), pairs)
+        self.assertIn((4, 6), pairs)
+
+    def test_numpy_geometry_backend_matches_pure_python(self) -> None:
+        if xml_text_overlap_lint.load_numpy() is None:
+            self.skipTest("numpy is not installed")
+        geometry = ["40", "-30", "900", "nan", "inf", "0", "9007199254740993", "120"]
+        elements = []
+        for index in range(48):
+            x, y = (index * 53) % 980 - 20, (index * 37) % 560 - 10
+            left = geometry[index % len(geometry)] if index % 5 == 0 else x
+            rotation = ' rotation="45"' if index % 7 == 0 else ""
+            elements.append(
+                f'<shape id="t{index}" type="text" topLeftX="{left}" topLeftY="{y}" width="140" height="60"{rotation}>'
+                f"<content><p>{'Quarterly revenue grows steadily ' * (index % 3 + 1)}</p></content></shape>"
+            )
+            if index % 4 == 0:
+                elements.append(
+                    f'<img id="i{index}" src="t" topLeftX="{x + 20}" topLeftY="{y + 10}" width="90" height="50"/>'
+                )
+        elements.append('<whiteboard id="wb" topLeftX="300" topLeftY="200" width="300" height="200"/>')
+        for index, text in enumerate(["Hiring plan", "Budget risks"]):
+            elements.append(
+                f'<shape id="o{index}" type="text" topLeftX="{700 + index * 10}" topLeftY="{450 + index * 5}" '
+                f'width="180" height="40"><content><p>{text}</p></content></shape>'
+            )
+        slide = f'<slide xmlns="http://www.larkoffice.com/sml/2.0"><data>{"".join(elements)}</data></slide>'
+
+        minimum = xml_text_overlap_lint.NUMPY_MIN_ELEMENTS
+        self.addCleanup(setattr, xml_text_overlap_lint, "NUMPY_MIN_ELEMENTS", minimum)
+        results = []
+        for backend_minimum in (0, 10**9):
+            xml_text_overlap_lint.NUMPY_MIN_ELEMENTS = backend_minimum
+            results.append(json.dumps(xml_text_overlap_lint.lint_slide(slide, 1)))
+        self.assertEqual(results[0], results[1])
+        codes = {issue["code"] for issue in json.loads(results[0])["issues"]}
+        self.assertLessEqual({"bbox_overlap", "image_covers_text", "shape_out_of_canvas"}, codes)
+
+    def test_measure_text_shares_metrics_and_matches_per_character_estimate(self) -> None:
+        text = "季度目标 Q3\n\n增长 20%，保持节奏"
+        metrics = xml_text_overlap_lint.measure_text(text, 18)
+        self.assertIs(metrics, xml_text_overlap_lint.measure_text(text, 18))
+        self.assertIsNot(metrics, xml_text_overlap_lint.measure_text(text, 18.0))
+        expected_widths = [
+            sum(xml_text_overlap_lint.estimate_character_width(character, 18) for character in line)
+            for line in text.split("\n")
+        ]
+        self.assertEqual(metrics.line_widths, expected_widths)
+        self.assertEqual(metrics.max_line_width, max(expected_widths))
+        self.assertEqual(metrics.line_count(80, None), 2 + 1 + 3)
+        self.assertEqual(metrics.line_count(80, "false"), 3)
+        self.assertEqual(xml_text_overlap_lint.measure_text("", 18).line_count(80, None), 0)
+
+        element = xml_text_overlap_lint.SlideElement({"text": "增长 20%，保持节奏", "fontSize": 18})
+        similar = xml_text_overlap_lint.SlideElement({"text": "增长 20% 保持节奏", "fontSize": 12})
+        different = xml_text_overlap_lint.SlideElement({"text": "完全不同的一句话", "fontSize": 18})
+        self.assertTrue(xml_text_overlap_lint.is_similar_text_overlay(element, similar))
+        self.assertFalse(xml_text_overlap_lint.is_similar_text_overlay(element, different))
 
     def test_lint_xml_allows_small_out_of_bounds_images(self) -> None:
         result = xml_text_overlap_lint.lint_xml(
@@ -1112,6 +1263,226 @@ class XmlTextOverlapLintTest(unittest.TestCase):
         self.assertEqual(final_sizes, [2, 1])
         self.assertEqual(sum(final_sizes), 3)
 
+    def test_cli_lints_directories_and_globs_into_combined_and_per_file_json(self) -> None:
+        slide = """
+            <slide xmlns="http://www.larkoffice.com/sml/2.0"><data>
+              <shape type="text" topLeftX="{x}" topLeftY="80" width="300" height="60">
+                <content textType="body"><p>Body text</p></content>
+              </shape>
+            </data></slide>
+        """
+        script_path = Path(xml_text_overlap_lint.__file__).resolve()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_dir = Path(temp_dir) / "decks"
+            deck_dir.mkdir()
+            (deck_dir / "clean.xml").write_text(slide.format(x=80), encoding="utf-8")
+            (deck_dir / "outside.xml").write_text(slide.format(x=900), encoding="utf-8")
+
+            completed = subprocess.run(
+                [sys.executable, str(script_path), "--input", str(deck_dir), "--jobs", "2"],
+                capture_output=True,
+                check=False,
+                text=True,
+            )
+            result = json.loads(completed.stdout)
+            self.assertEqual(completed.returncode, 1, completed.stderr)
+            self.assertEqual(result["summary"]["file_count"], 2)
+            self.assertEqual(result["summary"]["error_count"], 1)
+            self.assertEqual(
+                [Path(file_result["file"]).name for file_result in result["files"]], ["clean.xml", "outside.xml"]
+            )
+
+            output_dir = Path(temp_dir) / "lint"
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    str(script_path),
+                    "--input",
+                    str(deck_dir / "c*.xml"),
+                    "--input",
+                    str(deck_dir / "clean.xml"),
+                    "--output-dir",
+                    str(output_dir),
+                ],
+                capture_output=True,
+                check=False,
+                text=True,
+            )
+            result = json.loads(completed.stdout)
+            self.assertEqual(completed.returncode, 0, completed.stderr)
+            self.assertEqual(result["summary"]["file_count"], 1)
+            per_file = json.loads((output_dir / "clean.lint.json").read_text(encoding="utf-8"))
+            self.assertEqual(per_file["summary"], result["files"][0]["summary"])
+
+    def test_cli_serve_answers_json_rpc_lint_requests_until_shutdown(self) -> None:
+        xml = """
+            <slide xmlns="http://www.larkoffice.com/sml/2.0"><data>
+              <shape type="text" topLeftX="900" topLeftY="80" width="300" height="60">
+                <content textType="body"><p>Body text</p></content>
+              </shape>
+            </data></slide>
+        """
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "lint", "params": {"xml": xml, "file": "deck.xml"}},
+            {"jsonrpc": "2.0", "id": 2, "method": "lint", "params": {"xml": xml}},
+            {"jsonrpc": "2.0", "method": "lint", "params": {"xml": xml}},
+            {"jsonrpc": "2.0", "id": 3, "method": "lint", "params": {}},
+            {"jsonrpc": "2.0", "id": 4, "method": "lint", "params": {"xml": "<slide>"}},
+            {"jsonrpc": "2.0", "id": 5, "method": "format"},
+            {"jsonrpc": "2.0", "id": 6, "method": "stats"},
+            {"jsonrpc": "2.0", "id": 7, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 8, "method": "stats"},
+        ]
+        lines = [json.dumps(request) for request in requests]
+        lines.insert(7, "not json")
+        script_path = Path(xml_text_overlap_lint.__file__).resolve()
+        completed = subprocess.run(
+            [sys.executable, str(script_path), "--serve"],
+            input="\n".join(lines) + "\n",
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        responses = [json.loads(line) for line in completed.stdout.splitlines()]
+        self.assertEqual([response["id"] for response in responses], [1, 2, 3, 4, 5, 6, None, 7])
+        self.assertEqual(responses[0]["result"], xml_text_overlap_lint.lint_xml(xml, "deck.xml"))
+        self.assertEqual(responses[0]["result"]["summary"]["error_count"], 1)
+        self.assertIsNone(responses[1]["result"]["file"])
+        self.assertEqual(responses[2]["error"]["code"], xml_text_overlap_lint.JSONRPC_INVALID_PARAMS)
+        self.assertEqual(responses[3]["result"]["issues"][0]["code"], "xml_not_well_formed")
+        self.assertEqual(responses[4]["error"]["code"], xml_text_overlap_lint.JSONRPC_METHOD_NOT_FOUND)
+        self.assertEqual(responses[5]["result"]["slide_cache"], {"hits": 2, "misses": 1, "entries": 1})
+        self.assertEqual(responses[6]["error"]["code"], xml_text_overlap_lint.JSONRPC_PARSE_ERROR)
+        self.assertIsNone(responses[7]["result"])
+
+    def test_cli_stream_emits_ndjson_matching_lint_xml(self) -> None:
+        slides = "".join(
+            f"""
+            <slide><data>
+              <shape id="a{index}" type="text" topLeftX="40" topLeftY="80" width="240" height="60">
+                <content textType="body"><p>First text {index}</p></content>
+              </shape>
+              <shape id="b{index}" type="text" topLeftX="60" topLeftY="90" width="240" height="60">
+                <content textType="body"><p>Other words</p></content>
+              </shape>
+              <icon iconType="not-an-icon" topLeftX="700" topLeftY="80" width="40" height="40"/>
+            </data></slide>
+            """
+            for index in range(3)
+        )
+        xml = (
+            f'<presentation xmlns="http://www.larkoffice.com/sml/2.0" width="1280" height="720" foo="1">'
+            f"{slides}</presentation>"
+        )
+        script_path = Path(xml_text_overlap_lint.__file__).resolve()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = Path(temp_dir) / "deck.xml"
+            deck_path.write_text(xml, encoding="utf-8")
+            expected = xml_text_overlap_lint.lint_xml(xml, str(deck_path.resolve()))
+            completed = subprocess.run(
+                [sys.executable, str(script_path), "--input", str(deck_path), "--stream"],
+                capture_output=True,
+                check=False,
+                text=True,
+            )
+            broken_path = Path(temp_dir) / "broken.xml"
+            broken_path.write_text(xml.replace("</presentation>", "\n<slide a=1></presentation>"), encoding="utf-8")
+            broken = subprocess.run(
+                [sys.executable, str(script_path), "--input", str(broken_path), "--stream"],
+                capture_output=True,
+                check=False,
+                text=True,
+            )
+
+        self.assertEqual(completed.returncode, 1, completed.stderr)
+        records = [json.loads(line) for line in completed.stdout.splitlines()]
+        self.assertEqual([record.pop("type") for record in records], ["slide", "slide", "slide", "summary"])
+        summary = records.pop()
+        self.assertEqual(records, expected["slides"])
+        self.assertEqual(summary, {key: value for key, value in expected.items() if key != "slides"})
+        self.assertEqual(summary["slide_size"], {"width": 1280, "height": 720})
+
+        self.assertEqual(broken.returncode, 1, broken.stderr)
+        error = json.loads(broken.stdout.splitlines()[-1])["issues"][-1]
+        self.assertEqual(error["code"], "xml_not_well_formed")
+        self.assertEqual(error["line"], xml.count("\n") + 2)
+        self.assertEqual(error["context"], "<slide a=1></presentation>")
+
+    def test_cli_single_input_lints_slides_in_process_by_default(self) -> None:
+        slides = "".join(
+            f"""
+            <slide><data>
+              <shape type="text" topLeftX="40" topLeftY="80" width="240" height="60">
+                <content textType="body"><p>Slide {index}</p></content>
+              </shape>
+            </data></slide>
+            """
+            for index in range(xml_text_overlap_lint.PARALLEL_SLIDE_MIN_COUNT)
+        )
+        xml = f'<presentation xmlns="http://www.larkoffice.com/sml/2.0">{slides}</presentation>'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = Path(temp_dir) / "deck.xml"
+            deck_path.write_text(xml, encoding="utf-8")
+            output = StringIO()
+            pool = mock.patch("concurrent.futures.ProcessPoolExecutor", side_effect=AssertionError("pool started"))
+            with mock.patch("os.cpu_count", return_value=8), pool, redirect_stdout(output):
+                xml_text_overlap_lint.run_cli(["--input", str(deck_path)])
+
+        summary = json.loads(output.getvalue())["summary"]
+        self.assertEqual(summary["slide_count"], xml_text_overlap_lint.PARALLEL_SLIDE_MIN_COUNT)
+
+    def test_lint_xml_parallel_slides_match_sequential_results(self) -> None:
+        slides = "".join(
+            f"""
+            <slide xmlns="http://www.larkoffice.com/sml/2.0"><data>
+              <shape id="a{index}" type="text" topLeftX="{40 + index * 10}" topLeftY="80" width="240" height="60">
+                <content textType="body"><p>First &amp; text {index}</p></content>
+              </shape>
+              <shape id="b{index}" type="text" topLeftX="60" topLeftY="90" width="240" height="60">
+                <content textType="body"><p>Other words</p></content>
+              </shape>
+            </data></slide>
+            """
+            for index in range(xml_text_overlap_lint.PARALLEL_SLIDE_MIN_COUNT)
+        )
+        xml = f'<presentation xmlns="http://www.larkoffice.com/sml/2.0" width="960" height="540">{slides}</presentation>'
+        self.assertEqual(xml_text_overlap_lint.lint_xml(xml, jobs=2), xml_text_overlap_lint.lint_xml(xml))
+
+    def test_lint_xml_incremental_cache_relints_only_changed_slides(self) -> None:
+        def deck(second_x: int, icon_type: str) -> str:
+            slides = [
+                f"""
+                <slide xmlns="http://www.larkoffice.com/sml/2.0"><data>
+                  <shape id="a{index}" type="text" topLeftX="{x}" topLeftY="80" width="240" height="60">
+                    <content textType="body"><p>Body text {index}</p></content>
+                  </shape>
+                  <shape id="b{index}" type="text" topLeftX="60" topLeftY="90" width="240" height="60">
+                    <content textType="body"><p>Other words</p></content>
+                  </shape>
+                </data></slide>
+                """
+                for index, x in enumerate([40, second_x, 700])
+            ]
+            slides[2] = slides[2].replace(
+                "</data>",
+                f'<icon iconType="{icon_type}" topLeftX="800" topLeftY="400" width="48" height="48">'
+                '<fill><fillColor color="rgba(37, 99, 235, 1)"/></fill></icon></data>',
+            )
+            return f'<presentation xmlns="http://www.larkoffice.com/sml/2.0" width="960" height="540">{"".join(slides)}</presentation>'
+
+        slide_cache = xml_text_overlap_lint.SlideLintCache()
+        first = xml_text_overlap_lint.lint_xml(deck(40, "iconpark/Base/setting.svg"), slide_cache=slide_cache)
+        self.assertEqual((slide_cache.hits, slide_cache.misses), (0, 3))
+
+        edited_xml = deck(700, "iconpark/Base/settng.svg")
+        edited = xml_text_overlap_lint.lint_xml(edited_xml, slide_cache=slide_cache)
+        self.assertEqual((slide_cache.hits, slide_cache.misses), (1, 5))
+        self.assertEqual(edited, xml_text_overlap_lint.lint_xml(edited_xml))
+        self.assertEqual(edited["slides"][0], first["slides"][0])
+        self.assertEqual(edited["issues"][0]["code"], "iconpark_unsupported_icon_type")
+        self.assertNotIn("issues", first)
+
     def test_cli_reports_table_layout_size_info_for_weighted_min_layout_cases(self) -> None:
         cases = {
             "target-exact": (
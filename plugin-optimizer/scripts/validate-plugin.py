@@ -25,19 +25,42 @@ Usage:
     python3 validate-plugin.py <plugin-path> --check=manifest,frontmatter
     python3 validate-plugin.py <plugin-path> --json             # JSON output
     python3 validate-plugin.py <plugin-path> -v                 # Verbose output
+    python3 validate-plugin.py --marketplace [<repo-root>]      # Every plugin in marketplace.json
+    python3 validate-plugin.py --marketplace --jobs=4 --json    # Bounded process pool, JSON output
+    python3 validate-plugin.py <plugin-path> --no-cache         # Bypass the on-disk result cache
+    python3 validate-plugin.py <plugin-path> --changed-since=HEAD  # Re-check only changed files
+    python3 validate-plugin.py <plugin-path> --startup-profile  # Import/init timings on stderr
+    python3 validate-plugin.py <plugin-path> --watch            # Re-validate on save, NDJSON diffs
 
 Exit codes:
     0 - Passed (no MUST violations, ready for Phase 2)
     1 - Failed (MUST violations detected, Phase 2 blocked)
     2 - Critical (token budget exceeded, MUST refactor)
+    In --marketplace mode the exit code is the worst code across all plugins.
 """
 
+from __future__ import annotations
+
+import time
+
+# Taken before the remaining imports so --startup-profile covers them.
+_MODULE_START = time.perf_counter()
+
 import argparse
+import collections
+import functools
+import hashlib
+import heapq
+import importlib.util
+import itertools
 import json
+import os
 import re
+import sqlite3
 import sys
+from fnmatch import fnmatchcase
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 # Token budget thresholds (based on official Claude Code Skill authoring best practices)
 # Level 1: Metadata - Always loaded (~100 tokens for name + description)
@@ -50,6 +73,7 @@ SKILL_LINE_WARNING = 600
 SKILL_LINE_CRITICAL = 800
 SKILL_BODY_WARNING = 4500  # Warning when approaching 5k limit
 SKILL_BODY_MAX = 5000      # Under 5k tokens hard limit (SKILL.md body)
+SCRIPT_SUFFIXES = {".py", ".sh", ".js", ".ts"}  # scripts/ files counted as Level 3 resources
 
 # 官方规范推荐详细文档移入 references/；README.md/CHANGELOG.md 这类纯辅助文件
 # 不应出现在 skill 文件夹内（SKILL.md 才是 skill 的入口）
@@ -80,17 +104,36 @@ FORBIDDEN_AGENT_FIELDS = {"hooks", "mcpServers", "permissionMode"}
 USER_CONFIG_TYPES = {"string", "number", "boolean", "directory", "file"}
 MONITOR_WHEN_PREFIXES = ("always", "on-skill-invoke:")
 
-# Try tiktoken for accurate counting
-try:
-    import tiktoken
-    ENCODER = tiktoken.get_encoding("cl100k_base")
-    def count_tokens(text: str) -> int:
-        return len(ENCODER.encode(text))
-    TOKEN_METHOD = "tiktoken"
-except ImportError:
-    def count_tokens(text: str) -> int:
-        return len(text) // 4
-    TOKEN_METHOD = "approximation"
+# Result cache: per-file findings keyed by content hash. The validator version is
+# the hash of this script, so any rule change invalidates every cached entry.
+VALIDATOR_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# tiktoken gives accurate counts. It is imported and cl100k_base is built on
+# first use only: that dominates startup, and most runs (structure/manifest
+# checks, warm token caches) never encode anything.
+TOKEN_METHOD = "tiktoken" if importlib.util.find_spec("tiktoken") else "approximation"
+_ENCODER = None
+
+# Phase -> seconds, printed by --startup-profile.
+STARTUP_TIMINGS: dict[str, float] = {}
+
+
+def get_encoder():
+    """The cl100k_base encoder, loaded on first call; None when counting by approximation."""
+    global _ENCODER, TOKEN_METHOD
+    if _ENCODER is None and TOKEN_METHOD == "tiktoken":
+        started = time.perf_counter()
+        try:
+            import tiktoken
+            _ENCODER = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            TOKEN_METHOD = "approximation"
+        STARTUP_TIMINGS["encoder"] = time.perf_counter() - started
+    return _ENCODER
+
+# Threads tiktoken may use for one encode_ordinary_batch call.
+TOKEN_THREADS = min(8, os.cpu_count() or 1)
 
 
 @dataclass
@@ -104,13 +147,75 @@ class Issue:
     source: str = ""        # Original source text that caused issue
     suggestion: str = ""    # How to fix
     details: dict = field(default_factory=dict)  # Additional structured data
+    stale: bool = False     # Replayed from a previous run (--changed-since, file untouched)
+
+
+@dataclass
+class CheckMetrics:
+    """Cost of one check run: time, I/O, result cache and tokenizer use."""
+    elapsed: float = 0.0
+    files: int = 0                  # Files read from disk (first reader pays)
+    bytes: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    tokenizer_seconds: float = 0.0
+    unit_seconds: dict = field(default_factory=dict)  # File / skill dir -> seconds
+    events: list = field(default_factory=list)        # Chrome trace events (--trace)
+
+    def span(self, name: str, category: str, started: float, **args) -> float:
+        """Record a complete trace event that began at perf_counter() `started`; return its duration."""
+        duration = time.perf_counter() - started
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": round(started * 1e6, 1), "dur": round(duration * 1e6, 1),
+            "pid": os.getpid(), "tid": 1, "args": args,
+        })
+        return duration
+
+    @classmethod
+    def total(cls, metrics: list[CheckMetrics]) -> CheckMetrics:
+        """Sum several checks' metrics (per-unit times add up across checks)."""
+        combined = cls()
+        for m in metrics:
+            combined.elapsed += m.elapsed
+            combined.files += m.files
+            combined.bytes += m.bytes
+            combined.cache_hits += m.cache_hits
+            combined.cache_misses += m.cache_misses
+            combined.tokenizer_seconds += m.tokenizer_seconds
+            for unit, seconds in m.unit_seconds.items():
+                combined.unit_seconds[unit] = combined.unit_seconds.get(unit, 0.0) + seconds
+        return combined
+
+    def to_json(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "elapsed_ms": round(self.elapsed * 1000, 2),
+            "files_read": self.files,
+            "bytes_read": self.bytes,
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": round(self.cache_hits / lookups, 3) if lookups else None,
+            },
+            "tokenizer_ms": round(self.tokenizer_seconds * 1000, 2),
+            "units_ms": {unit: round(seconds * 1000, 2) for unit, seconds in self.unit_seconds.items()},
+        }
+
+
+# Metrics of the check currently running in this process (set by run_all_checks).
+_METRICS: CheckMetrics | None = None
 
 
 class ValidationResult:
-    def __init__(self, check_name: str):
+    def __init__(self, check_name: str, sink=None):
+        """`sink` (--ndjson) receives each non-ok issue instead of `issues`."""
         self.check = check_name
         self.issues: list[Issue] = []
+        self.counts = {"must": 0, "should": 0, "may": 0, "ok": 0}
         self.passed = True
+        self.metrics: CheckMetrics | None = None
+        self.sink = sink
 
     def add(self, severity: str, message: str, file: str = "", line: int = 0,
             source: str = "", suggestion: str = "", **details):
@@ -125,9 +230,20 @@ class ValidationResult:
             suggestion=suggestion,
             details=details
         )
-        self.issues.append(issue)
-        if severity == "must":
+        self.add_issue(issue)
+
+    def add_issue(self, issue: Issue):
+        """Record an already-built issue (e.g. replayed from the result cache).
+
+        A streaming result hands non-ok issues to its sink and keeps only counts.
+        """
+        self.counts[issue.severity] = self.counts.get(issue.severity, 0) + 1
+        if issue.severity == "must":
             self.passed = False
+        if self.sink is None:
+            self.issues.append(issue)
+        elif issue.severity != "ok":
+            self.sink(issue)
 
     def must(self, message: str, **kwargs):
         self.add("must", message, **kwargs)
@@ -142,25 +258,577 @@ class ValidationResult:
         self.add("ok", message, **kwargs)
 
 
+# =============================================================================
+# Result Cache
+# =============================================================================
+
+class ResultCache:
+    """Size-bounded LRU store of check results in a local sqlite database.
+
+    Values are JSON. Keys come from `make_key`, which folds in the validator
+    version and token counting method, so a cached entry is only reused when
+    the inputs hash identically under the same rules. Access times and new
+    entries are buffered and written on `flush()`; eviction drops the least
+    recently used entries once the store grows past `max_bytes`.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._pending: dict[str, str] = {}
+        self._touched: set[str] = set()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is None:
+            started = time.perf_counter()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, atime REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime)")
+                conn.commit()
+            except (OSError, sqlite3.Error):
+                # An unusable cache must never fail validation; run uncached.
+                self.max_bytes = 0
+                return None
+            self._conn = conn
+            STARTUP_TIMINGS["cache"] = time.perf_counter() - started
+        return self._conn
+
+    @staticmethod
+    def make_key(check: str, *parts: str) -> str:
+        material = "\0".join((VALIDATOR_VERSION, TOKEN_METHOD, check, *parts))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        value = self._lookup(key)
+        if _METRICS is not None:
+            if value is None:
+                _METRICS.cache_misses += 1
+            else:
+                _METRICS.cache_hits += 1
+        return value
+
+    def peek(self, key: str):
+        """Like get(), but not counted in the running check's cache metrics."""
+        return self._lookup(key)
+
+    def _lookup(self, key: str):
+        if key in self._pending:
+            return json.loads(self._pending[key])
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self._touched.add(key)
+        return json.loads(row[0])
+
+    def put(self, key: str, value) -> None:
+        self._pending[key] = json.dumps(value, default=str)
+
+    def flush(self) -> None:
+        conn = self._connect()
+        if conn is None or not (self._pending or self._touched):
+            self._pending.clear()
+            self._touched.clear()
+            return
+        now = time.time()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, value, size, atime) VALUES (?, ?, ?, ?)",
+                    [(k, v, len(v), now) for k, v in self._pending.items()],
+                )
+                conn.executemany(
+                    "UPDATE entries SET atime = ? WHERE key = ?",
+                    [(now, k) for k in self._touched - self._pending.keys()],
+                )
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a cache sitting at the limit does not evict on every run.
+        excess = total - int(self.max_bytes * 0.9)
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY atime"):
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+
+_CACHE: ResultCache | None = None
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "plugin-optimizer"
+
+
+def configure_cache(cache_dir: Path | None) -> None:
+    """Enable the result cache under `cache_dir`, or disable it with None.
+
+    Also the process-pool initializer, so every worker opens its own connection.
+    """
+    global _CACHE
+    _CACHE = ResultCache(cache_dir / "validate-plugin.sqlite3") if cache_dir else None
+
+
+def flush_cache() -> None:
+    if _CACHE is not None:
+        _CACHE.flush()
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _add_cached_file_issues(result: ValidationResult, key_parts: tuple[str, ...], content: str,
+                            compute) -> None:
+    """Run `compute(sub_result)` for one file, or replay its cached issues.
+
+    `key_parts` must capture everything besides the content that the issues
+    depend on (relative path, component type, verbosity).
+    """
+    if _CACHE is None:
+        compute(result)
+        return
+
+    key = ResultCache.make_key(result.check, *key_parts, content_digest(content.encode("utf-8")))
+    cached = _CACHE.get(key)
+    if cached is not None:
+        for data in cached:
+            result.add_issue(Issue(**data))
+        return
+
+    sub_result = ValidationResult(result.check)
+    compute(sub_result)
+    _CACHE.put(key, [asdict(issue) for issue in sub_result.issues])
+    for issue in sub_result.issues:
+        result.add_issue(issue)
+
+
+def _add_unit_issues(result: ValidationResult, index: "PluginIndex", unit: str, affected: bool,
+                     compute, verbose: bool = False) -> None:
+    """Run `compute(sub_result)` for one unit (file, skill or whole plugin) and record its findings.
+
+    The findings of every computed unit are kept per (plugin, check, unit), in
+    `index.findings` when the index has one and in the result cache otherwise.
+    When a --changed-since run finds the unit untouched, those findings are
+    replayed marked stale instead of re-reading its files; units with no
+    recorded findings are computed as usual.
+    """
+    if _METRICS is not None:
+        started = time.perf_counter()
+        _compute_unit_issues(result, index, unit, affected, compute, verbose)
+        _METRICS.unit_seconds[unit] = _METRICS.span(unit, result.check, started)
+    else:
+        _compute_unit_issues(result, index, unit, affected, compute, verbose)
+
+
+def _compute_unit_issues(result: ValidationResult, index: "PluginIndex", unit: str, affected: bool,
+                         compute, verbose: bool) -> None:
+    store = index.findings if index.findings is not None else _CACHE
+    if store is None:
+        compute(result)
+        return
+
+    key = ResultCache.make_key("findings", str(index.plugin_dir), result.check, unit, str(verbose))
+    if index.changed is not None and not affected:
+        recorded = store.get(key)
+        if recorded is not None:
+            for data in recorded:
+                result.add_issue(Issue(**{**data, "stale": True}))
+            return
+
+    sub_result = ValidationResult(result.check)
+    compute(sub_result)
+    if store is _CACHE:
+        _CACHE.put(key, [asdict(issue) for issue in sub_result.issues])
+    else:
+        store[key] = [asdict(issue) for issue in sub_result.issues]
+    for issue in sub_result.issues:
+        result.add_issue(issue)
+
+
+# =============================================================================
+# Token Counting
+# =============================================================================
+
+class TokenCounter:
+    """Token counts keyed by content hash.
+
+    Identical texts (symlinked references, files duplicated across mirrored
+    plugins) are encoded once per process. Misses are encoded together with
+    tiktoken's encode_ordinary_batch, which spreads BPE work over threads, and
+    tiktoken counts are persisted in the result cache so later runs skip
+    tokenization for unchanged text.
+    """
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: list[str]) -> list[int]:
+        """Token count for each of `texts`, in order."""
+        digests = [content_digest(text.encode("utf-8")) for text in texts]
+        persist = _CACHE is not None and TOKEN_METHOD == "tiktoken"
+
+        missing: dict[str, str] = {}
+        for digest, text in zip(digests, texts):
+            if digest in self._counts or digest in missing:
+                continue
+            stored = _CACHE.get(self._key(digest)) if persist else None
+            if stored is not None:
+                self._counts[digest] = stored
+            else:
+                missing[digest] = text
+
+        if missing:
+            for digest, count in zip(missing, self._encode(list(missing.values()))):
+                self._counts[digest] = count
+                if persist:
+                    _CACHE.put(self._key(digest), count)
+
+        return [self._counts[digest] for digest in digests]
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        # Counts depend only on the text and the encoding, not on validator rules.
+        return f"token-count:{TOKEN_METHOD}:{digest}"
+
+    @staticmethod
+    def _encode(texts: list[str]) -> list[int]:
+        if _METRICS is None:
+            return TokenCounter._encode_texts(texts)
+        started = time.perf_counter()
+        counts = TokenCounter._encode_texts(texts)
+        _METRICS.tokenizer_seconds += _METRICS.span("encode", "tokenizer", started, texts=len(texts))
+        return counts
+
+    @staticmethod
+    def _encode_texts(texts: list[str]) -> list[int]:
+        encoder = get_encoder()
+        if encoder is None:
+            return [len(text) // 4 for text in texts]
+        if len(texts) == 1:
+            return [len(encoder.encode_ordinary(texts[0]))]
+        return [len(tokens) for tokens in encoder.encode_ordinary_batch(texts, num_threads=TOKEN_THREADS)]
+
+
+TOKEN_COUNTER = TokenCounter()
+
+
+def count_tokens(text: str) -> int:
+    return TOKEN_COUNTER.count(text)
+
+
+# =============================================================================
+# Plugin Index
+# =============================================================================
+
+class PluginIndex:
+    """Shared view of one plugin tree for every check in a run.
+
+    Each directory is listed at most once (lazily, via os.scandir) and file
+    contents, line splits and parsed frontmatter are memoized, so checks that
+    look at the same SKILL.md do not re-read, re-decode or re-parse it.
+    Component and skill discovery are computed once and shared as well.
+    """
+
+    def __init__(self, plugin_dir: Path, changed: set[Path] | None = None, findings: dict | None = None):
+        self.plugin_dir = plugin_dir
+        # Plugin-relative paths changed since --changed-since <rev>; None = validate everything.
+        self.changed: set[str] | None = None
+        if changed is not None:
+            self.changed = {rel for rel in (self._relative(p) for p in changed) if rel is not None}
+        # Per-unit findings kept in memory across runs (--watch); None = record them in the result cache.
+        self.findings = findings
+        self._listings: dict[Path, dict[str, tuple[bool, bool, bool]]] = {}
+        self._texts: dict[Path, str] = {}
+        self._lines: dict[Path, list[str]] = {}
+        self._frontmatter: dict[Path, tuple[dict, str, int]] = {}
+        self._components: dict[str, list[Path]] | None = None
+        self._skill_dirs: list[Path] | None = None
+        self._plugin_mirror: bool | None = None
+
+    # -- filesystem -----------------------------------------------------------
+
+    def _listing(self, directory: Path) -> dict[str, tuple[bool, bool, bool]]:
+        """name -> (is_dir, is_file, is_symlink) in scandir order; empty if not a directory."""
+        listing = self._listings.get(directory)
+        if listing is None:
+            listing = {}
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            listing[entry.name] = (entry.is_dir(), entry.is_file(), entry.is_symlink())
+                        except OSError:
+                            listing[entry.name] = (False, False, False)
+            except OSError:
+                pass
+            self._listings[directory] = listing
+        return listing
+
+    def _entry(self, path: Path) -> tuple[bool, bool, bool] | None:
+        return self._listing(path.parent).get(path.name)
+
+    def exists(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and (entry[0] or entry[1])
+
+    def is_dir(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry[0]
+
+    def is_file(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry[1]
+
+    def is_symlink(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry[2]
+
+    def iterdir(self, directory: Path) -> list[Path]:
+        return [directory / name for name in self._listing(directory)]
+
+    def glob(self, directory: Path, pattern: str) -> list[Path]:
+        """`directory.glob(pattern)` for a single path component."""
+        return [directory / name for name in self._listing(directory) if fnmatchcase(name, pattern)]
+
+    def rglob(self, directory: Path, pattern: str) -> list[Path]:
+        """`directory.glob("**/" + pattern)`: pre-order, symlinked directories are not descended."""
+        matches = []
+
+        def visit(current: Path) -> None:
+            listing = self._listing(current)
+            matches.extend(current / name for name in listing if fnmatchcase(name, pattern))
+            for name, (is_dir, _, is_symlink) in listing.items():
+                if is_dir and not is_symlink:
+                    visit(current / name)
+
+        visit(directory)
+        return matches
+
+    def walk_files(self, directory: Path) -> list[tuple[Path, str, bool]]:
+        """Every file below `directory` as (path, relative path, is_symlink), in `rglob` order.
+
+        One pass over the memoized listings with string relative paths, for
+        callers that would otherwise rglob the same tree several times.
+        """
+        files = []
+
+        def visit(current: Path, prefix: str) -> None:
+            subdirs = []
+            for name, (is_dir, is_file, is_symlink) in self._listing(current).items():
+                if is_file:
+                    files.append((current / name, prefix + name, is_symlink))
+                elif is_dir and not is_symlink:
+                    subdirs.append(name)
+            for name in subdirs:
+                visit(current / name, prefix + name + "/")
+
+        visit(directory, directory.name + "/")
+        return files
+
+    def refresh(self, changed: set[Path]) -> None:
+        """Forget everything derived from `changed` and scope the next run to it."""
+        for path in changed:
+            self._texts.pop(path, None)
+            self._lines.pop(path, None)
+            self._frontmatter.pop(path, None)
+            self._listings.pop(path.parent, None)
+            for directory in [d for d in self._listings if d == path or path in d.parents]:
+                del self._listings[directory]
+        self._components = None
+        self._skill_dirs = None
+        self._plugin_mirror = None
+        self.changed = {rel for rel in (self._relative(p) for p in changed) if rel is not None}
+
+    def _relative(self, path: Path) -> str | None:
+        try:
+            return path.relative_to(self.plugin_dir).as_posix()
+        except ValueError:
+            return None
+
+    def touched(self, *rel_paths: str) -> bool:
+        """True if any of `rel_paths` (files or directories) changed, or no change set is active."""
+        if self.changed is None:
+            return True
+        for rel in rel_paths:
+            prefix = rel.rstrip("/") + "/"
+            if any(path == rel or path.startswith(prefix) for path in self.changed):
+                return True
+        return False
+
+    # -- file contents --------------------------------------------------------
+
+    def read_text(self, path: Path) -> str:
+        text = self._texts.get(path)
+        if text is None:
+            text = self._texts[path] = path.read_text()
+            if _METRICS is not None:
+                _METRICS.files += 1
+                _METRICS.bytes += len(text.encode("utf-8"))
+        return text
+
+    def lines(self, path: Path) -> list[str]:
+        lines = self._lines.get(path)
+        if lines is None:
+            lines = self._lines[path] = self.read_text(path).split("\n")
+        return lines
+
+    def frontmatter(self, path: Path) -> tuple[dict, str, int]:
+        parsed = self._frontmatter.get(path)
+        if parsed is None:
+            parsed = self._frontmatter[path] = parse_frontmatter(self.read_text(path))
+        return parsed
+
+    # -- discovery ------------------------------------------------------------
+
+    @property
+    def components(self) -> dict[str, list[Path]]:
+        if self._components is None:
+            self._components = _discover_components(self)
+        return self._components
+
+    @property
+    def skill_dirs(self) -> list[Path]:
+        """Directories holding a SKILL.md, including bucket-nested ones (token budget scope)."""
+        if self._skill_dirs is None:
+            skills = []
+            skills_dir = self.plugin_dir / "skills"
+            for skill_dir in self.iterdir(skills_dir):
+                if not self.is_dir(skill_dir):
+                    continue
+                if self.exists(skill_dir / "SKILL.md"):
+                    skills.append(skill_dir)
+                else:
+                    # Bucket layout: descend so nested skills get token-budget checks.
+                    for nested in self.iterdir(skill_dir):
+                        if self.is_dir(nested) and self.exists(nested / "SKILL.md"):
+                            skills.append(nested)
+            self._skill_dirs = skills
+        return self._skill_dirs
+
+    @property
+    def plugin_mirror(self) -> bool:
+        if self._plugin_mirror is None:
+            self._plugin_mirror = _is_plugin_level_mirror(self.plugin_dir, self)
+        return self._plugin_mirror
+
+
+# Frontmatter keys the checks read as plain text; structured YAML values
+# (flow/block lists) are rendered back to one line for them.
+FRONTMATTER_TEXT_FIELDS = ("name", "description", "model", "color", "isolation",
+                           "allowed-tools", "user-invocable")
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader():
+    """PyYAML's C base loader when available (imported on first use), else None.
+
+    The base loader resolves no implicit types: every scalar stays a string
+    (`true`, `1.10`, `2026-01-01`), which is what the checks compare against.
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+
+
+def _frontmatter_text(value) -> str:
+    if isinstance(value, list):
+        return "[" + ", ".join(_frontmatter_text(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k}: {_frontmatter_text(v)}" for k, v in value.items()) + "}"
+    return str(value)
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_frontmatter(content: str) -> tuple[dict, str, int]:
     """Extract YAML frontmatter, body, and frontmatter end line from markdown.
 
+    The block runs from a leading `---` line to the next line that is exactly
+    `---`, so `---` inside a value does not end it. It is parsed as YAML
+    (nested mappings such as `metadata.version` included); without PyYAML,
+    or when the block is not a valid YAML mapping, the line-based legacy
+    parser is used. Results are memoized per content, so the same file seen
+    by several checks or mirrored across plugins is parsed once; callers must
+    not mutate the returned dict.
+
     Returns:
         (frontmatter_dict, body_text, frontmatter_end_line)
     """
     if not content.startswith("---"):
         return {}, content, 0
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    # Line-based fence scan: find the closing `---` without splitting on
+    # every occurrence of the marker.
+    first_nl = content.find("\n")
+    if first_nl < 0 or content[:first_nl].rstrip() != "---":
         return {}, content, 0
+    pos = first_nl + 1
+    fm_end_line = 1
+    while True:
+        fm_end_line += 1
+        nl = content.find("\n", pos)
+        line = content[pos:] if nl < 0 else content[pos:nl]
+        if line.rstrip() == "---":
+            break
+        if nl < 0:
+            return {}, content, 0
+        pos = nl + 1
 
-    fm_text = parts[1].strip()
-    body = parts[2].strip()
+    fm_text = content[first_nl + 1:pos]
+    body = content[pos + len(line):].strip()
 
-    # Calculate line number where frontmatter ends
-    fm_end_line = content.count("\n", 0, content.find("---", 3) + 3) + 1
+    frontmatter = None
+    loader = _yaml_loader()
+    if loader is not None:
+        import yaml
+        try:
+            data = yaml.load(fm_text, Loader=loader)
+        except yaml.YAMLError:
+            data = None
+        if isinstance(data, dict):
+            frontmatter = {}
+            for key, value in data.items():
+                # Empty values count as absent, as in the legacy parser.
+                if value in ("", None, [], {}):
+                    continue
+                if key in FRONTMATTER_TEXT_FIELDS and not isinstance(value, str):
+                    value = _frontmatter_text(value)
+                frontmatter[str(key)] = value
+    if frontmatter is None:
+        frontmatter = _parse_frontmatter_lines(fm_text.strip())
+
+    return frontmatter, body, fm_end_line
 
+
+def _parse_frontmatter_lines(fm_text: str) -> dict:
+    """Legacy `key: value` line parser, used when YAML is unavailable or invalid."""
     frontmatter = {}
     current_key = None
     multiline_value = []
@@ -186,69 +854,69 @@ def parse_frontmatter(content: str) -> tuple[dict, str, int]:
     if current_key and multiline_value:
         frontmatter[current_key] = " ".join(multiline_value)
 
-    return frontmatter, body, fm_end_line
+    return frontmatter
 
 
-def find_components(plugin_dir: Path) -> dict[str, list[Path]]:
+def find_components(plugin_dir: Path, index: PluginIndex | None = None) -> dict[str, list[Path]]:
     """Find all component files in a plugin directory."""
+    return (index or PluginIndex(plugin_dir)).components
+
+
+def _discover_components(index: PluginIndex) -> dict[str, list[Path]]:
+    plugin_dir = index.plugin_dir
     components = {
         "commands": [], "agents": [], "skills": [],
         "monitors": [], "themes": [], "output_styles": [],
     }
 
     cmd_dir = plugin_dir / "commands"
-    if cmd_dir.exists():
-        for f in cmd_dir.iterdir():
-            if f.is_file() and f.suffix == ".md" and f.name != "README.md":
-                components["commands"].append(f)
+    for f in index.iterdir(cmd_dir):
+        if index.is_file(f) and f.suffix == ".md" and f.name != "README.md":
+            components["commands"].append(f)
 
     agent_dir = plugin_dir / "agents"
-    if agent_dir.exists():
-        for f in agent_dir.iterdir():
-            if f.is_file() and f.suffix == ".md" and f.name != "README.md":
-                components["agents"].append(f)
+    for f in index.iterdir(agent_dir):
+        if index.is_file(f) and f.suffix == ".md" and f.name != "README.md":
+            components["agents"].append(f)
 
     skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        for skill_dir in skills_dir.iterdir():
-            if not skill_dir.is_dir():
+    for skill_dir in index.iterdir(skills_dir):
+        if not index.is_dir(skill_dir):
+            continue
+        skill_md = skill_dir / "SKILL.md"
+        if index.exists(skill_md):
+            components["skills"].append(skill_md)
+        else:
+            # Denested entry layout: skills/<name>/<name>.md. Router plugins
+            # (marketing, office/lark) rename SKILL.md to <dirname>.md so
+            # sub-skills are not auto-discovered; the entry file gets the
+            # same frontmatter/tool/token checks as flat-layout skills.
+            denested_entry = skill_dir / f"{skill_dir.name}.md"
+            if index.exists(denested_entry):
+                components["skills"].append(denested_entry)
                 continue
-            skill_md = skill_dir / "SKILL.md"
-            if skill_md.exists():
-                components["skills"].append(skill_md)
-            else:
-                # Denested entry layout: skills/<name>/<name>.md. Router plugins
-                # (marketing, office/lark) rename SKILL.md to <dirname>.md so
-                # sub-skills are not auto-discovered; the entry file gets the
-                # same frontmatter/tool/token checks as flat-layout skills.
-                denested_entry = skill_dir / f"{skill_dir.name}.md"
-                if denested_entry.exists():
-                    components["skills"].append(denested_entry)
-                    continue
-                # Bucket layout: skills/<bucket>/<skill>/SKILL.md. When a
-                # top-level subdir has no SKILL.md but contains subdirs that
-                # each hold one, descend into the bucket so its nested skills
-                # get the same frontmatter/tool/token checks as flat-layout
-                # skills.
-                for nested in skill_dir.iterdir():
-                    if nested.is_dir() and (nested / "SKILL.md").exists():
-                        components["skills"].append(nested / "SKILL.md")
+            # Bucket layout: skills/<bucket>/<skill>/SKILL.md. When a
+            # top-level subdir has no SKILL.md but contains subdirs that
+            # each hold one, descend into the bucket so its nested skills
+            # get the same frontmatter/tool/token checks as flat-layout
+            # skills.
+            for nested in index.iterdir(skill_dir):
+                if index.is_dir(nested) and index.exists(nested / "SKILL.md"):
+                    components["skills"].append(nested / "SKILL.md")
 
     monitors_file = plugin_dir / "monitors" / "monitors.json"
-    if monitors_file.exists():
+    if index.exists(monitors_file):
         components["monitors"].append(monitors_file)
 
     themes_dir = plugin_dir / "themes"
-    if themes_dir.exists():
-        for f in themes_dir.iterdir():
-            if f.is_file() and f.suffix == ".json":
-                components["themes"].append(f)
+    for f in index.iterdir(themes_dir):
+        if index.is_file(f) and f.suffix == ".json":
+            components["themes"].append(f)
 
     output_styles_dir = plugin_dir / "output-styles"
-    if output_styles_dir.exists():
-        for f in output_styles_dir.iterdir():
-            if f.is_file() and f.suffix == ".md" and f.name != "README.md":
-                components["output_styles"].append(f)
+    for f in index.iterdir(output_styles_dir):
+        if index.is_file(f) and f.suffix == ".md" and f.name != "README.md":
+            components["output_styles"].append(f)
 
     return components
 
@@ -261,7 +929,8 @@ def get_relative_path(file_path: Path, plugin_dir: Path) -> str:
         return str(file_path)
 
 
-def _check_skill_folder_contents(skill_dir: Path, plugin_dir: Path, result) -> None:
+def _check_skill_folder_contents(skill_dir: Path, plugin_dir: Path, result,
+                                 index: PluginIndex) -> None:
     """Validate skill folder against official spec.
 
     The official skill spec is permissive in practice: the skill-creator's own
@@ -273,8 +942,8 @@ def _check_skill_folder_contents(skill_dir: Path, plugin_dir: Path, result) -> N
     """
     skill_rel = get_relative_path(skill_dir, plugin_dir)
 
-    for child in skill_dir.iterdir():
-        if child.is_dir() or not child.is_file():
+    for child in index.iterdir(skill_dir):
+        if index.is_dir(child) or not index.is_file(child):
             continue
         if child.name in FORBIDDEN_SKILL_AUX_FILES:
             result.should(
@@ -292,12 +961,14 @@ def _check_skill_folder_contents(skill_dir: Path, plugin_dir: Path, result) -> N
 # Check: Structure
 # =============================================================================
 
-def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
+def check_structure(plugin_dir: Path, verbose: bool = False,
+                    index: PluginIndex | None = None) -> ValidationResult:
     """Validate file patterns and directory structure."""
     result = ValidationResult("structure")
+    index = index or PluginIndex(plugin_dir)
 
     manifest = plugin_dir / ".claude-plugin" / "plugin.json"
-    if not manifest.exists():
+    if not index.exists(manifest):
         result.must(
             "plugin.json not found in .claude-plugin/",
             suggestion="Create .claude-plugin/plugin.json with required fields"
@@ -309,7 +980,7 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
     claude_plugin = plugin_dir / ".claude-plugin"
     for name in ("commands", "agents", "skills", "monitors", "themes", "output-styles", "hooks", "bin"):
         misplaced = claude_plugin / name
-        if misplaced.exists():
+        if index.exists(misplaced):
             result.must(
                 f"{name}/ inside .claude-plugin/",
                 file=str(misplaced),
@@ -317,7 +988,7 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
             )
 
     # Check kebab-case naming
-    components = find_components(plugin_dir)
+    components = index.components
     for comp_type, files in components.items():
         for f in files:
             name = f.parent.name if comp_type == "skills" else f.stem
@@ -332,18 +1003,18 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
     # Check skills have SKILL.md
     NON_SKILL_DIRS = {"references", "scripts", "examples", ".git", ".backup"}
     skills_dir = plugin_dir / "skills"
-    if skills_dir.exists():
-        for skill_dir in skills_dir.iterdir():
+    if index.exists(skills_dir):
+        for skill_dir in index.iterdir(skills_dir):
             if skill_dir.name in NON_SKILL_DIRS:
                 continue
-            if not skill_dir.is_dir():
+            if not index.is_dir(skill_dir):
                 continue
-            if not (skill_dir / "SKILL.md").exists():
+            if not index.exists(skill_dir / "SKILL.md"):
                 # Denested entry layout: skills/<name>/<name>.md is the entry
                 # (router plugins rename SKILL.md to <dirname>.md to prevent
                 # auto-discovery). Validate contents instead of flagging.
-                if (skill_dir / f"{skill_dir.name}.md").exists():
-                    _check_skill_folder_contents(skill_dir, plugin_dir, result)
+                if index.exists(skill_dir / f"{skill_dir.name}.md"):
+                    _check_skill_folder_contents(skill_dir, plugin_dir, result, index)
                     continue
                 # Bucket layout: skills/<bucket>/<skill>/SKILL.md (used by
                 # mattpocock-fork plugins). When a top-level subdir has no
@@ -351,13 +1022,13 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
                 # into the bucket and validate each nested skill rather than
                 # flagging the bucket itself.
                 nested = [
-                    d for d in skill_dir.iterdir()
-                    if d.is_dir() and d.name not in NON_SKILL_DIRS
-                    and (d / "SKILL.md").exists()
+                    d for d in index.iterdir(skill_dir)
+                    if index.is_dir(d) and d.name not in NON_SKILL_DIRS
+                    and index.exists(d / "SKILL.md")
                 ]
                 if nested:
                     for nested_skill in nested:
-                        _check_skill_folder_contents(nested_skill, plugin_dir, result)
+                        _check_skill_folder_contents(nested_skill, plugin_dir, result, index)
                     continue
                 result.must(
                     "Missing SKILL.md",
@@ -372,15 +1043,13 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
             # Nested skills (a subdirectory containing its own SKILL.md, e.g.
             # skills/lark/lark-mail/SKILL.md) are a legitimate pattern: they are
             # directories, not files, so the file-only check below skips them.
-            _check_skill_folder_contents(skill_dir, plugin_dir, result)
+            _check_skill_folder_contents(skill_dir, plugin_dir, result, index)
 
     # Check for hardcoded paths in config files
     for config_file in ["hooks/hooks.json", ".mcp.json"]:
         config_path = plugin_dir / config_file
-        if config_path.exists():
-            content = config_path.read_text()
-            lines = content.split("\n")
-            for i, line in enumerate(lines, 1):
+        if index.exists(config_path):
+            for i, line in enumerate(index.lines(config_path), 1):
                 if re.search(r'"/[^$].*\.(sh|py|js)"', line):
                     result.should(
                         "Hardcoded absolute path",
@@ -392,13 +1061,13 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
 
     # Warn about generic directory names
     for generic in ("utils", "misc", "temp", "helpers"):
-        if (plugin_dir / generic).exists():
+        if index.exists(plugin_dir / generic):
             result.should(
                 f"Generic directory name: {generic}/",
                 suggestion="Use descriptive names like 'scripts/', 'references/'"
             )
 
-    if not (plugin_dir / "README.md").exists():
+    if not index.exists(plugin_dir / "README.md"):
         result.may("No README.md", suggestion="Add README.md for documentation")
 
     return result
@@ -408,17 +1077,19 @@ def check_structure(plugin_dir: Path, verbose: bool = False) -> ValidationResult
 # Check: Manifest
 # =============================================================================
 
-def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
+def check_manifest(plugin_dir: Path, verbose: bool = False,
+                   index: PluginIndex | None = None) -> ValidationResult:
     """Validate plugin.json manifest structure and required fields."""
     result = ValidationResult("manifest")
+    index = index or PluginIndex(plugin_dir)
 
     manifest_path = plugin_dir / ".claude-plugin" / "plugin.json"
-    if not manifest_path.exists():
+    if not index.exists(manifest_path):
         result.must("plugin.json not found")
         return result
 
     try:
-        content = manifest_path.read_text()
+        content = index.read_text(manifest_path)
         manifest = json.loads(content)
     except json.JSONDecodeError as e:
         result.must(
@@ -430,7 +1101,7 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
         )
         return result
 
-    lines = content.split("\n")
+    lines = index.lines(manifest_path)
 
     key_line_re_cache: dict[str, re.Pattern] = {}
 
@@ -546,14 +1217,14 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
 
                 clean_path = cmd_path.rstrip("/")
                 full_path = plugin_dir / clean_path
-                if not full_path.is_dir():
+                if not index.is_dir(full_path):
                     result.must(
                         f"Command path not found",
                         file=".claude-plugin/plugin.json",
                         source=f'"{cmd_path}"',
                         suggestion=f"Create directory {cmd_path}"
                     )
-                elif not (full_path / "SKILL.md").exists():
+                elif not index.exists(full_path / "SKILL.md"):
                     result.must(
                         f"Missing SKILL.md in command",
                         file=cmd_path,
@@ -564,14 +1235,13 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
 
             # Check for undeclared user-invocable skills
             skills_dir = plugin_dir / "skills"
-            if skills_dir.exists():
+            if index.exists(skills_dir):
                 declared = set(commands)
 
                 def _check_user_invocable(skill_dir: Path, rel_root: str) -> None:
                     skill_path = f"./skills/{rel_root}{skill_dir.name}/"
                     if skill_path not in declared:
-                        content = (skill_dir / "SKILL.md").read_text()
-                        fm, _, _ = parse_frontmatter(content)
+                        fm, _, _ = index.frontmatter(skill_dir / "SKILL.md")
                         if fm.get("user-invocable", "").lower() == "true":
                             result.must(
                                 "Undeclared user-invocable skill",
@@ -580,15 +1250,15 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
                                 suggestion=f'Add "{skill_path}" to "commands" array in plugin.json',
                             )
 
-                for skill_dir in skills_dir.iterdir():
-                    if not skill_dir.is_dir():
+                for skill_dir in index.iterdir(skills_dir):
+                    if not index.is_dir(skill_dir):
                         continue
-                    if (skill_dir / "SKILL.md").exists():
+                    if index.exists(skill_dir / "SKILL.md"):
                         _check_user_invocable(skill_dir, "")
                     else:
                         # Bucket layout: skills/<bucket>/<skill>/SKILL.md
-                        for nested in skill_dir.iterdir():
-                            if nested.is_dir() and (nested / "SKILL.md").exists():
+                        for nested in index.iterdir(skill_dir):
+                            if index.is_dir(nested) and index.exists(nested / "SKILL.md"):
                                 _check_user_invocable(nested, f"{skill_dir.name}/")
 
     # Validate hooks field
@@ -612,7 +1282,7 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
                 )
             else:
                 hooks_path = plugin_dir / hooks.lstrip("./")
-                if not hooks_path.exists():
+                if not index.exists(hooks_path):
                     result.must(
                         "Hooks file not found",
                         file=".claude-plugin/plugin.json",
@@ -652,9 +1322,9 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
 
     # Validate stand-alone .mcp.json / .lsp.json files even when not declared in manifest
     standalone_mcp = plugin_dir / ".mcp.json"
-    if standalone_mcp.exists() and "mcpServers" not in manifest:
+    if index.exists(standalone_mcp) and "mcpServers" not in manifest:
         try:
-            data = json.loads(standalone_mcp.read_text())
+            data = json.loads(index.read_text(standalone_mcp))
             _validate_mcp_servers_object(data, plugin_dir, result, source_file=".mcp.json")
         except json.JSONDecodeError as e:
             result.must(
@@ -666,9 +1336,9 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
             )
 
     standalone_lsp = plugin_dir / ".lsp.json"
-    if standalone_lsp.exists() and "lspServers" not in manifest:
+    if index.exists(standalone_lsp) and "lspServers" not in manifest:
         try:
-            data = json.loads(standalone_lsp.read_text())
+            data = json.loads(index.read_text(standalone_lsp))
             _validate_lsp_servers_object(data, result, source_file=".lsp.json")
         except json.JSONDecodeError as e:
             result.must(
@@ -680,7 +1350,7 @@ def check_manifest(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
             )
 
     standalone_monitors = plugin_dir / "monitors" / "monitors.json"
-    if standalone_monitors.exists() and "monitors" not in manifest:
+    if index.exists(standalone_monitors) and "monitors" not in manifest:
         _validate_monitors_file(standalone_monitors, result, source_file="monitors/monitors.json")
 
     # Warn on unknown manifest fields (catches typos like "montiors")
@@ -1011,26 +1681,34 @@ def _validate_dependencies(value, result: ValidationResult) -> None:
 # Check: Frontmatter
 # =============================================================================
 
-def check_frontmatter(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
+def check_frontmatter(plugin_dir: Path, verbose: bool = False,
+                      index: PluginIndex | None = None, sink=None) -> ValidationResult:
     """Validate YAML frontmatter in component files."""
-    result = ValidationResult("frontmatter")
-
-    components = find_components(plugin_dir)
+    result = ValidationResult("frontmatter", sink)
+    index = index or PluginIndex(plugin_dir)
 
-    for comp_type, files in components.items():
+    for comp_type, files in index.components.items():
         for file_path in files:
-            _validate_single_frontmatter(file_path, comp_type.rstrip("s"), result, plugin_dir, verbose)
+            rel_path = get_relative_path(file_path, plugin_dir)
+            _add_unit_issues(
+                result, index, rel_path, index.touched(rel_path),
+                lambda unit, f=file_path, r=rel_path, t=comp_type: _add_cached_file_issues(
+                    unit, (t, r, str(verbose)), index.read_text(f),
+                    lambda sub: _validate_single_frontmatter(f, t.rstrip("s"), sub, plugin_dir, verbose, index),
+                ),
+                verbose,
+            )
 
     return result
 
 
 def _validate_single_frontmatter(file_path: Path, comp_type: str, result: ValidationResult,
-                                  plugin_dir: Path, verbose: bool):
+                                  plugin_dir: Path, verbose: bool, index: PluginIndex | None = None):
     """Validate frontmatter for a single file."""
-    content = file_path.read_text()
-    lines = content.split("\n")
+    index = index or PluginIndex(plugin_dir)
+    lines = index.lines(file_path)
     rel_path = get_relative_path(file_path, plugin_dir)
-    fm, body, fm_end_line = parse_frontmatter(content)
+    fm, body, fm_end_line = index.frontmatter(file_path)
 
     if not fm:
         result.must(
@@ -1307,95 +1985,165 @@ def _validate_single_frontmatter(file_path: Path, comp_type: str, result: Valida
 # Check: Tool Invocations
 # =============================================================================
 
-def check_tool_invocations(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
+def check_tool_invocations(plugin_dir: Path, verbose: bool = False,
+                           index: PluginIndex | None = None, sink=None) -> ValidationResult:
     """Detect explicit tool call anti-patterns."""
-    result = ValidationResult("tools")
+    result = ValidationResult("tools", sink)
+    index = index or PluginIndex(plugin_dir)
 
-    components = find_components(plugin_dir)
+    components = index.components
     all_files = components["commands"] + components["agents"] + components["skills"]
 
-    # Anti-pattern regex
-    core_tools = re.compile(r'(Use|Call|Using) (the )?`?(Read|Write|Glob|Grep|Edit)`? tool', re.IGNORECASE)
-    bash_tool = re.compile(r'(Use|Call|Using) (the )?Bash tool', re.IGNORECASE)
-    task_tool = re.compile(r'(Use|Call) (the )?Task tool to launch [a-z-]+', re.IGNORECASE)
-    fence_start = re.compile(r'^\s*(```+|~~~+)')
-
     for file_path in all_files:
-        content = file_path.read_text()
-        lines = content.split("\n")
         rel_path = get_relative_path(file_path, plugin_dir)
-        in_fence = False
-        fence_char = ""
-        fence_len = 0
+        _add_unit_issues(
+            result, index, rel_path, index.touched(rel_path),
+            lambda unit, f=file_path, r=rel_path: _add_cached_file_issues(
+                unit, (r,), index.read_text(f),
+                lambda sub: _scan_tool_invocations(f, r, sub, index),
+            ),
+        )
 
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if not stripped:
-                continue
+    return result
 
-            fence_match = fence_start.match(stripped)
-            if fence_match:
-                marker = fence_match.group(1)
-                if not in_fence:
-                    in_fence = True
-                    fence_char = marker[0]
-                    fence_len = len(marker)
-                elif marker[0] == fence_char and len(marker) >= fence_len:
-                    in_fence = False
-                    fence_char = ""
-                    fence_len = 0
-                continue
 
-            if in_fence:
-                continue
+# Every tool-call anti-pattern contains the word "tool", so only lines with it
+# are matched against the patterns, as alternatives of one regex. Code fence
+# markers are located with plain string search rather than per-line regexes.
+TOOL_SCAN_RE = re.compile(
+    r'(?P<core>(?:Use|Call|Using) (?:the )?`?(?:Read|Write|Glob|Grep|Edit)`? tool)'
+    r'|(?P<bash>(?:Use|Call|Using) (?:the )?Bash tool)'
+    r'|(?P<task>(?:Use|Call) (?:the )?Task tool to launch [a-z-]+)',
+    re.IGNORECASE,
+)
+TOOL_WORD_RE = re.compile(r'tool', re.IGNORECASE)
+
+TOOL_SCAN_ISSUES = {
+    "core": ("Explicit core tool reference",
+             "Describe action directly: 'Find files...' not 'Use Glob tool...'"),
+    "bash": ("Explicit Bash tool reference",
+             "Use: Run `command` or describe command directly"),
+    "task": ("Explicit Task tool reference",
+             "Use: Launch `agent-name` agent"),
+}
 
-            if core_tools.search(line):
-                result.should(
-                    "Explicit core tool reference",
-                    file=rel_path,
-                    line=i,
-                    source=stripped,
-                    suggestion="Describe action directly: 'Find files...' not 'Use Glob tool...'"
-                )
 
-            if bash_tool.search(line) and "Bash(" not in line and "!`" not in line:
-                result.should(
-                    "Explicit Bash tool reference",
-                    file=rel_path,
-                    line=i,
-                    source=stripped,
-                    suggestion="Use: Run `command` or describe command directly"
-                )
+def _scan_tool_invocations(file_path: Path, rel_path: str, result: ValidationResult,
+                           index: PluginIndex) -> None:
+    """Report tool invocation anti-patterns in one file."""
+    for line_num, kinds, source in _tool_invocation_hits(index.read_text(file_path)):
+        for kind in ("core", "bash", "task"):
+            if kind in kinds:
+                message, suggestion = TOOL_SCAN_ISSUES[kind]
+                result.should(message, file=rel_path, line=line_num, source=source,
+                              suggestion=suggestion)
+
+    # Check frontmatter for unrestricted Bash
+    fm, _, _ = index.frontmatter(file_path)
+    if "allowed-tools" in fm:
+        allowed = fm["allowed-tools"]
+        if isinstance(allowed, str) and "Bash" in allowed and "Bash(" not in allowed:
+            result.must(
+                "Unrestricted Bash in allowed-tools",
+                file=rel_path,
+                source=f'allowed-tools: {allowed}',
+                suggestion="Use filtered: Bash(git:*), Bash(npm:*)"
+            )
 
-            if task_tool.search(line):
-                result.should(
-                    "Explicit Task tool reference",
-                    file=rel_path,
-                    line=i,
-                    source=stripped,
-                    suggestion="Use: Launch `agent-name` agent"
-                )
 
-        # Check frontmatter for unrestricted Bash
-        fm, _, _ = parse_frontmatter(content)
-        if "allowed-tools" in fm:
-            allowed = fm["allowed-tools"]
-            if isinstance(allowed, str) and "Bash" in allowed and "Bash(" not in allowed:
-                result.must(
-                    "Unrestricted Bash in allowed-tools",
-                    file=rel_path,
-                    source=f'allowed-tools: {allowed}',
-                    suggestion="Use filtered: Bash(git:*), Bash(npm:*)"
-                )
+def _tool_word_lines(content: str) -> list[int]:
+    """Start offsets of the lines containing "tool" (any case), in order."""
+    lowered = content.lower()
+    if len(lowered) != len(content):
+        # Rare case-mappings change the length; offsets would not line up.
+        positions = (m.start() for m in TOOL_WORD_RE.finditer(content))
+        return sorted({content.rfind("\n", 0, pos) + 1 for pos in positions})
+    starts = []
+    pos = lowered.find("tool")
+    while pos >= 0:
+        starts.append(content.rfind("\n", 0, pos) + 1)
+        line_end = content.find("\n", pos)
+        if line_end < 0:
+            break
+        pos = lowered.find("tool", line_end)
+    return starts
+
+
+def _fence_lines(content: str) -> list[tuple[int, str]]:
+    """(line start offset, marker) for each line starting (after whitespace) with ``` or ~~~."""
+    fences = []
+    for char in "`~":
+        needle = char * 3
+        pos = content.find(needle)
+        while pos >= 0:
+            line_start = content.rfind("\n", 0, pos) + 1
+            if not content[line_start:pos] or content[line_start:pos].isspace():
+                end = pos + 3
+                while end < len(content) and content[end] == char:
+                    end += 1
+                fences.append((line_start, content[pos:end]))
+            line_end = content.find("\n", pos)
+            if line_end < 0:
+                break
+            pos = content.find(needle, line_end)
+    fences.sort()
+    return fences
+
+
+def _tool_invocation_hits(content: str):
+    """Yield (line number, kinds, stripped line) for lines outside code fences
+    with at least one anti-pattern; kinds is a subset of "core"/"bash"/"task".
+
+    A fence opens on a line starting (after whitespace) with ``` or ~~~ and
+    closes on the next such line with the same character and at least as
+    many markers; fence lines themselves are never reported.
+    """
+    candidates = _tool_word_lines(content)
+    if not candidates:
+        return
 
-    return result
+    # Fence state at each candidate line, walking both sorted offset lists.
+    fences = _fence_lines(content)
+    fence_idx = 0
+    in_fence = False
+    fence_char = ""
+    fence_len = 0
+    line_num = 1
+    counted_to = 0
+
+    for line_start in candidates:
+        on_fence_line = False
+        while fence_idx < len(fences) and fences[fence_idx][0] <= line_start:
+            fence_start, marker = fences[fence_idx]
+            fence_idx += 1
+            on_fence_line = fence_start == line_start
+            if not in_fence:
+                in_fence = True
+                fence_char = marker[0]
+                fence_len = len(marker)
+            elif marker[0] == fence_char and len(marker) >= fence_len:
+                in_fence = False
+                fence_char = ""
+                fence_len = 0
+        if in_fence or on_fence_line:
+            continue
+
+        line_end = content.find("\n", line_start)
+        line = content[line_start:] if line_end < 0 else content[line_start:line_end]
+        kinds = {m.lastgroup for m in TOOL_SCAN_RE.finditer(line)}
+        if "bash" in kinds and ("Bash(" in line or "!`" in line):
+            kinds.discard("bash")
+        if kinds:
+            line_num += content.count("\n", counted_to, line_start)
+            counted_to = line_start
+            yield line_num, kinds, line.strip()
 
 
 # =============================================================================
 # Check: Tokens
 # =============================================================================
 
-def _is_verbatim_upstream_mirror(skill_dir: Path) -> bool:
+def _is_verbatim_upstream_mirror(skill_dir: Path, index: PluginIndex) -> bool:
     """True when SKILL.md is a byte-for-byte copy of an upstream SKILL.md kept
     beside it as reference/upstream-SKILL.md (the sync-mirror convention, see
     any synced plugin's SYNC.md). Such a skill's body size tracks upstream, so the body
@@ -1404,7 +2152,7 @@ def _is_verbatim_upstream_mirror(skill_dir: Path) -> bool:
     from the pristine copy."""
     pristine = skill_dir / "reference" / "upstream-SKILL.md"
     live = skill_dir / "SKILL.md"
-    if not pristine.is_file() or not live.is_file():
+    if not index.is_file(pristine) or not index.is_file(live):
         return False
     try:
         return pristine.read_bytes() == live.read_bytes()
@@ -1412,7 +2160,21 @@ def _is_verbatim_upstream_mirror(skill_dir: Path) -> bool:
         return False
 
 
-def _is_plugin_level_mirror(plugin_dir: Path) -> bool:
+@functools.lru_cache(maxsize=None)
+def _load_marketplace_strictness(marketplace: Path) -> dict[str, bool]:
+    """Plugin name -> `strict` flag from a marketplace.json, read once per process."""
+    try:
+        data = json.loads(marketplace.read_text())
+        return {entry.get("name"): entry.get("strict") for entry in data.get("plugins", [])}
+    except (OSError, ValueError):
+        return {}
+
+
+# Plugin-relative inputs of the plugin-level mirror decision (besides marketplace.json).
+PLUGIN_MIRROR_INPUTS = ("README.md", "scripts")
+
+
+def _is_plugin_level_mirror(plugin_dir: Path, index: PluginIndex) -> bool:
     """True when the whole plugin is a synced mirror of an upstream repo
     (marketplace.json marks it strict:false, or it ships a sync script and
     declares itself mirrored in its README). Such plugins intentionally
@@ -1423,49 +2185,35 @@ def _is_plugin_level_mirror(plugin_dir: Path) -> bool:
     # 1. marketplace.json strict:false on this plugin
     marketplace = plugin_dir.parent / ".claude-plugin" / "marketplace.json"
     if marketplace.is_file():
-        try:
-            import json
-            data = json.loads(marketplace.read_text())
-            for entry in data.get("plugins", []):
-                if entry.get("name") == plugin_dir.name and entry.get("strict") is False:
-                    return True
-        except (OSError, ValueError):
-            pass
+        if _load_marketplace_strictness(marketplace).get(plugin_dir.name) is False:
+            return True
     # 2. ships a sync script + README declares mirrored
-    has_sync = any((plugin_dir / "scripts").glob("sync-*.sh")) if (plugin_dir / "scripts").is_dir() else False
+    has_sync = bool(index.glob(plugin_dir / "scripts", "sync-*.sh"))
     readme = plugin_dir / "README.md"
-    if has_sync and readme.is_file():
+    if has_sync and index.is_file(readme):
         try:
-            if "mirror" in readme.read_text().lower():
+            if "mirror" in index.read_text(readme).lower():
                 return True
         except OSError:
             pass
     return False
 
 
-def check_tokens(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
+def check_tokens(plugin_dir: Path, verbose: bool = False,
+                 index: PluginIndex | None = None, sink=None) -> ValidationResult:
     """Validate token budgets for progressive disclosure."""
-    result = ValidationResult("tokens")
+    result = ValidationResult("tokens", sink)
+    index = index or PluginIndex(plugin_dir)
 
     if verbose:
         result.ok(f"Token counting method: {TOKEN_METHOD}")
 
     skills_dir = plugin_dir / "skills"
-    if not skills_dir.exists():
+    if not index.exists(skills_dir):
         result.may("No skills/ directory")
         return result
 
-    skills = []
-    for skill_dir in skills_dir.iterdir():
-        if not skill_dir.is_dir():
-            continue
-        if (skill_dir / "SKILL.md").exists():
-            skills.append(skill_dir)
-        else:
-            # Bucket layout: descend so nested skills get token-budget checks.
-            for nested in skill_dir.iterdir():
-                if nested.is_dir() and (nested / "SKILL.md").exists():
-                    skills.append(nested)
+    skills = index.skill_dirs
 
     if not skills:
         result.may("No skills found")
@@ -1474,199 +2222,279 @@ def check_tokens(plugin_dir: Path, verbose: bool = False) -> ValidationResult:
     # Plugin-level mirror (marketplace strict:false or sync script + mirrored
     # README): the whole plugin tracks an upstream, so body size is
     # upstream-controlled and MUST caps are reported but not enforced.
-    plugin_mirror = _is_plugin_level_mirror(plugin_dir)
+    plugin_mirror = index.plugin_mirror
+
+    # Each skill's files are gathered once and shared by priming and analysis.
+    collected: dict[Path, list[tuple[str, str, str]]] = {}
+    _prime_skill_token_counts(
+        [d for d in skills if index.touched(get_relative_path(d, plugin_dir), *PLUGIN_MIRROR_INPUTS)],
+        index,
+        collected,
+    )
 
     for skill_dir in sorted(skills):
-        skill_result = _analyze_skill_tokens(skill_dir)
-        rel_path = get_relative_path(skill_dir / "SKILL.md", plugin_dir)
-
-        meta = skill_result["metadata_tokens"]
-        body = skill_result["skill_tokens"]
-        body_lines = skill_result["body_lines"]
-        refs = skill_result["reference_tokens"]
-
-        # Verbatim upstream mirrors track upstream body size; report their
-        # over-budget body but don't fail on it. A plugin-level mirror
-        # (strict:false / sync script) extends the same exemption to every
-        # skill in it — trimming any one would be overwritten on next sync.
-        is_mirror = _is_verbatim_upstream_mirror(skill_dir) or plugin_mirror
-        mirror_note = " — exempt: verbatim upstream mirror (SKILL.md == reference/upstream-SKILL.md)" if not plugin_mirror else " — exempt: plugin-level upstream mirror (marketplace strict:false / sync script)"
-        mirror_fix = "Body tracks upstream verbatim (see SYNC.md); size is upstream-controlled, not a local defect" if not plugin_mirror else "Plugin is a synced mirror; body size is upstream-controlled, not a local defect (see README)"
-
-        # Build details dict for structured output
-        details = {
-            "frontmatter": meta,
-            "body": body,
-            "body_lines": body_lines,
-            "refs": refs,
-            "files": skill_result["files"]
-        }
+        rel_dir = get_relative_path(skill_dir, plugin_dir)
+        _add_unit_issues(
+            result, index, rel_dir, index.touched(rel_dir, *PLUGIN_MIRROR_INPUTS),
+            lambda sub, d=skill_dir: _check_skill_token_budget(d, plugin_dir, sub, index, plugin_mirror, verbose,
+                                                               collected.get(d)),
+            verbose,
+        )
 
-        # Check metadata token count (official: ~100 tokens for name + description)
-        if meta >= METADATA_WARNING:
-            result.should(
-                f"Metadata (name + description) too long: {meta} tokens (target: {METADATA_TARGET})",
-                file=rel_path,
-                suggestion=f"Shorten name/description - always loaded at startup, keep near {METADATA_TARGET} tokens",
-                **details
-            )
-        elif meta > METADATA_TARGET and verbose:
-            result.ok(
-                f"Metadata: {meta} tokens (slightly above {METADATA_TARGET} target)",
-                file=rel_path,
-                **details
-            )
+    return result
 
-        # Check line count (official requirement: under 500 lines)
-        if body_lines >= SKILL_LINE_CRITICAL:
-            if is_mirror:
-                result.should(
-                    f"SKILL.md body too long: {body_lines} lines (max recommended: {SKILL_LINE_TARGET}){mirror_note}",
-                    file=rel_path,
-                    suggestion=mirror_fix,
-                    **details
-                )
-            else:
-                result.must(
-                    f"SKILL.md body too long: {body_lines} lines (max recommended: {SKILL_LINE_TARGET})",
-                    file=rel_path,
-                    suggestion=f"MUST move content to references/ - exceed {SKILL_LINE_CRITICAL} lines",
-                    **details
-                )
-        elif body_lines >= SKILL_LINE_WARNING:
+
+def _check_skill_token_budget(skill_dir: Path, plugin_dir: Path, result: ValidationResult,
+                              index: PluginIndex, plugin_mirror: bool, verbose: bool,
+                              inputs: list[tuple[str, str, str]] | None = None) -> None:
+    """Report token and line budgets for one skill."""
+    skill_result = _analyze_skill_tokens(skill_dir, index, inputs)
+    rel_path = get_relative_path(skill_dir / "SKILL.md", plugin_dir)
+
+    meta = skill_result["metadata_tokens"]
+    body = skill_result["skill_tokens"]
+    body_lines = skill_result["body_lines"]
+    refs = skill_result["reference_tokens"]
+
+    # Verbatim upstream mirrors track upstream body size; report their
+    # over-budget body but don't fail on it. A plugin-level mirror
+    # (strict:false / sync script) extends the same exemption to every
+    # skill in it — trimming any one would be overwritten on next sync.
+    is_mirror = _is_verbatim_upstream_mirror(skill_dir, index) or plugin_mirror
+    mirror_note = " — exempt: verbatim upstream mirror (SKILL.md == reference/upstream-SKILL.md)" if not plugin_mirror else " — exempt: plugin-level upstream mirror (marketplace strict:false / sync script)"
+    mirror_fix = "Body tracks upstream verbatim (see SYNC.md); size is upstream-controlled, not a local defect" if not plugin_mirror else "Plugin is a synced mirror; body size is upstream-controlled, not a local defect (see README)"
+
+    # Build details dict for structured output
+    details = {
+        "frontmatter": meta,
+        "body": body,
+        "body_lines": body_lines,
+        "refs": refs,
+        "files": skill_result["files"]
+    }
+
+    # Check metadata token count (official: ~100 tokens for name + description)
+    if meta >= METADATA_WARNING:
+        result.should(
+            f"Metadata (name + description) too long: {meta} tokens (target: {METADATA_TARGET})",
+            file=rel_path,
+            suggestion=f"Shorten name/description - always loaded at startup, keep near {METADATA_TARGET} tokens",
+            **details
+        )
+    elif meta > METADATA_TARGET and verbose:
+        result.ok(
+            f"Metadata: {meta} tokens (slightly above {METADATA_TARGET} target)",
+            file=rel_path,
+            **details
+        )
+
+    # Check line count (official requirement: under 500 lines)
+    if body_lines >= SKILL_LINE_CRITICAL:
+        if is_mirror:
             result.should(
-                f"SKILL.md body approaching limit: {body_lines} lines (recommended: {SKILL_LINE_TARGET})",
+                f"SKILL.md body too long: {body_lines} lines (max recommended: {SKILL_LINE_TARGET}){mirror_note}",
                 file=rel_path,
-                suggestion=f"Consider moving content to references/",
+                suggestion=mirror_fix,
                 **details
             )
-        elif body_lines > SKILL_LINE_TARGET and verbose:
-            result.ok(
-                f"SKILL.md body: {body_lines} lines (slightly above {SKILL_LINE_TARGET} target)",
+        else:
+            result.must(
+                f"SKILL.md body too long: {body_lines} lines (max recommended: {SKILL_LINE_TARGET})",
                 file=rel_path,
+                suggestion=f"MUST move content to references/ - exceed {SKILL_LINE_CRITICAL} lines",
                 **details
             )
+    elif body_lines >= SKILL_LINE_WARNING:
+        result.should(
+            f"SKILL.md body approaching limit: {body_lines} lines (recommended: {SKILL_LINE_TARGET})",
+            file=rel_path,
+            suggestion=f"Consider moving content to references/",
+            **details
+        )
+    elif body_lines > SKILL_LINE_TARGET and verbose:
+        result.ok(
+            f"SKILL.md body: {body_lines} lines (slightly above {SKILL_LINE_TARGET} target)",
+            file=rel_path,
+            **details
+        )
 
-        # Check token count (official: Under 5k tokens for SKILL.md body)
-        if body >= SKILL_BODY_MAX:
-            if is_mirror:
-                result.should(
-                    f"Token budget exceeded: {body} tokens (max: {SKILL_BODY_MAX}){mirror_note}",
-                    file=rel_path,
-                    suggestion=mirror_fix,
-                    **details
-                )
-            else:
-                result.must(
-                    f"Token budget exceeded: {body} tokens (max: {SKILL_BODY_MAX})",
-                    file=rel_path,
-                    suggestion=f"MUST move content to references/ - exceed {SKILL_BODY_MAX} tokens",
-                    **details
-                )
-        elif body >= SKILL_BODY_WARNING:
+    # Check token count (official: Under 5k tokens for SKILL.md body)
+    if body >= SKILL_BODY_MAX:
+        if is_mirror:
             result.should(
-                f"Token count approaching limit: {body} tokens (max: {SKILL_BODY_MAX})",
+                f"Token budget exceeded: {body} tokens (max: {SKILL_BODY_MAX}){mirror_note}",
                 file=rel_path,
-                suggestion=f"Consider moving content to references/ before reaching {SKILL_BODY_MAX} tokens",
+                suggestion=mirror_fix,
                 **details
             )
-        elif verbose:
-            result.ok(
-                f"Token count OK: {body} tokens",
+        else:
+            result.must(
+                f"Token budget exceeded: {body} tokens (max: {SKILL_BODY_MAX})",
                 file=rel_path,
+                suggestion=f"MUST move content to references/ - exceed {SKILL_BODY_MAX} tokens",
                 **details
             )
+    elif body >= SKILL_BODY_WARNING:
+        result.should(
+            f"Token count approaching limit: {body} tokens (max: {SKILL_BODY_MAX})",
+            file=rel_path,
+            suggestion=f"Consider moving content to references/ before reaching {SKILL_BODY_MAX} tokens",
+            **details
+        )
+    elif verbose:
+        result.ok(
+            f"Token count OK: {body} tokens",
+            file=rel_path,
+            **details
+        )
 
-        # Additional verbose output for file breakdown
-        if verbose:
-            ref_files = [f for f in skill_result.get("files", []) if f["type"] == "reference"]
-            script_files = [f for f in skill_result.get("files", []) if f["type"] == "script"]
-
-            # Level 1: Metadata
-            result.ok(f"  Level 1 (Metadata): {meta} tokens (always loaded at startup)")
-            result.ok(f"    - name + description from YAML frontmatter")
-
-            # Level 2: Instructions
-            result.ok(f"  Level 2 (Instructions): {body} tokens ({body_lines} lines, loaded when triggered)")
-            result.ok(f"    - SKILL.md body with instructions and guidance")
-            if skill_result.get('status') == "CRITICAL":
-                result.ok(f"    - Status: EXCEEDS 5k token limit (MUST refactor)")
-            elif skill_result.get('status') == "WARNING":
-                result.ok(f"    - Status: Approaching 5k token limit (SHOULD consider refactoring)")
-            elif body_lines > SKILL_LINE_TARGET:
-                result.ok(f"    - Status: Above {SKILL_LINE_TARGET} lines target (MAY consider refactoring)")
-
-            # Level 3: Resources
-            result.ok(f"  Level 3 (Resources): {refs} tokens (loaded as needed)")
-            result.ok(f"    - Bundled files: {len(ref_files)} reference files")
-            for f in ref_files:
+    # Additional verbose output for file breakdown
+    if verbose:
+        ref_files = [f for f in skill_result.get("files", []) if f["type"] == "reference"]
+        script_files = [f for f in skill_result.get("files", []) if f["type"] == "script"]
+
+        # Level 1: Metadata
+        result.ok(f"  Level 1 (Metadata): {meta} tokens (always loaded at startup)")
+        result.ok(f"    - name + description from YAML frontmatter")
+
+        # Level 2: Instructions
+        result.ok(f"  Level 2 (Instructions): {body} tokens ({body_lines} lines, loaded when triggered)")
+        result.ok(f"    - SKILL.md body with instructions and guidance")
+        if skill_result.get('status') == "CRITICAL":
+            result.ok(f"    - Status: EXCEEDS 5k token limit (MUST refactor)")
+        elif skill_result.get('status') == "WARNING":
+            result.ok(f"    - Status: Approaching 5k token limit (SHOULD consider refactoring)")
+        elif body_lines > SKILL_LINE_TARGET:
+            result.ok(f"    - Status: Above {SKILL_LINE_TARGET} lines target (MAY consider refactoring)")
+
+        # Level 3: Resources
+        result.ok(f"  Level 3 (Resources): {refs} tokens (loaded as needed)")
+        result.ok(f"    - Bundled files: {len(ref_files)} reference files")
+        for f in ref_files:
+            result.ok(f"      - {f['file']}: {f['tokens']} tokens")
+        if script_files:
+            scripts = skill_result.get("script_tokens", 0)
+            result.ok(f"    - Scripts: {scripts} tokens ({len(script_files)} files)")
+            for f in script_files:
                 result.ok(f"      - {f['file']}: {f['tokens']} tokens")
-            if script_files:
-                scripts = skill_result.get("script_tokens", 0)
-                result.ok(f"    - Scripts: {scripts} tokens ({len(script_files)} files)")
-                for f in script_files:
-                    result.ok(f"      - {f['file']}: {f['tokens']} tokens")
-            result.ok(f"  Total effective: {skill_result['total_tokens']} tokens")
+        result.ok(f"  Total effective: {skill_result['total_tokens']} tokens")
 
-    return result
+
+def _collect_skill_token_inputs(skill_dir: Path, index: PluginIndex) -> list[tuple[str, str, str]]:
+    """Read every file that contributes to a skill's token budget.
+
+    Returns (type, file, content) tuples in report order: SKILL.md first, then
+    references (references/**/*.md and loose *.md, deduplicated by resolved
+    path so symlinked copies count once), then scripts.
+    """
+    inputs = [("skill", "SKILL.md", index.read_text(skill_dir / "SKILL.md"))]
+    references = [(f, rel, is_symlink) for f, rel, is_symlink in index.walk_files(skill_dir / "references")
+                  if rel.endswith(".md")]
+    loose = [(f, f.name, index.is_symlink(f)) for f in index.glob(skill_dir, "*.md") if f.name != "SKILL.md"]
+    # Without symlinks every path is a distinct file, so nothing needs resolving.
+    check_copies = index.is_symlink(skill_dir / "references") or any(link for _, _, link in references + loose)
+    seen_files = set()
+    real_dirs = {}
+
+    def first_copy(path: Path, is_symlink: bool) -> bool:
+        if not check_copies:
+            return True
+        # Only symlinks need resolving; anything else is its resolved directory + name.
+        if is_symlink:
+            real = os.path.realpath(path)
+        else:
+            directory, name = os.path.split(str(path))
+            real_dir = real_dirs.get(directory)
+            if real_dir is None:
+                real_dir = real_dirs[directory] = os.path.realpath(directory)
+            real = os.path.join(real_dir, name)
+        if real in seen_files:
+            return False
+        seen_files.add(real)
+        return True
+
+    for f, rel, is_symlink in references + loose:
+        if first_copy(f, is_symlink):
+            inputs.append(("reference", rel, index.read_text(f)))
+
+    for f, rel, _ in index.walk_files(skill_dir / "scripts"):
+        if os.path.splitext(rel)[1] in SCRIPT_SUFFIXES:
+            inputs.append(("script", rel, index.read_text(f)))
+
+    return inputs
 
 
-def _analyze_skill_tokens(skill_dir: Path) -> dict:
-    """Analyze token usage for a single skill."""
-    skill_md = skill_dir / "SKILL.md"
-    content = skill_md.read_text()
-    fm, body, _ = parse_frontmatter(content)
+def _skill_tokens_key(inputs: list[tuple[str, str, str]]) -> str:
+    digests = [f"{file_type}:{name}:{content_digest(content.encode('utf-8'))}"
+               for file_type, name, content in inputs]
+    return ResultCache.make_key("tokens", *digests)
 
-    description = fm.get("description", "")
-    name = fm.get("name", "")
 
+def _skill_token_texts(inputs: list[tuple[str, str, str]]) -> list[str]:
+    """Texts counted for a skill: metadata, SKILL.md body, then each other input."""
+    fm, body, _ = parse_frontmatter(inputs[0][2])
     # Official: name + description for metadata tokens
-    metadata_text = f"{name} {description}"
-    metadata_tokens = count_tokens(metadata_text)
-    skill_tokens = count_tokens(body)
+    metadata_text = f"{fm.get('name', '')} {fm.get('description', '')}"
+    return [metadata_text, body] + [text for _, _, text in inputs[1:]]
+
+
+def _prime_skill_token_counts(skill_dirs: list[Path], index: PluginIndex,
+                              collected: dict[Path, list[tuple[str, str, str]]] | None = None) -> None:
+    """Count the texts of every skill whose analysis is not cached in one batch.
+
+    The gathered inputs of each skill are stored in `collected` for reuse.
+    """
+    texts = []
+    for skill_dir in skill_dirs:
+        inputs = _collect_skill_token_inputs(skill_dir, index)
+        if collected is not None:
+            collected[skill_dir] = inputs
+        # Peek: the analysis pass looks the same key up again and counts it.
+        if _CACHE is not None and _CACHE.peek(_skill_tokens_key(inputs)) is not None:
+            continue
+        texts.extend(_skill_token_texts(inputs))
+    if texts:
+        TOKEN_COUNTER.count_many(texts)
+
+
+def _analyze_skill_tokens(skill_dir: Path, index: PluginIndex | None = None,
+                          inputs: list[tuple[str, str, str]] | None = None) -> dict:
+    """Analyze token usage for a single skill (cached on the contributing files' hashes)."""
+    if inputs is None:
+        inputs = _collect_skill_token_inputs(skill_dir, index or PluginIndex(skill_dir))
+
+    if _CACHE is None:
+        return _compute_skill_tokens(inputs)
+
+    key = _skill_tokens_key(inputs)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+    analysis = _compute_skill_tokens(inputs)
+    _CACHE.put(key, analysis)
+    return analysis
+
+
+def _compute_skill_tokens(inputs: list[tuple[str, str, str]]) -> dict:
+    """Count tokens for the inputs gathered by `_collect_skill_token_inputs`."""
+    texts = _skill_token_texts(inputs)
+    counts = TOKEN_COUNTER.count_many(texts)
+    metadata_tokens, skill_tokens = counts[0], counts[1]
+    body = texts[1]
 
     # Count body lines (exclude frontmatter)
     body_lines = len([l for l in body.split("\n") if l.strip()])
 
     reference_tokens = 0
+    script_tokens = 0
     files = [{"file": "SKILL.md", "tokens": skill_tokens, "type": "skill"}]
-    seen_files = set()
-
-    ref_dir = skill_dir / "references"
-    if ref_dir.exists():
-        for f in ref_dir.glob("**/*.md"):
-            abs_path = f.resolve()
-            if abs_path not in seen_files:
-                seen_files.add(abs_path)
-                tokens = count_tokens(f.read_text())
-                reference_tokens += tokens
-                files.append({
-                    "file": str(f.relative_to(skill_dir)),
-                    "tokens": tokens,
-                    "type": "reference"
-                })
-
-    for f in skill_dir.glob("*.md"):
-        if f.name != "SKILL.md":
-            abs_path = f.resolve()
-            if abs_path not in seen_files:
-                seen_files.add(abs_path)
-                tokens = count_tokens(f.read_text())
-                reference_tokens += tokens
-                files.append({"file": f.name, "tokens": tokens, "type": "reference"})
 
-    script_tokens = 0
-    scripts_dir = skill_dir / "scripts"
-    if scripts_dir.exists():
-        for f in scripts_dir.glob("**/*"):
-            if f.is_file() and f.suffix in [".py", ".sh", ".js", ".ts"]:
-                tokens = count_tokens(f.read_text())
-                script_tokens += tokens
-                files.append({
-                    "file": str(f.relative_to(skill_dir)),
-                    "tokens": tokens,
-                    "type": "script"
-                })
+    for (file_type, file_name, _), tokens in zip(inputs[1:], counts[2:]):
+        if file_type == "reference":
+            reference_tokens += tokens
+        else:
+            script_tokens += tokens
+        files.append({"file": file_name, "tokens": tokens, "type": file_type})
 
     total_tokens = metadata_tokens + skill_tokens + reference_tokens + script_tokens
 
@@ -1690,6 +2518,151 @@ def _analyze_skill_tokens(skill_dir: Path) -> dict:
     }
 
 
+# =============================================================================
+# Check: Duplicates
+# =============================================================================
+
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Share of distinct lines two files must have in common
+NEAR_DUPLICATE_MIN_LINES = 10   # Smaller files are too short to compare meaningfully
+DUPLICATE_SKETCH_SIZE = 16      # Lines sketched per file to find candidate pairs
+DUPLICATE_COMMON_FILES = 8      # Lines in more files than this are boilerplate, not sketched
+
+
+def _duplicate_sources(index: PluginIndex) -> list[tuple[Path, str]]:
+    """(path, relative path) of every skill entry file and references/**/*.md file, symlinks excluded.
+
+    Entry files are SKILL.md or the denested <name>.md of router plugins.
+    Symlinked copies already share one file, so only regular files can be
+    wasteful duplicates.
+    """
+    plugin_dir = index.plugin_dir
+    entries = set(index.components["skills"])
+    entries.update(skill_dir / "SKILL.md" for skill_dir in startup_skill_dirs(index))
+    directories = {entry.parent for entry in entries}
+    # Shared references/ directory that skills symlink into.
+    directories.add(plugin_dir / "skills")
+
+    sources = set()
+    for entry in entries:
+        if index.is_file(entry) and not index.is_symlink(entry):
+            sources.add((entry, get_relative_path(entry, plugin_dir)))
+    for directory in directories:
+        prefix = get_relative_path(directory, plugin_dir) + "/"
+        for path, rel, is_symlink in index.walk_files(directory / "references"):
+            if rel.endswith(".md") and not is_symlink:
+                sources.add((path, prefix + rel))
+    return sorted(sources, key=lambda source: source[1])
+
+
+def _distinct_lines(text: str) -> frozenset[str]:
+    """Content fingerprint for near-duplicate detection: the set of distinct non-blank lines."""
+    lines = set(map(str.strip, text.splitlines()))
+    lines.discard("")
+    return frozenset(lines)
+
+
+def _near_duplicate_pairs(fingerprints: dict[str, frozenset[str]]) -> list[tuple[str, str, float]]:
+    """(a, b, similarity) for file pairs whose line sets overlap by at least the threshold.
+
+    Each file is sketched by its first few lines in sorted order; files
+    sharing a sketch line are candidates, and only those pairs get an exact
+    Jaccard comparison, so unrelated files are never compared. Boilerplate
+    lines found in many files (fences, common headings) are left out of
+    sketches, as they would make every file a candidate of every other.
+    """
+    frequency = collections.Counter(itertools.chain.from_iterable(fingerprints.values()))
+    limit = max(DUPLICATE_COMMON_FILES, len(fingerprints) // 50)
+    common = {line for line, count in frequency.items() if count > limit}
+
+    buckets: dict[str, list[str]] = {}
+    for rel, lines in fingerprints.items():
+        for line in heapq.nsmallest(DUPLICATE_SKETCH_SIZE, lines - common):
+            buckets.setdefault(line, []).append(rel)
+
+    candidates = set()
+    for files in buckets.values():
+        for i, a in enumerate(files):
+            for b in files[i + 1:]:
+                candidates.add((a, b) if a < b else (b, a))
+
+    pairs = []
+    for a, b in sorted(candidates):
+        left, right = fingerprints[a], fingerprints[b]
+        # Jaccard can't reach the threshold when the sizes differ too much.
+        if min(len(left), len(right)) < NEAR_DUPLICATE_THRESHOLD * max(len(left), len(right)):
+            continue
+        similarity = len(left & right) / len(left | right)
+        if similarity >= NEAR_DUPLICATE_THRESHOLD:
+            pairs.append((a, b, similarity))
+    return pairs
+
+
+def check_duplicates(plugin_dir: Path, verbose: bool = False,
+                     index: PluginIndex | None = None) -> ValidationResult:
+    """Report SKILL.md and reference files that are copies or near-copies of each other.
+
+    Plugins are installed independently, so only duplicates within one plugin
+    can be shared (one file in a shared references/ directory, symlinked from
+    each skill). Identical files are grouped by content hash; near-identical
+    ones are matched on shared lines.
+    """
+    result = ValidationResult("duplicates")
+    index = index or PluginIndex(plugin_dir)
+
+    by_digest: dict[str, list[str]] = {}
+    texts: dict[str, str] = {}
+    for path, rel in _duplicate_sources(index):
+        text = index.read_text(path)
+        if text.strip():
+            texts[rel] = text
+            by_digest.setdefault(content_digest(text.encode("utf-8")), []).append(rel)
+
+    # Findings depend only on which content sits at which path: cache on that listing.
+    listing = "\n".join(f"{rel}:{digest}" for digest, copies in by_digest.items() for rel in copies)
+    _add_cached_file_issues(
+        result, ("plugin", TOKEN_METHOD, str(verbose)), listing,
+        lambda sub: _report_duplicates(sub, texts, by_digest, verbose),
+    )
+    return result
+
+
+def _report_duplicates(result: ValidationResult, texts: dict[str, str], by_digest: dict[str, list[str]],
+                       verbose: bool) -> None:
+    groups = [copies for copies in by_digest.values() if len(copies) > 1]
+    group_tokens = TOKEN_COUNTER.count_many([texts[copies[0]] for copies in groups])
+    duplicated = 0
+    for copies, tokens in zip(groups, group_tokens):
+        wasted = tokens * (len(copies) - 1)
+        duplicated += wasted
+        result.may(
+            f"Identical content in {len(copies)} files ({wasted} duplicated tokens)",
+            file=copies[0],
+            source=", ".join(copies[1:]),
+            suggestion="Keep one copy in a shared references/ directory and symlink the others to it",
+            copies=copies,
+            duplicated_tokens=wasted,
+        )
+
+    # One representative per identical group; smaller files are left out.
+    fingerprints = {}
+    for copies in by_digest.values():
+        lines = _distinct_lines(texts[copies[0]])
+        if len(lines) >= NEAR_DUPLICATE_MIN_LINES:
+            fingerprints[copies[0]] = lines
+    for a, b, similarity in _near_duplicate_pairs(fingerprints):
+        result.may(
+            f"Near-duplicate of {b} ({similarity:.0%} of lines shared)",
+            file=a,
+            suggestion="Merge the differences into one file and share it, or trim the repeated sections",
+            similar_to=b,
+            similarity=round(similarity, 3),
+        )
+
+    if verbose:
+        result.ok(f"Compared {len(texts)} skill and reference files "
+                  f"({len(groups)} identical groups, {duplicated} duplicated tokens)")
+
+
 # =============================================================================
 # Output Formatting
 # =============================================================================
@@ -1700,21 +2673,518 @@ CHECKS = {
     "frontmatter": check_frontmatter,
     "tools": check_tool_invocations,
     "tokens": check_tokens,
+    "duplicates": check_duplicates,
 }
 
-CHECK_ORDER = ["structure", "manifest", "frontmatter", "tools", "tokens"]
+CHECK_ORDER = ["structure", "manifest", "frontmatter", "tools", "tokens", "duplicates"]
+
+# Checks that scope themselves to changed files/skills under --changed-since.
+# The others depend on the plugin layout as a whole and re-run whenever
+# anything in the plugin changed.
+UNIT_SCOPED_CHECKS = {"frontmatter", "tools", "tokens"}
+
+
+def _add_check_issues(result: ValidationResult, check_name: str, plugin_dir: Path, verbose: bool,
+                      index: PluginIndex) -> None:
+    """Run a plugin-wide check and record its issues on `result`."""
+    for issue in CHECKS[check_name](plugin_dir, verbose, index).issues:
+        result.add_issue(issue)
 
 
-def run_all_checks(plugin_dir: Path, checks: list[str], verbose: bool = False) -> list[ValidationResult]:
-    """Run specified validation checks in order."""
+def run_all_checks(plugin_dir: Path, checks: list[str], verbose: bool = False,
+                   index: PluginIndex | None = None,
+                   stream: NdjsonStream | None = None) -> list[ValidationResult]:
+    """Run specified validation checks in order over one shared PluginIndex.
+
+    With `stream`, each check's issues are written as they are found and the
+    returned results carry counts only.
+    """
+    global _METRICS
+    index = index or PluginIndex(plugin_dir)
     results = []
     for check_name in CHECK_ORDER:
-        if check_name in checks:
-            result = CHECKS[check_name](plugin_dir, verbose)
-            results.append(result)
+        if check_name not in checks:
+            continue
+        metrics = _METRICS = CheckMetrics()
+        sink = functools.partial(stream.issue, plugin_dir) if stream is not None else None
+        started = time.perf_counter()
+        try:
+            if check_name in UNIT_SCOPED_CHECKS:
+                result = CHECKS[check_name](plugin_dir, verbose, index, sink)
+            else:
+                result = ValidationResult(check_name, sink)
+                _add_unit_issues(
+                    result, index, ".", index.changed is None or bool(index.changed),
+                    functools.partial(_add_check_issues, check_name=check_name, plugin_dir=plugin_dir,
+                                      verbose=verbose, index=index),
+                    verbose,
+                )
+        finally:
+            _METRICS = None
+        metrics.elapsed = metrics.span(f"{plugin_dir.name}:{check_name}", "check", started,
+                                       plugin=str(plugin_dir))
+        result.metrics = metrics
+        results.append(result)
+        if stream is not None:
+            stream.check(plugin_dir, result)
+    flush_cache()
     return results
 
 
+def git_changed_paths(path: Path, rev: str) -> set[Path] | None:
+    """Absolute paths changed in the working tree since `rev` (staged, unstaged, untracked).
+
+    Returns None when the change can't be scoped to individual plugins (a
+    marketplace.json changed), meaning everything must be validated.
+    Raises ValueError if `path` is not in a git work tree or `rev` is unknown.
+    """
+    import subprocess
+
+    def git(*args: str) -> str:
+        proc = subprocess.run(["git", "-C", str(path), *args], capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise ValueError(proc.stderr.strip() or f"git {args[0]} failed")
+        return proc.stdout
+
+    toplevel = Path(git("rev-parse", "--show-toplevel").strip()).resolve()
+    names = git("diff", "--name-only", "--no-renames", "-z", rev, "--").split("\0")
+    # ls-files is scoped to `path`; --full-name keeps its output toplevel-relative like diff's.
+    names += git("ls-files", "--others", "--exclude-standard", "--full-name", "-z").split("\0")
+
+    changed = set()
+    for name in filter(None, names):
+        if name.endswith(".claude-plugin/marketplace.json"):
+            return None
+        changed.add(toplevel / name)
+    return changed
+
+
+def exit_code_for(results: list[ValidationResult]) -> int:
+    """Map check results to the documented exit codes (0 passed, 1 MUST, 2 critical)."""
+    if any(r.check == "tokens" and not r.passed for r in results):
+        return 2
+    if any(not r.passed for r in results):
+        return 1
+    return 0
+
+
+# =============================================================================
+# Marketplace Mode
+# =============================================================================
+
+def find_marketplace_plugins(marketplace_root: Path) -> list[Path]:
+    """Resolve the local plugin directories listed in .claude-plugin/marketplace.json.
+
+    Entries whose `source` is not a relative path (e.g. a github source object)
+    are not on disk and are skipped.
+    """
+    manifest = marketplace_root / ".claude-plugin" / "marketplace.json"
+    data = json.loads(manifest.read_text())
+    plugin_dirs = []
+    for entry in data.get("plugins", []):
+        source = entry.get("source")
+        if isinstance(source, str):
+            plugin_dirs.append((marketplace_root / source).resolve())
+    return plugin_dirs
+
+
+def _run_plugin_task(plugin_dir: Path, checks: list[str], verbose: bool,
+                     changed: set[Path] | None = None,
+                     stream: NdjsonStream | None = None) -> list[ValidationResult]:
+    """Process-pool entry point: run all requested checks against one plugin."""
+    return run_all_checks(plugin_dir, checks, verbose, PluginIndex(plugin_dir, changed), stream)
+
+
+def iter_marketplace_checks(plugin_dirs: list[Path], checks: list[str], verbose: bool = False,
+                            jobs: int | None = None, changed: set[Path] | None = None,
+                            stream: NdjsonStream | None = None):
+    """Yield (plugin_dir, results) in marketplace order as each plugin finishes.
+
+    Each task validates one plugin over a single PluginIndex, so a plugin tree
+    is walked and read once no matter how many checks run against it. Results
+    are identical to running each plugin on its own. `jobs=1` runs serially
+    in-process.
+
+    With `stream`, serial runs write issues as they are found; pool workers
+    return a plugin's issues whole and they are written when it completes, so
+    memory stays bounded by the largest plugin either way.
+    """
+    if jobs == 1 or len(plugin_dirs) <= 1:
+        for plugin_dir in plugin_dirs:
+            yield plugin_dir, _run_plugin_task(plugin_dir, checks, verbose, changed, stream)
+        return
+
+    outcomes = _pool_map(_run_plugin_task, plugin_dirs, jobs, checks, verbose, changed)
+    for plugin_dir, results in zip(plugin_dirs, outcomes):
+        if stream is not None:
+            stream.replay(plugin_dir, results)
+        yield plugin_dir, results
+
+
+def _pool_map(task, plugin_dirs: list[Path], jobs: int | None, *args):
+    """Yield `task(plugin_dir, *args)` for every plugin, in order, from a process pool."""
+    # Imported here: it pulls in multiprocessing, a large share of startup.
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_dir = _CACHE.path.parent if _CACHE is not None else None
+    with ProcessPoolExecutor(max_workers=jobs, initializer=configure_cache,
+                             initargs=(cache_dir,)) as pool:
+        yield from pool.map(task, plugin_dirs, *[[arg] * len(plugin_dirs) for arg in args])
+
+
+def run_marketplace_checks(plugin_dirs: list[Path], checks: list[str], verbose: bool = False,
+                           jobs: int | None = None,
+                           changed: set[Path] | None = None) -> dict[Path, list[ValidationResult]]:
+    """Run checks for every plugin, fanning plugins across a process pool (see iter_marketplace_checks)."""
+    return dict(iter_marketplace_checks(plugin_dirs, checks, verbose, jobs, changed))
+
+
+# =============================================================================
+# Token Budget Report
+# =============================================================================
+
+TOKEN_REPORT_TOP = 10  # Default --top: offenders listed per level
+
+
+def startup_skill_dirs(index: PluginIndex) -> list[Path]:
+    """Skills whose metadata is loaded at startup, including a router skill at skills/SKILL.md."""
+    skills = sorted(index.skill_dirs)
+    skills_dir = index.plugin_dir / "skills"
+    if index.is_file(skills_dir / "SKILL.md"):
+        skills.insert(0, skills_dir)
+    return skills
+
+
+def _token_budget_task(plugin_dir: Path) -> list[tuple[str, int, int, int]]:
+    """Process-pool entry point: (skill, level 1, level 2, level 3 tokens) for every skill of one plugin."""
+    index = PluginIndex(plugin_dir)
+    skills = startup_skill_dirs(index)
+    collected: dict[Path, list[tuple[str, str, str]]] = {}
+    _prime_skill_token_counts(skills, index, collected)
+    budgets = []
+    for skill_dir in skills:
+        analysis = _analyze_skill_tokens(skill_dir, index, collected[skill_dir])
+        budgets.append((
+            get_relative_path(skill_dir, plugin_dir),
+            analysis["metadata_tokens"],
+            analysis["skill_tokens"],
+            analysis["reference_tokens"] + analysis.get("script_tokens", 0),
+        ))
+    flush_cache()
+    return budgets
+
+
+class TokenBudgetReport:
+    """Token cost of every skill across plugins, aggregated in one pass.
+
+    Level 1 (name + description) is summed because every installed skill pays
+    it at startup; levels 2 and 3 are summarized as distributions. Only the
+    `top` largest skills per level are retained by name.
+    """
+
+    LEVELS = ("level1", "level2", "level3")
+
+    def __init__(self, top: int = TOKEN_REPORT_TOP):
+        self.top = top
+        self.plugins: dict[str, dict[str, int]] = {}
+        self.values: dict[str, list[int]] = {level: [] for level in self.LEVELS}
+        self.worst: dict[str, list[tuple[int, str, str]]] = {level: [] for level in self.LEVELS}
+
+    def add_plugin(self, plugin: str, budgets: list[tuple[str, int, int, int]]) -> None:
+        """Fold in one plugin's (skill, level 1, level 2, level 3) budgets."""
+        self.plugins[plugin] = {"skills": 0, "level1": 0}
+        for skill, *tokens in budgets:
+            self.add(plugin, skill, *tokens)
+
+    def add(self, plugin: str, skill: str, *tokens: int) -> None:
+        totals = self.plugins.setdefault(plugin, {"skills": 0, "level1": 0})
+        totals["skills"] += 1
+        totals["level1"] += tokens[0]
+        for level, count in zip(self.LEVELS, tokens):
+            self.values[level].append(count)
+            entry = (count, plugin, skill)
+            if len(self.worst[level]) < self.top:
+                heapq.heappush(self.worst[level], entry)
+            elif entry > self.worst[level][0]:
+                heapq.heapreplace(self.worst[level], entry)
+
+    @staticmethod
+    def _distribution(values: list[int]) -> dict:
+        ordered = sorted(values)
+        if not ordered:
+            return {"total": 0, "mean": 0, "min": 0, "p50": 0, "p90": 0, "p99": 0, "max": 0}
+
+        def rank(p: int) -> int:
+            # Nearest-rank percentile.
+            return ordered[max(0, -(-p * len(ordered) // 100) - 1)]
+
+        return {
+            "total": sum(ordered),
+            "mean": round(sum(ordered) / len(ordered), 1),
+            "min": ordered[0],
+            "p50": rank(50),
+            "p90": rank(90),
+            "p99": rank(99),
+            "max": ordered[-1],
+        }
+
+    def to_json(self) -> dict:
+        return {
+            "token_method": TOKEN_METHOD,
+            "plugins": len(self.plugins),
+            "skills": len(self.values["level1"]),
+            "by_plugin": [{"plugin": plugin, **totals} for plugin, totals in self.plugins.items()],
+            **{level: {
+                **self._distribution(self.values[level]),
+                "worst": [{"plugin": plugin, "skill": skill, "tokens": count}
+                          for count, plugin, skill in sorted(self.worst[level], reverse=True)],
+            } for level in self.LEVELS},
+        }
+
+
+def build_token_report(plugin_dirs: list[Path], jobs: int | None = None,
+                       top: int = TOKEN_REPORT_TOP) -> TokenBudgetReport:
+    """Aggregate every plugin's skill token budgets, plugins fanned across a process pool."""
+    if jobs == 1 or len(plugin_dirs) <= 1:
+        budgets = (_token_budget_task(plugin_dir) for plugin_dir in plugin_dirs)
+    else:
+        budgets = _pool_map(_token_budget_task, plugin_dirs, jobs)
+    report = TokenBudgetReport(top)
+    for plugin_dir, skills in zip(plugin_dirs, budgets):
+        report.add_plugin(plugin_dir.name, skills)
+    return report
+
+
+# =============================================================================
+# Watch Mode
+# =============================================================================
+
+# Directories never worth watching or validating.
+WATCH_SKIP_DIRS = {".git", "__pycache__", "node_modules"}
+WATCH_DEBOUNCE = 0.05       # seconds of quiet that close a burst of events
+WATCH_POLL_INTERVAL = 0.5   # seconds between polling snapshots
+
+
+class PollingWatcher:
+    """Portable watcher: diffs (mtime, size) snapshots of the plugin tree."""
+
+    def __init__(self, root: Path, interval: float = WATCH_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_SKIP_DIRS]
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until something changed (or `timeout` passed); return changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._snapshot.keys()
+                       if current.get(p) != self._snapshot.get(p)}
+            self._snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher, bound through ctypes so no extra package is needed.
+
+    One watch per directory; directories created later are added as they
+    appear. A queue overflow reports the root itself, meaning "rescan all".
+    """
+
+    _IN_MODIFY, _IN_ATTRIB, _IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    _IN_MOVED_FROM, _IN_MOVED_TO, _IN_CREATE, _IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    _IN_DELETE_SELF, _IN_MOVE_SELF = 0x400, 0x800
+    _IN_Q_OVERFLOW, _IN_IGNORED, _IN_ISDIR = 0x4000, 0x8000, 0x40000000
+    _IN_NONBLOCK, _IN_CLOEXEC = 0o4000, 0o2000000
+    _MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+             | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF)
+
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, top: Path) -> list[Path]:
+        """Watch `top` and every directory below it; return the files found."""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_SKIP_DIRS]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self._MASK)
+            if wd >= 0:
+                self._paths[wd] = Path(dirpath)
+            files.extend(Path(dirpath) / name for name in filenames)
+        return files
+
+    def _drain(self, changed: set[Path]) -> None:
+        import struct
+
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+                offset += 16
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self._IN_Q_OVERFLOW:
+                    changed.add(self.root)
+                    continue
+                if mask & self._IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                directory = self._paths.get(wd)
+                if directory is None:
+                    continue
+                path = directory / os.fsdecode(name) if name else directory
+                if path.name in WATCH_SKIP_DIRS:
+                    continue
+                changed.add(path)
+                if mask & self._IN_ISDIR and mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    changed.update(self._add_tree(path))
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until something changed (or `timeout` passed); return changed paths."""
+        import select
+
+        changed: set[Path] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        # Editors save in bursts (write, rename, chmod); collect until quiet.
+        while ready:
+            self._drain(changed)
+            ready, _, _ = select.select([self._fd], [], [], WATCH_DEBOUNCE)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def make_watcher(root: Path):
+    """inotify where available, polling otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+
+def _issue_identity(issue: Issue) -> tuple:
+    return (issue.check, issue.severity, issue.message, issue.file, issue.line,
+            issue.source, issue.suggestion)
+
+
+class WatchSession:
+    """Re-validates one plugin on change, keeping the index and per-file results warm.
+
+    Each run re-checks only the units touched by the changed paths (see
+    --changed-since) and returns NDJSON-ready events: `added` / `removed`
+    for issues that appeared or went away, then one `summary`.
+    """
+
+    def __init__(self, plugin_dir: Path, checks: list[str], verbose: bool = False):
+        self.plugin_dir = plugin_dir
+        self.checks = checks
+        self.verbose = verbose
+        # Per-unit findings replayed for units a change did not touch (works with --no-cache too).
+        self.findings: dict[str, list[dict]] = {}
+        self.index = PluginIndex(plugin_dir, findings=self.findings)
+        self.issues: dict[tuple, list[Issue]] = {}
+        self.results: list[ValidationResult] = []
+
+    def run(self, changed: set[Path] | None = None) -> list[dict]:
+        started = time.perf_counter()
+        if changed is not None:
+            if self.plugin_dir in changed:
+                self.index = PluginIndex(self.plugin_dir, findings=self.findings)
+            else:
+                self.index.refresh(changed)
+        self.results = run_all_checks(self.plugin_dir, self.checks, self.verbose, self.index)
+
+        current: dict[tuple, list[Issue]] = {}
+        for result in self.results:
+            for issue in result.issues:
+                if issue.severity == "ok":
+                    continue
+                # Untouched units are replayed, but in watch mode they are known current.
+                issue.stale = False
+                current.setdefault(_issue_identity(issue), []).append(issue)
+
+        events = []
+        for key, issues in self.issues.items():
+            for issue in issues[len(current.get(key, [])):]:
+                events.append({"event": "removed", **_issue_json(issue)})
+        for key, issues in current.items():
+            for issue in issues[len(self.issues.get(key, [])):]:
+                events.append({"event": "added", **_issue_json(issue)})
+        self.issues = current
+
+        counts = {"must": 0, "should": 0, "may": 0}
+        for issues in current.values():
+            for issue in issues:
+                counts[issue.severity] += 1
+        events.append({
+            "event": "summary",
+            "plugin": str(self.plugin_dir),
+            "changed": sorted(get_relative_path(p, self.plugin_dir) for p in changed or ()),
+            **counts,
+            "passed": counts["must"] == 0,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        return events
+
+
+def watch_plugin(plugin_dir: Path, checks: list[str], verbose: bool = False) -> None:
+    """Validate once, then re-validate on every change, streaming NDJSON events to stdout."""
+    session = WatchSession(plugin_dir, checks, verbose)
+    watcher = make_watcher(plugin_dir)
+
+    def emit(events: list[dict]) -> None:
+        for event in events:
+            print(json.dumps(event, default=str), flush=True)
+
+    emit([{"event": "watching", "plugin": str(plugin_dir), "watcher": type(watcher).__name__}])
+    emit(session.run())
+    try:
+        while True:
+            changed = watcher.wait()
+            if changed:
+                emit(session.run(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
 # ANSI severity styling (only emitted when stdout is a TTY)
 _SEVERITY_STYLE = {
     "must":   "\033[1;31m",  # bold red
@@ -1738,7 +3208,8 @@ def _format_location(issue: Issue) -> str:
     return f"{issue.file}:{issue.line}" if issue.line else issue.file
 
 
-def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bool = False):
+def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bool = False,
+                  index: PluginIndex | None = None):
     """Render validation results in compiler-diagnostic style.
 
     Layout: `path:line  severity  message`, with optional indented `> source`
@@ -1752,7 +3223,7 @@ def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bo
         for issue in result.issues:
             bucket[issue.severity].append(issue)
 
-    components = find_components(plugin_dir)
+    components = find_components(plugin_dir, index)
     comp_parts = [f"commands={len(components['commands'])}",
                   f"agents={len(components['agents'])}",
                   f"skills={len(components['skills'])}"]
@@ -1788,7 +3259,8 @@ def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bo
 
             sev_label = _color(issue.severity.ljust(max_sev), issue.severity, color)
             loc_padded = loc.ljust(max_loc) if len(loc) <= max_loc else loc
-            print(f"  {loc_padded}  {sev_label}  {issue.message}")
+            stale_mark = "  (stale)" if issue.stale else ""
+            print(f"  {loc_padded}  {sev_label}  {issue.message}{stale_mark}")
 
             indent = " " * (2 + max_loc + 2 + max_sev + 2)
             if issue.source:
@@ -1822,6 +3294,10 @@ def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bo
                 line = f"{line}  ({loc})" if loc else line
             print(f"  {mark} {line}")
 
+    stale = sum(1 for issue in diagnostics if issue.stale)
+    if stale:
+        print(f"\n{stale} stale finding(s) replayed from the last run for unchanged files")
+
     counts = [(len(bucket[s]), s) for s in ("must", "should", "may") if bucket[s]]
     print()
     if not counts:
@@ -1834,8 +3310,24 @@ def print_results(results: list[ValidationResult], plugin_dir: Path, verbose: bo
         print(_color("PASSED", "should", color) + f"  {parts}")
 
 
-def output_json(results: list[ValidationResult], plugin_dir: Path):
-    """Output results as JSON."""
+def _issue_json(issue: Issue) -> dict:
+    """JSON form of one issue, shared by the report, marketplace and watch output."""
+    output = {
+        "severity": issue.severity,
+        "message": issue.message,
+        "file": issue.file,
+        "line": issue.line,
+        "source": issue.source,
+        "suggestion": issue.suggestion,
+        "details": issue.details if issue.details else None
+    }
+    if issue.stale:
+        output["stale"] = True
+    return output
+
+
+def _json_payload(results: list[ValidationResult], plugin_dir: Path) -> dict:
+    """Build the JSON report for one plugin."""
     output = {
         "plugin": str(plugin_dir),
         "results": [],
@@ -1848,24 +3340,174 @@ def output_json(results: list[ValidationResult], plugin_dir: Path):
             "passed": result.passed,
             "issues": []
         }
+        if result.metrics is not None:
+            check_output["stats"] = result.metrics.to_json()
         for i in result.issues:
             if i.severity == "ok":
                 continue
-            check_output["issues"].append({
-                "severity": i.severity,
-                "message": i.message,
-                "file": i.file,
-                "line": i.line,
-                "source": i.source,
-                "suggestion": i.suggestion,
-                "details": i.details if i.details else None
-            })
+            check_output["issues"].append(_issue_json(i))
             output["summary"][i.severity] = output["summary"].get(i.severity, 0) + 1
             if i.severity == "must":
                 output["summary"]["passed"] = False
 
         output["results"].append(check_output)
 
+    metrics = [r.metrics for r in results if r.metrics is not None]
+    if metrics:
+        output["stats"] = CheckMetrics.total(metrics).to_json()
+    return output
+
+
+def write_trace(all_results: list[list[ValidationResult]], path: Path) -> None:
+    """Write every check's spans as a Chrome trace-event file (chrome://tracing, Perfetto)."""
+    events = [event for results in all_results for r in results if r.metrics is not None
+              for event in r.metrics.events]
+    origin = min((event["ts"] for event in events), default=0)
+    for event in events:
+        event["ts"] = round(event["ts"] - origin, 1)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n")
+
+
+def print_startup_profile() -> None:
+    """Print --startup-profile timings (this process only) to stderr."""
+    total = time.perf_counter() - _MODULE_START
+    parts = [f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in STARTUP_TIMINGS.items()]
+    if "encoder" not in STARTUP_TIMINGS:
+        parts.append("encoder=not loaded")
+    print(f"startup-profile: {' '.join(parts)} total={total * 1000:.1f}ms", file=sys.stderr)
+
+
+class NdjsonStream:
+    """--ndjson output: one JSON record per line, flushed as soon as it is known.
+
+    Records are `issue` (as in --json, plus plugin and check), `check` (pass
+    state, counts and stats once a check finishes), `plugin` (marketplace mode,
+    once a plugin finishes) and a final `summary`.
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.totals = {"must": 0, "should": 0, "may": 0}
+        self.plugins = 0
+        self.failed = 0
+        self.exit_code = 0
+
+    def _write(self, record: dict) -> None:
+        self.out.write(json.dumps(record, default=str) + "\n")
+        self.out.flush()
+
+    def issue(self, plugin_dir: Path, issue: Issue) -> None:
+        self._write({"event": "issue", "plugin": str(plugin_dir), "check": issue.check, **_issue_json(issue)})
+
+    def check(self, plugin_dir: Path, result: ValidationResult) -> None:
+        counts = {severity: result.counts[severity] for severity in self.totals}
+        for severity, count in counts.items():
+            self.totals[severity] += count
+        record = {"event": "check", "plugin": str(plugin_dir), "check": result.check,
+                  "passed": result.passed, **counts}
+        if result.metrics is not None:
+            record["stats"] = result.metrics.to_json()
+        self._write(record)
+
+    def replay(self, plugin_dir: Path, results: list[ValidationResult]) -> None:
+        """Write the issues and check records of a plugin validated elsewhere (a pool worker)."""
+        for result in results:
+            for issue in result.issues:
+                if issue.severity != "ok":
+                    self.issue(plugin_dir, issue)
+            self.check(plugin_dir, result)
+
+    def plugin(self, plugin_dir: Path, results: list[ValidationResult]) -> None:
+        exit_code = exit_code_for(results)
+        self.plugins += 1
+        self.failed += bool(exit_code)
+        self.exit_code = max(self.exit_code, exit_code)
+        self._write({"event": "plugin", "plugin": str(plugin_dir), "exit_code": exit_code,
+                     "passed": all(r.passed for r in results)})
+
+    def summary(self, **fields) -> None:
+        self._write({"event": "summary", **fields, **self.totals,
+                     "passed": self.totals["must"] == 0, "exit_code": self.exit_code})
+
+
+def output_json(results: list[ValidationResult], plugin_dir: Path):
+    """Output results as JSON."""
+    print(json.dumps(_json_payload(results, plugin_dir), indent=2, default=str))
+
+
+def print_marketplace_results(by_plugin: dict[Path, list[ValidationResult]], marketplace_root: Path,
+                              verbose: bool = False):
+    """Render each plugin's report, then one marketplace-wide summary line."""
+    color = sys.stdout.isatty()
+    failed = []
+    for index, (plugin_dir, results) in enumerate(by_plugin.items()):
+        if index:
+            print()
+        print_results(results, plugin_dir, verbose)
+        if exit_code_for(results):
+            failed.append(plugin_dir.name)
+
+    print()
+    total = len(by_plugin)
+    if failed:
+        print(_color("FAILED", "must", color) + f"  {len(failed)}/{total} plugins: {', '.join(failed)}")
+    else:
+        print(_color("PASSED", "ok", color) + f"  {total} plugins")
+
+
+def print_token_report(report: TokenBudgetReport, target: Path):
+    """Render the token budget report: Level 1 total and offenders, Level 2/3 distributions."""
+    data = report.to_json()
+    print(f"{target}  (plugins={data['plugins']}, skills={data['skills']}, method={data['token_method']})")
+
+    titles = {
+        "level1": "Level 1  metadata, loaded at startup for every skill",
+        "level2": "Level 2  SKILL.md body, loaded when triggered",
+        "level3": "Level 3  references + scripts, loaded as needed",
+    }
+    for level, title in titles.items():
+        dist = data[level]
+        print()
+        print(title)
+        if level == "level1":
+            print(f"  total {dist['total']:,} tokens  (mean {dist['mean']:,} per skill)")
+        print("  " + "  ".join(f"{key} {dist[key]:,}" for key in ("min", "p50", "p90", "p99", "max")))
+        for entry in dist["worst"]:
+            print(f"  {entry['tokens']:>8,}  {entry['plugin']}/{entry['skill']}")
+
+    if data["plugins"] > 1:
+        print()
+        print("Level 1 by plugin")
+        by_plugin = sorted(data["by_plugin"], key=lambda p: p["level1"], reverse=True)
+        for entry in by_plugin[:report.top]:
+            print(f"  {entry['level1']:>8,}  {entry['plugin']} ({entry['skills']} skills)")
+
+
+def output_token_report(report: TokenBudgetReport, target: Path, as_json: bool = False):
+    if as_json:
+        print(json.dumps({"target": str(target), **report.to_json()}, indent=2))
+    else:
+        print_token_report(report, target)
+
+
+def output_marketplace_json(by_plugin: dict[Path, list[ValidationResult]], marketplace_root: Path):
+    """Output every plugin's JSON report plus aggregated counts."""
+    output = {
+        "marketplace": str(marketplace_root),
+        "plugins": [],
+        "summary": {"plugins": len(by_plugin), "failed": 0, "must": 0, "should": 0, "may": 0,
+                    "passed": True},
+    }
+    for plugin_dir, results in by_plugin.items():
+        payload = _json_payload(results, plugin_dir)
+        payload["exit_code"] = exit_code_for(results)
+        output["plugins"].append(payload)
+        for severity in ("must", "should", "may"):
+            output["summary"][severity] += payload["summary"][severity]
+        if payload["exit_code"]:
+            output["summary"]["failed"] += 1
+            output["summary"]["passed"] = False
+
     print(json.dumps(output, indent=2, default=str))
 
 
@@ -1875,24 +3517,61 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__
     )
-    parser.add_argument("plugin_path", help="Path to plugin directory")
+    parser.add_argument(
+        "plugin_path", nargs="?",
+        help="Path to plugin directory (with --marketplace: repository root, default '.')"
+    )
     parser.add_argument(
         "--check",
-        help="Comma-separated checks (structure,manifest,frontmatter,tools,tokens) or 'all'",
+        help="Comma-separated checks (structure,manifest,frontmatter,tools,tokens,duplicates) or 'all'",
         default="all"
     )
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help="Stream issues as newline-delimited JSON while checks run, then a summary record"
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    parser.add_argument(
+        "--marketplace", action="store_true",
+        help="Validate every plugin listed in .claude-plugin/marketplace.json"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="Worker processes for --marketplace (default: CPU count, 1 = serial)"
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REV", default=None,
+        help="Only re-check files changed since git REV; replay last findings for the rest"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Stay running: re-validate on file changes and stream issue diffs as NDJSON"
+    )
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="Print import, cache, encoder and check timings to stderr"
+    )
+    parser.add_argument(
+        "--token-report", action="store_true",
+        help="Instead of checks, report skill token budgets (Level 1 total, worst offenders, Level 2/3 distributions)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=TOKEN_REPORT_TOP,
+        help=f"Offenders listed per level in --token-report (default {TOKEN_REPORT_TOP})"
+    )
+    parser.add_argument(
+        "--trace", type=Path, metavar="OUT.json", default=None,
+        help="Write per-check, per-file and tokenizer spans as a Chrome trace-event file"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None,
+        help="Result cache directory (default: $XDG_CACHE_HOME/plugin-optimizer)"
+    )
 
     args = parser.parse_args()
-
-    plugin_dir = Path(args.plugin_path).resolve()
-    if not plugin_dir.exists():
-        print(f"Error: Plugin directory not found: {plugin_dir}")
-        sys.exit(1)
-    if not plugin_dir.is_dir():
-        print(f"Error: Path is not a directory: {plugin_dir}")
-        sys.exit(1)
+    configure_cache(None if args.no_cache else (args.cache_dir or default_cache_dir()))
 
     if args.check == "all":
         checks = CHECK_ORDER
@@ -1904,24 +3583,107 @@ def main():
             print(f"Available: {', '.join(CHECK_ORDER)}")
             sys.exit(1)
 
-    results = run_all_checks(plugin_dir, checks, args.verbose)
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
 
-    if args.json:
-        output_json(results, plugin_dir)
-    else:
-        print_results(results, plugin_dir, args.verbose)
+    if args.top < 1:
+        print("Error: --top must be at least 1")
+        sys.exit(1)
+
+    if args.watch and (args.marketplace or args.changed_since):
+        parser.error("--watch validates one plugin; it cannot be combined with --marketplace or --changed-since")
+    if args.ndjson and (args.json or args.watch):
+        parser.error("--ndjson cannot be combined with --json or --watch")
+    if args.token_report and (args.watch or args.ndjson or args.changed_since):
+        parser.error("--token-report cannot be combined with --watch, --ndjson or --changed-since")
+
+    changed = None
+    if args.changed_since:
+        try:
+            changed = git_changed_paths(Path(args.plugin_path or "."), args.changed_since)
+        except (OSError, ValueError) as e:
+            print(f"Error: --changed-since {args.changed_since}: {e}")
+            sys.exit(1)
+
+    if args.marketplace:
+        marketplace_root = Path(args.plugin_path or ".").resolve()
+        if not (marketplace_root / ".claude-plugin" / "marketplace.json").is_file():
+            print(f"Error: marketplace.json not found in {marketplace_root / '.claude-plugin'}")
+            sys.exit(1)
+        plugin_dirs = find_marketplace_plugins(marketplace_root)
+        if args.token_report:
+            output_token_report(build_token_report(plugin_dirs, args.jobs, args.top), marketplace_root, args.json)
+            sys.exit(0)
+        started = time.perf_counter()
+        if args.ndjson:
+            stream = NdjsonStream()
+            traced = []
+            for plugin_dir, results in iter_marketplace_checks(plugin_dirs, checks, args.verbose,
+                                                               args.jobs, changed, stream):
+                stream.plugin(plugin_dir, results)
+                if args.trace:
+                    traced.append(results)
+            STARTUP_TIMINGS["checks"] = time.perf_counter() - started
+            stream.summary(marketplace=str(marketplace_root), plugins=stream.plugins, failed=stream.failed)
+            if args.trace:
+                write_trace(traced, args.trace)
+            if args.startup_profile:
+                print_startup_profile()
+            sys.exit(stream.exit_code)
+        by_plugin = run_marketplace_checks(plugin_dirs, checks, args.verbose, args.jobs, changed)
+        STARTUP_TIMINGS["checks"] = time.perf_counter() - started
+        if args.json:
+            output_marketplace_json(by_plugin, marketplace_root)
+        else:
+            print_marketplace_results(by_plugin, marketplace_root, args.verbose)
+        if args.trace:
+            write_trace(list(by_plugin.values()), args.trace)
+        if args.startup_profile:
+            print_startup_profile()
+        sys.exit(max((exit_code_for(results) for results in by_plugin.values()), default=0))
 
-    # Exit codes
-    has_critical = any(r.check == "tokens" and not r.passed for r in results)
-    has_must = any(not r.passed for r in results)
+    if not args.plugin_path:
+        parser.error("plugin_path is required unless --marketplace is given")
 
-    if has_critical:
-        sys.exit(2)
-    elif has_must:
+    plugin_dir = Path(args.plugin_path).resolve()
+    if not plugin_dir.exists():
+        print(f"Error: Plugin directory not found: {plugin_dir}")
         sys.exit(1)
-    else:
+    if not plugin_dir.is_dir():
+        print(f"Error: Path is not a directory: {plugin_dir}")
+        sys.exit(1)
+
+    if args.watch:
+        watch_plugin(plugin_dir, checks, args.verbose)
+        sys.exit(0)
+
+    if args.token_report:
+        output_token_report(build_token_report([plugin_dir], 1, args.top), plugin_dir, args.json)
         sys.exit(0)
 
+    index = PluginIndex(plugin_dir, changed)
+    stream = NdjsonStream() if args.ndjson else None
+    started = time.perf_counter()
+    results = run_all_checks(plugin_dir, checks, args.verbose, index, stream)
+    STARTUP_TIMINGS["checks"] = time.perf_counter() - started
+
+    if stream is not None:
+        stream.exit_code = exit_code_for(results)
+        stream.summary(plugin=str(plugin_dir))
+    elif args.json:
+        output_json(results, plugin_dir)
+    else:
+        print_results(results, plugin_dir, args.verbose, index)
+    if args.trace:
+        write_trace([results], args.trace)
+    if args.startup_profile:
+        print_startup_profile()
+
+    sys.exit(exit_code_for(results))
+
+
+STARTUP_TIMINGS["imports"] = time.perf_counter() - _MODULE_START
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Micro-benchmark: combined tool-invocation scanner vs the per-line scanner.
+
+Runs both over every command/agent/skill file in the marketplace, checks they
+report identical issues, and prints the timings:
+
+    python3 tests/bench_tool_invocations.py [<repo-root>] [--repeat N]
+"""
+import argparse
+import importlib.util
+import re
+import sys
+import time
+from pathlib import Path
+
+
+def _load_validator_module():
+    validator_path = Path(__file__).resolve().parents[1] / "scripts" / "validate-plugin.py"
+    spec = importlib.util.spec_from_file_location("validate_plugin", validator_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["validate_plugin"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def per_line_scan(content: str) -> list[tuple[int, str, str]]:
+    """The previous implementation: three regexes plus a fence regex per line."""
+    core_tools = re.compile(r'(Use|Call|Using) (the )?`?(Read|Write|Glob|Grep|Edit)`? tool', re.IGNORECASE)
+    bash_tool = re.compile(r'(Use|Call|Using) (the )?Bash tool', re.IGNORECASE)
+    task_tool = re.compile(r'(Use|Call) (the )?Task tool to launch [a-z-]+', re.IGNORECASE)
+    fence_start = re.compile(r'^\s*(```+|~~~+)')
+
+    hits = []
+    in_fence = False
+    fence_char = ""
+    fence_len = 0
+    for i, line in enumerate(content.split("\n"), 1):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        fence_match = fence_start.match(stripped)
+        if fence_match:
+            marker = fence_match.group(1)
+            if not in_fence:
+                in_fence, fence_char, fence_len = True, marker[0], len(marker)
+            elif marker[0] == fence_char and len(marker) >= fence_len:
+                in_fence, fence_char, fence_len = False, "", 0
+            continue
+        if in_fence:
+            continue
+        if core_tools.search(line):
+            hits.append((i, "core", stripped))
+        if bash_tool.search(line) and "Bash(" not in line and "!`" not in line:
+            hits.append((i, "bash", stripped))
+        if task_tool.search(line):
+            hits.append((i, "task", stripped))
+    return hits
+
+
+def combined_scan(validator, content: str) -> list[tuple[int, str, str]]:
+    return [(line, kind, source)
+            for line, kinds, source in validator._tool_invocation_hits(content)
+            for kind in ("core", "bash", "task") if kind in kinds]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", nargs="?", default=str(Path(__file__).resolve().parents[2]))
+    parser.add_argument("--repeat", type=int, default=20, help="Passes per scanner; the fastest is reported")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    validator = _load_validator_module()
+    contents = []
+    for plugin_dir in validator.find_marketplace_plugins(Path(args.root).resolve()):
+        components = validator.find_components(plugin_dir)
+        for path in components["commands"] + components["agents"] + components["skills"]:
+            contents.append(path.read_text())
+
+    mismatches = sum(per_line_scan(c) != combined_scan(validator, c) for c in contents)
+    total_bytes = sum(len(c) for c in contents)
+
+    timings = {}
+    for name, scan in (("per-line", per_line_scan),
+                       ("combined", lambda c: combined_scan(validator, c))):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for content in contents:
+                scan(content)
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best
+
+    print(f"{len(contents)} files, {total_bytes / 1024:.0f} KiB, best of {args.repeat} passes")
+    for name, seconds in timings.items():
+        print(f"  {name:9} {seconds * 1000:8.2f} ms/pass  {total_bytes / seconds / 2**20:8.1f} MiB/s")
+    print(f"  speedup   {timings['per-line'] / timings['combined']:8.1f}x")
+    if mismatches:
+        print(f"MISMATCH: {mismatches} file(s) scanned differently")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Benchmark suite for validate-plugin.py and audit-bare-paths.py.
+
+Builds synthetic plugin trees (10, 100 and 1,000 skills, each with references
+and scripts) and times every validator check against them, plus the real
+marketplace in this repository. Each case runs in a fresh process so wall
+time includes startup, and peak RSS comes from that process's rusage.
+
+    python3 tests/bench_validator.py                      # print the table
+    python3 tests/bench_validator.py --save baseline.json # record a baseline
+    python3 tests/bench_validator.py --baseline baseline.json [--threshold 0.25]
+
+With --baseline the exit code is 1 when any case is slower than its baseline
+by more than the threshold (and by more than --min-delta seconds, so
+sub-frame noise on tiny cases does not fail the gate).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+VALIDATOR = SCRIPTS_DIR / "validate-plugin.py"
+AUDIT = SCRIPTS_DIR / "audit-bare-paths.py"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECKS = ["structure", "manifest", "frontmatter", "tools", "tokens", "duplicates"]
+
+SKILL_BODY = """\
+# {title}
+
+Runs the {name} workflow end to end.
+
+## Steps
+
+1. Read the request and list the files involved.
+2. Use the Read tool to inspect each file.
+3. Run `${{CLAUDE_PLUGIN_ROOT}}/skills/{name}/scripts/helper.sh` to collect context.
+4. Summarize the result for the user.
+
+```bash
+python3 scripts/helper.py --check
+```
+
+{filler}
+See [details](references/details.md) and [examples](references/examples.md).
+"""
+
+REFERENCE = """\
+# {title}
+
+{filler}
+
+| Option | Meaning |
+|--------|---------|
+| `--fast` | Skip optional steps |
+| `--dry-run` | Print actions without running them |
+"""
+
+FILLER = ("The workflow validates inputs, records every decision, and reports "
+          "what changed so the user can review it before anything is committed. ")
+
+
+def build_synthetic_plugin(root: Path, skills: int) -> Path:
+    """Create a plugin with `skills` skills, each with two references and two scripts."""
+    plugin = root / f"synthetic-{skills}"
+    (plugin / ".claude-plugin").mkdir(parents=True)
+    (plugin / ".claude-plugin" / "plugin.json").write_text(json.dumps({
+        "name": plugin.name,
+        "version": "1.0.0",
+        "description": f"Synthetic benchmark plugin with {skills} skills",
+        "author": {"name": "Benchmark"},
+        "keywords": ["benchmark"],
+    }, indent=2))
+    (plugin / "README.md").write_text(f"# {plugin.name}\n\nBenchmark fixture.\n")
+
+    for n in range(skills):
+        name = f"skill-{n:04d}"
+        skill_dir = plugin / "skills" / name
+        (skill_dir / "references").mkdir(parents=True)
+        (skill_dir / "scripts").mkdir()
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: Runs the {name} workflow. "
+            f"Use when the user asks to run {name} or check its output.\n---\n\n"
+            + SKILL_BODY.format(title=name.title(), name=name, filler=FILLER * (5 + n % 20))
+        )
+        for ref in ("details", "examples"):
+            (skill_dir / "references" / f"{ref}.md").write_text(
+                REFERENCE.format(title=f"{name} {ref}", filler=FILLER * (10 + n % 30))
+            )
+        (skill_dir / "scripts" / "helper.py").write_text(
+            "import sys\n\n\ndef main():\n    print(sys.argv)\n\n\nif __name__ == '__main__':\n    main()\n"
+        )
+        (skill_dir / "scripts" / "helper.sh").write_text("#!/bin/sh\nset -eu\necho \"$@\"\n")
+    return plugin
+
+
+def count_files(root: Path) -> int:
+    total = 0
+    for _, dirnames, files in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        total += len(files)
+    return total
+
+
+def run_once(argv: list[str]) -> tuple[float, int]:
+    """Wall seconds and peak RSS (KiB) of one child process."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, _, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - started
+    proc.returncode = 0  # reaped by wait4; keep Popen from waiting again
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return elapsed, rss
+
+
+def bench(argv: list[str], repeat: int, warmup: list[str] | None = None) -> tuple[float, int]:
+    """Best wall time and the largest peak RSS over `repeat` runs."""
+    best, peak = float("inf"), 0
+    for _ in range(repeat):
+        if warmup:
+            run_once(warmup)
+        elapsed, rss = run_once(argv)
+        best = min(best, elapsed)
+        peak = max(peak, rss)
+    return best, peak
+
+
+def cases(targets: list[tuple[str, Path, list[str]]], cache_dir: Path):
+    """(case name, argv, warm-up argv or None, tree) for every target and check."""
+    py = sys.executable
+    for label, tree, target_args in targets:
+        for check in CHECKS + ["all"]:
+            yield (f"{label}/validate:{check}",
+                   [py, str(VALIDATOR), *target_args, f"--check={check}", "--no-cache"], None, tree)
+        warm = [py, str(VALIDATOR), *target_args, "--cache-dir", str(cache_dir / label)]
+        yield f"{label}/validate:all-warm-cache", warm, warm, tree
+        yield f"{label}/audit-bare-paths", [py, str(AUDIT), str(tree)], None, tree
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000", help="Synthetic skill counts (comma-separated)")
+    parser.add_argument("--no-repo", action="store_true", help="Skip the real marketplace in this repository")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved JSON result")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline as a fraction (default 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many seconds (default 0.05)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        targets = []
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            plugin = build_synthetic_plugin(tmp / "trees", size)
+            targets.append((f"synthetic-{size}", plugin, [str(plugin)]))
+        if not args.no_repo:
+            targets.append(("repo", REPO_ROOT, [str(REPO_ROOT), "--marketplace", "--jobs=1"]))
+
+        file_counts = {}
+        print(f"{'case':45} {'wall ms':>10} {'files/s':>10} {'peak RSS':>10}")
+        for name, argv, warmup, tree in cases(targets, tmp / "cache"):
+            if tree not in file_counts:
+                file_counts[tree] = count_files(tree)
+            wall, rss = bench(argv, args.repeat, warmup)
+            files = file_counts[tree]
+            results[name] = {"wall_s": wall, "files": files, "files_per_s": files / wall, "peak_rss_kib": rss}
+            print(f"{name:45} {wall * 1000:10.1f} {files / wall:10.0f} {rss / 1024:8.1f}MB")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = []
+        for name, current in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            delta = current["wall_s"] - before["wall_s"]
+            if delta > args.min_delta and current["wall_s"] > before["wall_s"] * (1 + args.threshold):
+                regressions.append(f"{name}: {before['wall_s'] * 1000:.1f} ms -> {current['wall_s'] * 1000:.1f} ms")
+        if regressions:
+            print(f"\nREGRESSION (>{args.threshold:.0%} slower than {args.baseline}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
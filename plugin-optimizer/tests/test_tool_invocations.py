@@ -1,7 +1,10 @@
 import importlib.util
 import json
+import subprocess
+import sys
 import tempfile
 import unittest
+import unittest.mock
 from pathlib import Path
 
 
@@ -10,6 +13,8 @@ def _load_validator_module():
     spec = importlib.util.spec_from_file_location("validate_plugin", validator_path)
     assert spec and spec.loader
     module = importlib.util.module_from_spec(spec)
+    # Registered so process-pool workers can pickle the module's functions.
+    sys.modules["validate_plugin"] = module
     spec.loader.exec_module(module)
     return module
 
@@ -67,6 +72,33 @@ class ToolInvocationCheckTests(unittest.TestCase):
             messages = [i.message for i in result.issues if i.severity == "should"]
             self.assertNotIn("Explicit core tool reference", messages)
 
+    def test_scanner_fences_ordering_and_exclusions(self):
+        content = "\n".join([
+            "Use Bash tool and Use the Read tool.",       # 1: core before bash
+            "  ~~~~",                                      # 2: opens ~ fence
+            "```",                                         # 3: different char, stays inside
+            "Use Read tool",                               # 4: fenced
+            "~~~",                                         # 5: too short to close
+            "~~~~~ Use Read tool",                         # 6: closes; fence line not reported
+            "Call the Task tool to launch code-reviewer",  # 7
+            "Use Bash tool via Bash(git:*)",               # 8: filtered Bash excluded
+            "USE GREP TOOL",                               # 9: case-insensitive
+            "İ Use Edit tool",                             # 10: lower() changes length
+        ])
+        hits = [(line, sorted(kinds)) for line, kinds, _ in self.validator._tool_invocation_hits(content)]
+        self.assertEqual(hits, [(1, ["bash", "core"]), (7, ["task"]), (9, ["core"]), (10, ["core"])])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self._write_min_plugin(root)
+            (root / "skills" / "example").mkdir(parents=True)
+            (root / "skills" / "example" / "SKILL.md").write_text(content, encoding="utf-8")
+            result = self.validator.check_tool_invocations(root)
+            self.assertEqual(
+                [i.message for i in result.issues if i.line == 1],
+                ["Explicit core tool reference", "Explicit Bash tool reference"],
+            )
+
     def test_allows_explicit_askuserquestion_outside_fence(self):
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -176,5 +208,653 @@ class StructureSkillFolderTests(unittest.TestCase):
                 self.assertNotIn("Non-standard skill subdirectory: lark-mail", msg)
 
 
+class MarketplaceModeTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+
+    def _write_marketplace(self, root: Path) -> None:
+        (root / ".claude-plugin").mkdir(parents=True)
+        (root / ".claude-plugin" / "marketplace.json").write_text(
+            json.dumps({
+                "name": "test-marketplace",
+                "plugins": [
+                    {"name": "good", "source": "./good"},
+                    {"name": "bad", "source": "./bad"},
+                    {"name": "remote", "source": {"source": "github", "repo": "o/r"}},
+                ],
+            }),
+            encoding="utf-8",
+        )
+        for name, manifest in (
+            ("good", {"name": "good", "version": "1.0.0", "author": {"name": "A"}}),
+            ("bad", {"name": "bad", "version": "1.0.0"}),
+        ):
+            (root / name / ".claude-plugin").mkdir(parents=True)
+            (root / name / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps(manifest), encoding="utf-8"
+            )
+
+    def test_find_marketplace_plugins_skips_remote_sources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            self._write_marketplace(root)
+
+            plugins = self.validator.find_marketplace_plugins(root)
+            self.assertEqual([p.name for p in plugins], ["good", "bad"])
+
+    def test_parallel_run_matches_serial_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            self._write_marketplace(root)
+            plugins = self.validator.find_marketplace_plugins(root)
+            checks = self.validator.CHECK_ORDER
+
+            serial = self.validator.run_marketplace_checks(plugins, checks, jobs=1)
+            parallel = self.validator.run_marketplace_checks(plugins, checks, jobs=2)
+
+            def flatten(by_plugin):
+                return {
+                    plugin.name: [(r.check, [(i.severity, i.message) for i in r.issues])
+                                  for r in results]
+                    for plugin, results in by_plugin.items()
+                }
+
+            self.assertEqual(flatten(serial), flatten(parallel))
+            self.assertEqual([r.check for r in serial[plugins[0]]], checks)
+            self.assertEqual(self.validator.exit_code_for(serial[plugins[0]]), 0)
+            self.assertEqual(self.validator.exit_code_for(serial[plugins[1]]), 1)
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name) / "cache"
+        self.validator.configure_cache(self.cache_dir)
+
+    def tearDown(self):
+        self.validator.configure_cache(None)
+        self._tmp.cleanup()
+
+    def _write_plugin(self, root: Path) -> Path:
+        (root / ".claude-plugin").mkdir(parents=True)
+        (root / ".claude-plugin" / "plugin.json").write_text(
+            json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+        )
+        skill_md = root / "skills" / "example" / "SKILL.md"
+        skill_md.parent.mkdir(parents=True)
+        skill_md.write_text(
+            """---\nname: example\ndescription: xxxxxxxxxx\n---\n\nUse Read tool to read each file.\n""",
+            encoding="utf-8",
+        )
+        return skill_md
+
+    def _messages(self, result):
+        return [(i.severity, i.message, i.file, i.line) for i in result.issues]
+
+    def test_cached_run_replays_identical_issues(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self._write_plugin(root)
+            checks = ["frontmatter", "tools", "tokens"]
+
+            first = self.validator.run_all_checks(root, checks)
+            second = self.validator.run_all_checks(root, checks)
+
+            self.assertEqual([self._messages(r) for r in first], [self._messages(r) for r in second])
+            self.assertIn("Explicit core tool reference", [i.message for i in second[1].issues])
+
+    def test_changed_content_misses_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            skill_md = self._write_plugin(root)
+            self.validator.run_all_checks(root, ["tools"])
+
+            skill_md.write_text(
+                """---\nname: example\ndescription: xxxxxxxxxx\n---\n\nRead each file.\n""",
+                encoding="utf-8",
+            )
+            result = self.validator.run_all_checks(root, ["tools"])[0]
+            self.assertEqual(result.issues, [])
+
+    def test_eviction_keeps_store_under_budget(self):
+        cache = self.validator.ResultCache(self.cache_dir / "bounded.sqlite3", max_bytes=1000)
+        for n in range(50):
+            cache.put(f"key-{n}", "x" * 100)
+            cache.flush()
+
+        conn = cache._connect()
+        total = conn.execute("SELECT SUM(size) FROM entries").fetchone()[0]
+        self.assertLessEqual(total, 1000)
+        self.assertIsNotNone(cache.get("key-49"))
+        self.assertIsNone(cache.get("key-0"))
+
+
+class ChangedSinceTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.validator.configure_cache(Path(self._tmp.name) / "cache")
+
+    def tearDown(self):
+        self.validator.configure_cache(None)
+        self._tmp.cleanup()
+
+    def _git(self, root: Path, *args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=root, check=True, capture_output=True,
+        )
+
+    def _write_skill(self, root: Path, name: str, body: str) -> Path:
+        skill_md = root / "skills" / name / "SKILL.md"
+        skill_md.parent.mkdir(parents=True, exist_ok=True)
+        skill_md.write_text(
+            f"---\nname: {name}\ndescription: xxxxxxxxxx\n---\n\n{body}\n", encoding="utf-8"
+        )
+        return skill_md
+
+    def test_untouched_files_replay_stale_findings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / ".claude-plugin").mkdir()
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            self._write_skill(root, "alpha", "Use Read tool to read each file.")
+            self._write_skill(root, "beta", "Read each file.")
+            self._git(root, "init", "-q")
+            self._git(root, "add", "-A")
+            self._git(root, "commit", "-q", "-m", "init")
+
+            self.validator.run_all_checks(root, ["tools"])
+            self._write_skill(root, "beta", "Use Grep tool to search.")
+
+            changed = self.validator.git_changed_paths(root, "HEAD")
+            self.assertEqual(changed, {root / "skills" / "beta" / "SKILL.md"})
+
+            index = self.validator.PluginIndex(root, changed)
+            issues = self.validator.run_all_checks(root, ["tools"], index=index)[0].issues
+            by_file = {i.file: i.stale for i in issues}
+            self.assertEqual(by_file, {"skills/alpha/SKILL.md": True, "skills/beta/SKILL.md": False})
+
+    def test_untracked_files_in_plugin_subdirectory_are_revalidated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp).resolve()
+            root = repo / "plug"
+            (root / ".claude-plugin").mkdir(parents=True)
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            self._write_skill(root, "alpha", "Read each file.")
+            self._git(repo, "init", "-q")
+            self._git(repo, "add", "-A")
+            self._git(repo, "commit", "-q", "-m", "init")
+
+            untracked = root / "skills" / "bar" / "notes.md"
+            untracked.parent.mkdir(parents=True)
+            untracked.write_text("# Notes\n", encoding="utf-8")
+            self.assertEqual(self.validator.git_changed_paths(root, "HEAD"), {untracked})
+
+            validator_path = Path(__file__).resolve().parents[1] / "scripts" / "validate-plugin.py"
+            cache_args = ["--cache-dir", str(Path(self._tmp.name) / "cli-cache")]
+
+            def run(*args: str) -> int:
+                return subprocess.run(
+                    [sys.executable, str(validator_path), str(root), "--check=structure", *cache_args, *args],
+                    capture_output=True,
+                ).returncode
+
+            untracked.parent.rename(root / "bar-aside")
+            self.assertEqual(run(), 0)
+            (root / "bar-aside").rename(untracked.parent)
+            self.assertEqual(run("--changed-since", "HEAD"), run())
+
+    def test_unknown_revision_is_an_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self._git(root, "init", "-q")
+            with self.assertRaises(ValueError):
+                self.validator.git_changed_paths(root, "no-such-rev")
+
+
+class TokenCounterTests(unittest.TestCase):
+    class FakeEncoder:
+        def __init__(self):
+            self.batches = []
+
+        def encode_ordinary(self, text):
+            self.batches.append([text])
+            return text.split()
+
+        def encode_ordinary_batch(self, texts, num_threads=1):
+            self.batches.append(list(texts))
+            return [text.split() for text in texts]
+
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.validator.configure_cache(Path(self._tmp.name) / "cache")
+        self.encoder = self.FakeEncoder()
+        self.validator._ENCODER = self.encoder
+        self.validator.TOKEN_METHOD = "tiktoken"
+
+    def tearDown(self):
+        self.validator.configure_cache(None)
+        self._tmp.cleanup()
+
+    def test_duplicates_are_encoded_once_in_one_batch(self):
+        counter = self.validator.TokenCounter()
+        counts = counter.count_many(["a b", "c", "a b", "d e f"])
+
+        self.assertEqual(counts, [2, 1, 2, 3])
+        self.assertEqual(self.encoder.batches, [["a b", "c", "d e f"]])
+
+    def test_counts_persist_across_counters(self):
+        self.validator.TokenCounter().count_many(["a b", "c"])
+        self.validator.flush_cache()
+        self.encoder.batches.clear()
+
+        self.assertEqual(self.validator.TokenCounter().count_many(["c", "a b"]), [1, 2])
+        self.assertEqual(self.encoder.batches, [])
+
+    def test_checks_without_token_counting_never_load_encoder(self):
+        self.validator._ENCODER = None
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / ".claude-plugin").mkdir()
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            self.validator.run_all_checks(root, ["structure", "manifest", "frontmatter", "tools"])
+
+        self.assertNotIn("encoder", self.validator.STARTUP_TIMINGS)
+        self.assertNotIn("tiktoken", sys.modules)
+
+
+class WatchModeTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.validator.configure_cache(Path(self._tmp.name) / "cache")
+        self.root = Path(self._tmp.name) / "plugin"
+        (self.root / ".claude-plugin").mkdir(parents=True)
+        (self.root / ".claude-plugin" / "plugin.json").write_text(
+            json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+        )
+        self.skill_md = self.root / "skills" / "example" / "SKILL.md"
+        self.skill_md.parent.mkdir(parents=True)
+        self._write_body("Read each file.")
+
+    def tearDown(self):
+        self.validator.configure_cache(None)
+        self._tmp.cleanup()
+
+    def _write_body(self, body: str) -> None:
+        self.skill_md.write_text(
+            f"---\nname: example\ndescription: xxxxxxxxxx\n---\n\n{body}\n", encoding="utf-8"
+        )
+
+    def _tool_events(self, events):
+        return [(e["event"], e["file"]) for e in events if e.get("message") == "Explicit core tool reference"]
+
+    def test_session_streams_added_and_removed_issues(self):
+        session = self.validator.WatchSession(self.root, ["tools"])
+        self.assertEqual(session.run()[-1]["should"], 0)
+
+        self._write_body("Use Read tool to read each file.")
+        events = session.run({self.skill_md})
+        self.assertEqual(self._tool_events(events), [("added", "skills/example/SKILL.md")])
+        self.assertEqual(events[-1]["changed"], ["skills/example/SKILL.md"])
+
+        self.assertEqual(session.run({self.root / "README.md"})[:-1], [])
+
+        self._write_body("Read each file.")
+        events = session.run({self.skill_md})
+        self.assertEqual(self._tool_events(events), [("removed", "skills/example/SKILL.md")])
+
+    def test_session_replays_untouched_units_from_memory_without_cache(self):
+        self.validator.configure_cache(None)
+        other_md = self.root / "skills" / "other" / "SKILL.md"
+        other_md.parent.mkdir(parents=True)
+        other_md.write_text("---\nname: other\ndescription: xxxxxxxxxx\n---\n\nUse Grep tool.\n", encoding="utf-8")
+        session = self.validator.WatchSession(self.root, ["tools"])
+        self.assertEqual(session.run()[-1]["should"], 1)
+
+        self._write_body("Use Read tool to read each file.")
+        scan = unittest.mock.Mock(wraps=self.validator._tool_invocation_hits)
+        with unittest.mock.patch.object(self.validator, "_tool_invocation_hits", scan):
+            events = session.run({self.skill_md})
+        self.assertEqual(scan.call_count, 1)
+        self.assertEqual(self._tool_events(events), [("added", "skills/example/SKILL.md")])
+        self.assertEqual(events[-1]["should"], 2)
+
+    def test_polling_watcher_reports_created_and_modified_files(self):
+        watcher = self.validator.PollingWatcher(self.root, interval=0.01)
+        self._write_body("Changed and longer than before.")
+        new_file = self.root / "skills" / "example" / "notes.md"
+        new_file.write_text("x", encoding="utf-8")
+
+        self.assertEqual(watcher.wait(timeout=1), {self.skill_md, new_file})
+        self.assertEqual(watcher.wait(timeout=0), set())
+
+
+class FrontmatterParserTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+
+    def test_dashes_inside_value_do_not_close_block(self):
+        content = "---\nname: x\ndescription: a---b\n---\n\nBody\n"
+        fm, body, end = self.validator.parse_frontmatter(content)
+        self.assertEqual(fm, {"name": "x", "description": "a---b"})
+        self.assertEqual(body, "Body")
+        self.assertEqual(end, 4)
+
+    def test_nested_mapping_and_string_scalars(self):
+        content = "---\nname: x\nuser-invocable: true\nmetadata:\n  version: 1.10\n---\nBody"
+        fm, _, _ = self.validator.parse_frontmatter(content)
+        if self.validator._yaml_loader() is None:
+            self.skipTest("PyYAML not installed")
+        self.assertEqual(fm["metadata"], {"version": "1.10"})
+        self.assertEqual(fm["user-invocable"], "true")
+
+    def test_text_fields_and_empty_values(self):
+        content = "---\nname: x\nallowed-tools: [Read, Bash]\ndescription:\n---\nBody"
+        fm, _, _ = self.validator.parse_frontmatter(content)
+        self.assertNotIn("description", fm)
+        self.assertIsInstance(fm["allowed-tools"], str)
+        self.assertIn("Bash", fm["allowed-tools"])
+
+    def test_invalid_yaml_falls_back_to_line_parser(self):
+        content = "---\nname: x\ndescription: a: b: [unclosed\n---\nBody"
+        fm, _, _ = self.validator.parse_frontmatter(content)
+        self.assertEqual(fm["name"], "x")
+        self.assertTrue(fm["description"].startswith("a: b"))
+
+    def test_unterminated_block_is_not_frontmatter(self):
+        content = "---\nname: x\n"
+        self.assertEqual(self.validator.parse_frontmatter(content), ({}, content, 0))
+
+
+class PluginIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self.validator.configure_cache(None)
+
+    def test_all_checks_read_each_file_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / ".claude-plugin").mkdir()
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            skill_md = root / "skills" / "example" / "SKILL.md"
+            skill_md.parent.mkdir(parents=True)
+            skill_md.write_text(
+                """---\nname: example\ndescription: xxxxxxxxxx\n---\n\nUse Read tool to read each file.\n""",
+                encoding="utf-8",
+            )
+
+            reads = []
+            original = Path.read_text
+
+            def counting_read_text(path, *args, **kwargs):
+                reads.append(path)
+                return original(path, *args, **kwargs)
+
+            index = self.validator.PluginIndex(root)
+            with unittest.mock.patch.object(Path, "read_text", counting_read_text):
+                indexed = self.validator.run_all_checks(root, list(self.validator.CHECK_ORDER), index=index)
+
+            self.assertEqual(reads.count(skill_md), 1)
+            self.assertEqual(len(reads), len(set(reads)))
+
+            fresh = self.validator.run_all_checks(root, list(self.validator.CHECK_ORDER))
+            self.assertEqual(
+                [[(i.severity, i.message, i.line) for i in r.issues] for r in indexed],
+                [[(i.severity, i.message, i.line) for i in r.issues] for r in fresh],
+            )
+
+    def test_skill_token_inputs_order_and_symlinked_copies(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            skill = Path(tmp) / "skills" / "example"
+            (skill / "references" / "sub").mkdir(parents=True)
+            (skill / "scripts" / "deep").mkdir(parents=True)
+            (skill / "SKILL.md").write_text("---\nname: example\n---\nBody\n", encoding="utf-8")
+            (skill / "references" / "a.md").write_text("a", encoding="utf-8")
+            (skill / "references" / "sub" / "d.md").write_text("d", encoding="utf-8")
+            (skill / "references" / "notes.txt").write_text("n", encoding="utf-8")
+            (skill / "loose.md").symlink_to(skill / "references" / "a.md")
+            (skill / "other.md").write_text("o", encoding="utf-8")
+            (skill / "scripts" / "deep" / "x.py").write_text("x", encoding="utf-8")
+            (skill / "scripts" / "data.json").write_text("{}", encoding="utf-8")
+
+            inputs = self.validator._collect_skill_token_inputs(skill, self.validator.PluginIndex(Path(tmp)))
+            self.assertEqual(
+                [(kind, name) for kind, name, _ in inputs],
+                [("skill", "SKILL.md"), ("reference", "references/a.md"), ("reference", "references/sub/d.md"),
+                 ("reference", "other.md"), ("script", "scripts/deep/x.py")],
+            )
+
+    def test_rglob_matches_pathlib_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ["b.md", "a/x.md", "a/deep/y.md", "c/z.md", "a/skip.txt"]:
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("x", encoding="utf-8")
+
+            index = self.validator.PluginIndex(root)
+            self.assertEqual(index.rglob(root, "*.md"), list(root.glob("**/*.md")))
+            self.assertEqual(index.rglob(root / "missing", "*.md"), [])
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self.validator.configure_cache(None)
+
+    def test_json_stats_and_trace_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "plugin"
+            (root / ".claude-plugin").mkdir(parents=True)
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            skill_md = root / "skills" / "example" / "SKILL.md"
+            skill_md.parent.mkdir(parents=True)
+            skill_md.write_text(
+                "---\nname: example\ndescription: Runs examples. Use when asked.\n---\n\nBody.\n",
+                encoding="utf-8",
+            )
+            trace = Path(tmp) / "trace.json"
+
+            proc = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve().parents[1] / "scripts" / "validate-plugin.py"),
+                 str(root), "--json", "--no-cache", "--check=frontmatter,tools", "--trace", str(trace)],
+                capture_output=True, text=True, check=False,
+            )
+            payload = json.loads(proc.stdout)
+
+            frontmatter = payload["results"][0]["stats"]
+            self.assertEqual(frontmatter["files_read"], 1)
+            self.assertEqual(frontmatter["bytes_read"], len(skill_md.read_bytes()))
+            self.assertIn("skills/example/SKILL.md", frontmatter["units_ms"])
+            self.assertEqual(frontmatter["cache"], {"hits": 0, "misses": 0, "hit_rate": None})
+            # tools reuses the index, so it reads nothing new.
+            self.assertEqual(payload["results"][1]["stats"]["files_read"], 0)
+            self.assertEqual(payload["stats"]["files_read"], 1)
+
+            events = json.loads(trace.read_text())["traceEvents"]
+            self.assertTrue(all(e["ph"] == "X" and e["ts"] >= 0 for e in events))
+            self.assertEqual(
+                {e["name"] for e in events if e["cat"] == "check"},
+                {"plugin:frontmatter", "plugin:tools"},
+            )
+
+    def test_tokens_cache_lookups_are_counted_once_per_skill(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "plugin"
+            (root / ".claude-plugin").mkdir(parents=True)
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            for name in ("alpha", "beta"):
+                skill_md = root / "skills" / name / "SKILL.md"
+                skill_md.parent.mkdir(parents=True)
+                skill_md.write_text(
+                    f"---\nname: {name}\ndescription: Runs {name}. Use when asked.\n---\n\nBody.\n",
+                    encoding="utf-8",
+                )
+            self.validator.configure_cache(Path(tmp) / "cache")
+            try:
+                self.validator.run_all_checks(root, ["tokens"])
+                warm = self.validator.run_all_checks(root, ["tokens"])[0].metrics
+            finally:
+                self.validator.configure_cache(None)
+
+            self.assertEqual((warm.cache_hits, warm.cache_misses), (2, 0))
+
+
+class NdjsonOutputTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self.validator.configure_cache(None)
+
+    def test_streamed_issues_match_json_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / ".claude-plugin").mkdir()
+            (root / ".claude-plugin" / "plugin.json").write_text(
+                json.dumps({"name": "test-plugin", "version": "0.0.0"}), encoding="utf-8"
+            )
+            skill_md = root / "skills" / "example" / "SKILL.md"
+            skill_md.parent.mkdir(parents=True)
+            skill_md.write_text(
+                "---\nname: Example\ndescription: I can do it\n---\n\nUse Read tool to read each file.\n",
+                encoding="utf-8",
+            )
+
+            expected = self.validator._json_payload(self.validator.run_all_checks(root, ["frontmatter", "tools"]), root)
+
+            written = []
+
+            class Out:
+                def write(self, text):
+                    written.append(json.loads(text))
+
+                def flush(self):
+                    pass
+
+            # A check that builds a scratch result before its own must still stream its issues.
+            scratch = []
+            check_tools = self.validator.CHECKS["tools"]
+
+            def tools_with_scratch_result(*args):
+                scratch.append(self.validator.ValidationResult("tools"))
+                return check_tools(*args)
+
+            stream = self.validator.NdjsonStream(Out())
+            with unittest.mock.patch.dict(self.validator.CHECKS, {"tools": tools_with_scratch_result}):
+                results = self.validator.run_all_checks(root, ["frontmatter", "tools"], stream=stream)
+            stream.exit_code = self.validator.exit_code_for(results)
+            stream.summary(plugin=str(root))
+
+            self.assertTrue(all(not r.issues for r in results))
+            self.assertIsNone(scratch[0].sink)
+            self.assertEqual(
+                [(r["check"], {k: v for k, v in r.items() if k not in ("event", "plugin", "check")})
+                 for r in written if r["event"] == "issue"],
+                [(c["check"], i) for c in expected["results"] for i in c["issues"]],
+            )
+            self.assertEqual([r["check"] for r in written if r["event"] == "check"], ["frontmatter", "tools"])
+            summary = written[-1]
+            self.assertEqual(summary["event"], "summary")
+            for severity in ("must", "should", "may"):
+                self.assertEqual(summary[severity], expected["summary"][severity])
+
+
+class TokenReportTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self.validator.configure_cache(None)
+
+    def test_report_sums_level1_and_keeps_worst_offenders(self):
+        report = self.validator.TokenBudgetReport(top=2)
+        report.add_plugin("alpha", [("skills/a", 10, 100, 0), ("skills/b", 30, 300, 5000)])
+        report.add_plugin("beta", [("skills/c", 20, 200, 50)])
+        report.add_plugin("empty", [])
+        data = report.to_json()
+
+        self.assertEqual((data["plugins"], data["skills"]), (3, 3))
+        self.assertEqual(data["level1"]["total"], 60)
+        self.assertEqual([(w["plugin"], w["skill"]) for w in data["level1"]["worst"]],
+                         [("alpha", "skills/b"), ("beta", "skills/c")])
+        self.assertEqual({k: data["level2"][k] for k in ("min", "p50", "p90", "max")},
+                         {"min": 100, "p50": 200, "p90": 300, "max": 300})
+        self.assertEqual(data["by_plugin"][2], {"plugin": "empty", "skills": 0, "level1": 0})
+
+    def test_router_skill_counts_toward_startup_cost(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "router"
+            (root / "skills" / "child").mkdir(parents=True)
+            (root / "skills" / "SKILL.md").write_text(
+                "---\nname: router\ndescription: Routes requests\n---\n\nPick a child.\n", encoding="utf-8"
+            )
+            (root / "skills" / "child" / "SKILL.md").write_text(
+                "---\nname: child\ndescription: Does child work\n---\n\nSteps.\n", encoding="utf-8"
+            )
+
+            report = self.validator.build_token_report([root], jobs=1)
+            skills = [w["skill"] for w in report.to_json()["level1"]["worst"]]
+            self.assertEqual(sorted(skills), ["skills", "skills/child"])
+
+
+class DuplicatesCheckTests(unittest.TestCase):
+    def setUp(self):
+        self.validator = _load_validator_module()
+        self.validator.configure_cache(None)
+
+    def _write(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def test_reports_copies_and_near_copies_but_not_symlinks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / ".claude-plugin").mkdir()
+            (root / ".claude-plugin" / "plugin.json").write_text(json.dumps({"name": "p"}), encoding="utf-8")
+            guide = "".join(f"Step {n}: do thing {n} carefully.\n" for n in range(20))
+            for skill in ("one", "two", "three"):
+                self._write(root / "skills" / skill / "SKILL.md", f"---\nname: {skill}\n---\n\nSkill {skill}.\n")
+            self._write(root / "skills" / "one" / "references" / "guide.md", guide)
+            self._write(root / "skills" / "two" / "references" / "guide.md", guide)
+            self._write(root / "skills" / "three" / "references" / "guide-v2.md",
+                        guide.replace("Step 0:", "First:") + "Step 20: finish.\n")
+            (root / "skills" / "three" / "references" / "linked.md").symlink_to(
+                root / "skills" / "one" / "references" / "guide.md"
+            )
+
+            result = self.validator.check_duplicates(root)
+
+            issues = [(i.file, i.message.split(" (")[0]) for i in result.issues]
+            self.assertEqual(issues, [
+                ("skills/one/references/guide.md", "Identical content in 2 files"),
+                ("skills/one/references/guide.md", "Near-duplicate of skills/three/references/guide-v2.md"),
+            ])
+            self.assertEqual(result.issues[0].details["copies"],
+                             ["skills/one/references/guide.md", "skills/two/references/guide.md"])
+            self.assertTrue(all(i.severity == "may" for i in result.issues))
+
+    def test_boilerplate_lines_do_not_make_files_similar(self):
+        fence = "```bash\n```\n## Usage\n## Examples\n"
+        fingerprints = {
+            f"skills/s{n}/SKILL.md": self.validator._distinct_lines(
+                fence + "".join(f"unique {n} line {k}\n" for k in range(12))
+            )
+            for n in range(30)
+        }
+        self.assertEqual(self.validator._near_duplicate_pairs(fingerprints), [])
+
+
 if __name__ == "__main__":
     unittest.main()